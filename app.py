@@ -1,5 +1,6 @@
 from flask import (
     Flask,
+    abort,
     render_template,
     jsonify,
     Response,
@@ -8,9 +9,14 @@ from flask import (
 )
 from dotenv import load_dotenv
 from debate import Debate
+from debate_events import catch_up, parse_event_id
+from debate_registry import DebateRegistry
+from example_catalog import get_catalog
+from gateway import get_gateway
+from usage import process_usage
 import json
-import time
-import os
+import ogg
+import queue
 
 # Load environment variables
 load_dotenv()
@@ -18,35 +24,49 @@ load_dotenv()
 # Configure Flask app
 app = Flask(__name__)
 
-# Global variable to store debate
-debate = None
+# Debates hosted by this process, addressed by the ID returned from /start.
+# With DEBATE_LOG_DIR set, they are logged and restored after a restart.
+registry = DebateRegistry.from_env()
+
+
+# Seconds between SSE comments that keep idle connections open
+KEEP_ALIVE_INTERVAL = 15
+
+
+def get_session():
+    """Return the session addressed by the request's `debate_id`, or abort."""
+    debate_id = request.args.get("debate_id")
+    if debate_id is None and request.is_json:
+        debate_id = request.json.get("debate_id")
+    session = registry.get_or_restore(debate_id)
+    if not session:
+        abort(404, description=f"Unknown debate: {debate_id}")
+    return session
 
 
 @app.route("/")
 def index():
     """Render the main debate page."""
-    # Get list of debate examples
-    debate_examples = []
-    for filename in os.listdir("debate_examples"):
-        if filename.endswith(".json"):
-            with open(os.path.join("debate_examples", filename), "r") as f:
-                config = json.load(f)
-                debate_examples.append(
-                    {"filename": filename, "title": config.get("title", "Untitled")}
-                )
-
-    return render_template("index.html", debate_examples=debate_examples)
+    return render_template("index.html", example_options=get_catalog().options_html())
 
 
 @app.route("/start", methods=["POST"])
 def start_debate():
-    """Start the debate with specified config."""
-    global debate
-    config_path = request.json.get("config_path", "debate_config.json")
-    print(f"Starting debate with config: {config_path}")
-    debate = Debate(config_path=config_path)
-    debate.start()
-    return jsonify(debate.get_state())
+    """Start a new debate with the specified config and return its ID."""
+    # Reserve the slot before building the debate, which takes a while
+    if not registry.reserve_run():
+        abort(429, description="Too many debates are running. Try again later.")
+    try:
+        config = request.json.get("config")
+        config_path = request.json.get("config_path", "debate_config.json")
+        print(f"Starting debate with config: {config or config_path}")
+        session = registry.create(Debate(config=config, config_path=config_path))
+        with session.lock:
+            session.debate.start()
+            session.broadcaster.start()
+            return jsonify(session.state())
+    finally:
+        registry.release_run()
 
 
 @app.route("/create_config", methods=["POST"])
@@ -64,65 +84,94 @@ def create_config():
 @app.route("/stop", methods=["POST"])
 def stop_debate():
     """Stop the debate."""
-    debate.stop()
-    return jsonify(debate.get_state())
+    session = get_session()
+    with session.lock:
+        session.debate.stop()
+        return jsonify(session.state())
 
 
 @app.route("/resume", methods=["POST"])
 def resume_debate():
     """Resume the debate."""
-    debate.start()
-    return jsonify(debate.get_state())
+    session = get_session()
+    if not registry.reserve_run(session.id):
+        abort(429, description="Too many debates are running. Try again later.")
+    try:
+        with session.lock:
+            session.debate.start()
+            session.broadcaster.start()
+            return jsonify(session.state())
+    finally:
+        registry.release_run()
 
 
 @app.route("/reset", methods=["POST"])
 def reset_debate():
-    """Reset the debate state."""
-    debate.reset()
+    """Discard the debate."""
+    session = get_session()
+    registry.remove(session.id)
     return jsonify({})
 
 
+@app.route("/ack", methods=["POST"])
+def ack_turn():
+    """Acknowledge that the viewer is done with a turn, releasing the next one."""
+    session = get_session()
+    turn = request.json.get("turn")
+    if not isinstance(turn, int):
+        abort(400, description="Expected the number of the acknowledged turn.")
+    return jsonify({"acknowledged": session.broadcaster.pacing.ack(turn)})
+
+
 @app.route("/next_turn", methods=["POST"])
 def next_turn():
     """Generate the next debate turn."""
-    debate.run_next_turn()
-    debate.update_next_speaker()
-    return jsonify(debate.get_state())
+    session = get_session()
+    with session.lock:
+        session.debate.run_next_turn()
+        session.debate.update_next_speaker()
+        return jsonify(session.state())
 
 
 @app.route("/stream_debate")
 def stream_debate():
-    """Stream debate updates using Server-Sent Events (SSE)."""
+    """Stream debate updates using Server-Sent Events (SSE).
+
+    Turns are generated by the debate's single producer; each connection
+    only subscribes to it. A new client first receives a snapshot of the
+    debate, then only the events appended after it. A client reconnecting
+    with `Last-Event-ID` (header or `last_event_id` query parameter) only
+    receives what it missed.
+    """
+    last_event_id = parse_event_id(
+        request.headers.get("Last-Event-ID", request.args.get("last_event_id"))
+    )
+    session = get_session()
 
     def generate():
-        global debate
-        # if not debate or not debate.debate_running:
-        #     # Send initial empty state if no debate is running
-        #     yield f"data: {json.dumps({})}\n\n"
-        #     return
-
-        while debate and debate.debate_running and not debate.debate_finished:
-            if debate.current_turn >= debate.max_turns:
-                debate.stop()
-                yield f"data: {json.dumps(debate.get_state())}\n\n"
-                break
-
-            # Generate next turn
-            debate.run_next_turn()
-
-            # Update next speaker after a turn
-            if not debate.debate_finished:
-                debate.update_next_speaker()
-
-            # Send the updated state as an SSE event
-            yield f"data: {json.dumps(debate.get_state())}\n\n"
-
-            # Wait a bit before next turn
-            time.sleep(3)
-
-        # Send final state update
-        if debate:
-            yield f"data: {json.dumps(debate.get_state())}\n\n"
+        # Subscribe first, so no event falls between the catch-up and the queue
+        subscriber = session.broadcaster.subscribe()
+        try:
+            sent_seq = last_event_id
+            for sent_seq, message in catch_up(session, sent_seq):
+                yield message
+
+            # Stream until the debate is evicted from the registry
+            while registry.get(session.id):
+                try:
+                    kind, data = subscriber.queue.get(timeout=KEEP_ALIVE_INTERVAL)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+
+                if kind == "partial":
+                    yield f"event: partial\ndata: {json.dumps(data)}\n\n"
+                else:
+                    # New events, or a resync after falling behind
+                    for sent_seq, message in catch_up(session, sent_seq):
+                        yield message
+        finally:
+            session.broadcaster.unsubscribe(subscriber)
 
     return Response(
         stream_with_context(generate()),
@@ -131,5 +180,47 @@ def stream_debate():
     )
 
 
+@app.route("/speech")
+def speech():
+    """Stream the speech of a turn as Ogg Opus, while it is synthesized.
+
+    The response is sent with chunked transfer encoding, so the browser
+    starts playing after the first chunk. The duration of the complete
+    audio then re-times the release of the next turn.
+    """
+    session = get_session()
+    if not session.debate.config.get("enable_voice", False):
+        abort(404, description="This debate has no voice.")
+    turn = request.args.get("turn", type=int)
+    if turn is None or not 1 <= turn <= len(session.debate.transcript):
+        abort(404, description=f"Unknown turn: {turn}")
+    # One synthesis per turn, whatever the number of viewers
+    audio = session.debate.stream_turn_speech(turn)
+
+    def generate():
+        chunks = []
+        for chunk in audio:
+            chunks.append(chunk)
+            yield chunk
+        session.broadcaster.pacing.measured(turn, ogg.duration(b"".join(chunks)))
+
+    return Response(generate(), mimetype="audio/ogg")
+
+
+@app.route("/metrics")
+def metrics():
+    """Report model and TTS usage, in total and per hosted debate, and gateway counters."""
+    return jsonify(
+        {
+            "process": process_usage.get_stats(),
+            "gateway": get_gateway().get_stats(),
+            "debates": {
+                session.id: session.debate.usage.get_stats()
+                for session in registry.list_sessions()
+            },
+        }
+    )
+
+
 if __name__ == "__main__":
     app.run(debug=True)
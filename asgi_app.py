@@ -0,0 +1,235 @@
+"""ASGI entry point serving the debate UI on an asyncio event loop.
+
+It mirrors the routes of app.py, but debates are `AsyncDebate`s advanced
+by producer tasks, so idle SSE streams and in-flight model calls don't each
+hold a thread. Run it with:
+
+    uvicorn asgi_app:app
+"""
+
+import asyncio
+import json
+
+from dotenv import load_dotenv
+from starlette.applications import Starlette
+from starlette.concurrency import iterate_in_threadpool
+from starlette.exceptions import HTTPException
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+from starlette.templating import Jinja2Templates
+
+import ogg
+from async_debate import AsyncDebate
+from debate_events import catch_up, parse_event_id
+from debate_registry import AsyncDebateSession, DebateRegistry
+from example_catalog import get_catalog
+from gateway import get_gateway
+from usage import process_usage
+
+# Load environment variables
+load_dotenv()
+
+templates = Jinja2Templates(directory="templates")
+
+# Debates hosted by this process, addressed by the ID returned from /start.
+# With DEBATE_LOG_DIR set, they are logged and restored after a restart.
+registry = DebateRegistry.from_env(
+    session_class=AsyncDebateSession, debate_class=AsyncDebate
+)
+
+# Seconds between SSE comments that keep idle connections open
+KEEP_ALIVE_INTERVAL = 15
+
+
+async def read_json(request):
+    """Return the request's JSON body, or an empty dict."""
+    try:
+        return await request.json()
+    except ValueError:
+        return {}
+
+
+async def get_session(request):
+    """Return the session addressed by the request's `debate_id`, or raise 404."""
+    debate_id = request.query_params.get("debate_id")
+    if debate_id is None:
+        debate_id = (await read_json(request)).get("debate_id")
+    session = registry.get_or_restore(debate_id)
+    if not session:
+        raise HTTPException(404, detail=f"Unknown debate: {debate_id}")
+    return session
+
+
+async def index(request):
+    """Render the main debate page."""
+    return templates.TemplateResponse(
+        request, "index.html", {"example_options": get_catalog().options_html()}
+    )
+
+
+async def start_debate(request):
+    """Start a new debate with the specified config and return its ID."""
+    # Reserve the slot before building the debate, which takes a while
+    if not registry.reserve_run():
+        raise HTTPException(
+            429, detail="Too many debates are running. Try again later."
+        )
+    try:
+        body = await read_json(request)
+        config = body.get("config")
+        config_path = body.get("config_path", "debate_config.json")
+        print(f"Starting debate with config: {config or config_path}")
+        debate = await AsyncDebate.create(config=config, config_path=config_path)
+        session = registry.create(debate)
+        async with session.lock:
+            session.debate.start()
+            session.broadcaster.start()
+            return JSONResponse(session.state())
+    finally:
+        registry.release_run()
+
+
+async def stop_debate(request):
+    """Stop the debate."""
+    session = await get_session(request)
+    async with session.lock:
+        session.debate.stop()
+        return JSONResponse(session.state())
+
+
+async def resume_debate(request):
+    """Resume the debate."""
+    session = await get_session(request)
+    if not registry.reserve_run(session.id):
+        raise HTTPException(
+            429, detail="Too many debates are running. Try again later."
+        )
+    try:
+        async with session.lock:
+            session.debate.start()
+            session.broadcaster.start()
+            return JSONResponse(session.state())
+    finally:
+        registry.release_run()
+
+
+async def reset_debate(request):
+    """Discard the debate."""
+    session = await get_session(request)
+    registry.remove(session.id)
+    return JSONResponse({})
+
+
+async def ack_turn(request):
+    """Acknowledge that the viewer is done with a turn, releasing the next one."""
+    session = await get_session(request)
+    turn = (await read_json(request)).get("turn")
+    if not isinstance(turn, int):
+        raise HTTPException(400, detail="Expected the number of the acknowledged turn.")
+    return JSONResponse({"acknowledged": session.broadcaster.pacing.ack(turn)})
+
+
+async def next_turn(request):
+    """Generate the next debate turn."""
+    session = await get_session(request)
+    async with session.lock:
+        await session.debate.run_next_turn()
+        await session.debate.update_next_speaker()
+        return JSONResponse(session.state())
+
+
+async def stream_debate(request):
+    """Stream debate updates using Server-Sent Events (SSE), like app.py."""
+    last_event_id = parse_event_id(
+        request.headers.get("Last-Event-ID", request.query_params.get("last_event_id"))
+    )
+    session = await get_session(request)
+
+    async def generate():
+        # Subscribe first, so no event falls between the catch-up and the queue
+        subscriber = session.broadcaster.subscribe()
+        try:
+            sent_seq = last_event_id
+            for sent_seq, message in catch_up(session, sent_seq):
+                yield message
+
+            # Stream until the debate is evicted from the registry
+            while registry.get(session.id):
+                try:
+                    kind, data = await asyncio.wait_for(
+                        subscriber.queue.get(), KEEP_ALIVE_INTERVAL
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+
+                if kind == "partial":
+                    yield f"event: partial\ndata: {json.dumps(data)}\n\n"
+                else:
+                    # New events, or a resync after falling behind
+                    for sent_seq, message in catch_up(session, sent_seq):
+                        yield message
+        finally:
+            session.broadcaster.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "Connection": "keep-alive"},
+    )
+
+
+async def speech(request):
+    """Stream the speech of a turn as Ogg Opus, like app.py.
+
+    Synthesis streams from a TTS call that blocks, so it is iterated in
+    the thread pool.
+    """
+    session = await get_session(request)
+    if not session.debate.config.get("enable_voice", False):
+        raise HTTPException(404, detail="This debate has no voice.")
+    turn = request.query_params.get("turn", "")
+    if not turn.isdigit() or not 1 <= int(turn) <= len(session.debate.transcript):
+        raise HTTPException(404, detail=f"Unknown turn: {turn}")
+    turn = int(turn)
+    # One synthesis per turn, whatever the number of viewers
+    audio = session.debate.stream_turn_speech(turn)
+
+    async def generate():
+        chunks = []
+        async for chunk in iterate_in_threadpool(audio):
+            chunks.append(chunk)
+            yield chunk
+        session.broadcaster.pacing.measured(turn, ogg.duration(b"".join(chunks)))
+
+    return StreamingResponse(generate(), media_type="audio/ogg")
+
+
+async def metrics(request):
+    """Report model and TTS usage, like app.py."""
+    return JSONResponse(
+        {
+            "process": process_usage.get_stats(),
+            "gateway": get_gateway().get_stats(),
+            "debates": {
+                session.id: session.debate.usage.get_stats()
+                for session in registry.list_sessions()
+            },
+        }
+    )
+
+
+app = Starlette(
+    routes=[
+        Route("/", index),
+        Route("/start", start_debate, methods=["POST"]),
+        Route("/stop", stop_debate, methods=["POST"]),
+        Route("/resume", resume_debate, methods=["POST"]),
+        Route("/reset", reset_debate, methods=["POST"]),
+        Route("/ack", ack_turn, methods=["POST"]),
+        Route("/next_turn", next_turn, methods=["POST"]),
+        Route("/stream_debate", stream_debate),
+        Route("/speech", speech),
+        Route("/metrics", metrics),
+    ]
+)
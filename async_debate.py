@@ -0,0 +1,232 @@
+import asyncio
+import time
+
+import mp3
+from clients import get_async_tts_client
+from debate import (
+    Debate,
+    parse_voices_response,
+    resolve_voices,
+    voice_prompt,
+    voices_request,
+)
+
+
+async def choose_voices_async(agents, client, model_name, usage=None):
+    """Async version of `choose_voices`."""
+    from google.genai import types
+
+    prompt, config = voices_request(agents)
+    try:
+        start = time.perf_counter()
+        response = await client.aio.models.generate_content(
+            model=model_name,
+            contents=prompt,
+            config=types.GenerateContentConfig(**config),
+        )
+        if usage:
+            usage.record(
+                "voice_choice",
+                model_name,
+                time.perf_counter() - start,
+                response=response,
+            )
+        proposals = parse_voices_response(response.text)
+    except Exception as e:
+        print(f"Warning: Could not choose all voices at once ({e}). Asking per agent.")
+
+        async def choose_voice(agent):
+            try:
+                start = time.perf_counter()
+                response = await client.aio.models.generate_content(
+                    model=model_name, contents=voice_prompt(agent)
+                )
+                if usage:
+                    usage.record(
+                        "voice_choice",
+                        model_name,
+                        time.perf_counter() - start,
+                        agent=agent.name,
+                        response=response,
+                    )
+                return agent.name, response.text.strip()
+            except Exception as e:
+                print(f"Warning: Could not choose a voice for {agent.name} ({e}).")
+                return agent.name, None
+
+        proposals = dict(await asyncio.gather(*[choose_voice(a) for a in agents]))
+
+    resolve_voices(agents, proposals)
+
+
+class AsyncDebate(Debate):
+    """Asyncio variant of `Debate`: every model and TTS call is awaited.
+
+    Build it with `await AsyncDebate.create(...)`, which makes the setup
+    calls (voices, language, context cache, first speaker) that `Debate`
+    makes in its constructor.
+    """
+
+    # Log records are appended from the event loop, which mustn't wait for fsync
+    log_in_background = True
+
+    @classmethod
+    async def create(cls, config=None, config_path=None, **kwargs):
+        """Create and initialize a debate."""
+        debate = cls(config=config, config_path=config_path, **kwargs)
+        await debate.initialize_async()
+        return debate
+
+    def initialize_debate(self, config_path=None):
+        """Loads the configuration only; model calls happen in `initialize_async`."""
+        self.load_config(config_path)
+        self.async_tts_client = None
+
+    def restore_setup(self, setup):
+        """Restores a logged setup, which makes no model call."""
+        super().restore_setup(setup)
+        self.async_tts_client = None
+
+    async def initialize_async(self):
+        """Makes the setup model calls."""
+        if self.config.get("enable_voice", False):
+            await choose_voices_async(
+                self.agents, self.client, self.model_name, self.usage
+            )
+
+        self.language = await self.detect_language()
+
+        self.setup_context()
+        if self.config.get("enable_context_cache", True):
+            await self.context_cache.create_async()
+
+        await self.update_next_speaker()
+
+    async def detect_language(self):
+        """Auto-detect the debate language based on title, description, and personas."""
+        language = self.detect_language_locally()
+        if language:
+            return language
+
+        start = time.perf_counter()
+        response = await self.client.aio.models.generate_content(
+            model=self.model_name, contents=self.language_prompt()
+        )
+        self.usage.record(
+            "language_detection",
+            self.model_name,
+            time.perf_counter() - start,
+            response=response,
+        )
+        return self.parse_language(response.text)
+
+    async def update_next_speaker(self):
+        """Update the next speaker based on the current debate context."""
+        await self.choose_next_speaker()
+        self.events.append("next_speaker", {"name": self.next_speaker.name})
+
+    async def choose_next_speaker(self):
+        """Choose the next speaker, without recording the decision."""
+        # Moderator is always the first speaker
+        if self.current_turn == 0:
+            self.next_speaker = self.first_speaker()
+            return
+
+        # The speaker was already chosen along with the last message
+        if self.proposed_next_speaker is not None:
+            self.set_next_speaker(self.proposed_next_speaker)
+            self.proposed_next_speaker = None
+            return
+
+        self.set_next_speaker(await self.speaker_selector.choose_async(self))
+
+    async def run_next_turn(self):
+        """Determines the next speaker, generates their message, and updates the state."""
+        prompt = self.begin_turn()
+        if prompt is None:
+            return None
+
+        if self.single_call_turns:
+            message = await self.generate_message_and_next_speaker(prompt)
+        else:
+            response = await self.context_cache.generate_async(
+                prompt, agent=self.next_speaker.name
+            )
+            message = response.text.strip()
+
+        return self.finish_turn(message)
+
+    async def stream_message(self, prompt):
+        """Async version of `Debate.stream_message`."""
+        # Structured responses can't be shown until they are complete
+        if self.single_call_turns:
+            yield await self.generate_message_and_next_speaker(prompt)
+            return
+        async for chunk in self.context_cache.generate_stream_async(
+            prompt, agent=self.next_speaker.name
+        ):
+            if chunk.text:
+                yield chunk.text
+
+    async def generate_message_and_next_speaker(self, prompt):
+        """Generate the next message and propose who speaks after it in one call."""
+        prompt, config = self.single_call_request(prompt)
+        response = await self.context_cache.generate_async(
+            prompt, agent=self.next_speaker.name, **config
+        )
+        return self.parse_single_call_response(response.text)
+
+    def summarize_in_background(self):
+        """Starts folding old turns into the summary, as a task on the event loop."""
+        if self.summary_job and not self.summary_job.done():
+            return
+        self.prompt_builder.sync(self.transcript)
+        job = self.prompt_builder.pending_summary()
+        if job:
+            self.summary_job = asyncio.create_task(self.summarize(job))
+
+    async def summarize(self, job):
+        """Async version of `Debate.summarize`."""
+        try:
+            response = await self.context_cache.generate_async(
+                self.summary_prompt(job), call_type="summary"
+            )
+        except Exception as e:
+            print(f"Warning: Could not summarize old turns ({e}). Keeping them.")
+            return
+        self.fold_summary(job, response.text.strip())
+
+    async def synthesize_speech(self, agent_name, language, text):
+        """Synthesizes speech from text using the Google Cloud TTS async client."""
+        request = self.speech_request(agent_name, language, text)
+        key, suffix = self.speech_cache_key(request)
+        audio = await asyncio.to_thread(self.audio_cache.get, key, suffix)
+        if audio is not None:
+            return audio
+
+        # The async client binds to the running event loop, so fetch it here
+        if self.async_tts_client is None:
+            self.async_tts_client = get_async_tts_client()
+        start = time.perf_counter()
+        response = await self.async_tts_client.synthesize_speech(**request)
+        self.record_speech_usage(request, agent_name, start)
+        await asyncio.to_thread(
+            self.audio_cache.put, key, response.audio_content, suffix
+        )
+        return response.audio_content
+
+    async def synthesize_turn(self, entry):
+        """Synthesizes a transcript entry into a record of its audio and duration."""
+        audio = await self.synthesize_speech(
+            entry["speaker"], self.language, entry["message"]
+        )
+        return {"audio": audio, "duration": mp3.duration(audio)}
+
+    async def close(self):
+        """Releases server-side resources held by the debate."""
+        if self.summary_job:
+            self.summary_job.cancel()
+        await self.context_cache.delete_async()
+        if self.log:
+            # Waits for the records still queued
+            await asyncio.to_thread(self.log.close)
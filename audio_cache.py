@@ -0,0 +1,156 @@
+"""Persistent cache of synthesized speech, addressed by its synthesis parameters.
+
+Identical (voice, language, rate, encoding, text) requests are served from
+disk instead of calling Google TTS again, across debates, reruns and
+processes. Each file is named after its key, with the suffix of its encoding.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+# Fraction of `max_bytes` kept after an eviction, so evictions aren't back to back
+EVICT_TO = 0.9
+
+# File suffix of the audio of each Google TTS encoding
+SUFFIXES = {"MP3": ".mp3", "OGG_OPUS": ".ogg"}
+
+
+def cache_key(**params):
+    """Return the hex digest addressing the audio synthesized with `params`."""
+    encoded = json.dumps(params, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class AudioCache:
+    """Size-bounded, least recently used on-disk cache of audio files.
+
+    Files are written to a temporary name and atomically renamed, so
+    concurrent processes sharing the directory never read partial audio.
+    Reads refresh a file's modification time, which eviction orders by.
+    """
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.size = None  # Measured on first write
+
+    @classmethod
+    def from_env(cls):
+        """Create a cache configured by the DEBATE_AUDIO_CACHE_* environment variables."""
+        return cls(
+            os.getenv("DEBATE_AUDIO_CACHE_DIR", ".audio_cache"),
+            int(float(os.getenv("DEBATE_AUDIO_CACHE_MB", "512")) * 1024 * 1024),
+        )
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    def _path(self, key, suffix):
+        return os.path.join(self.directory, key[:2], key + suffix)
+
+    def get(self, key, suffix=".mp3"):
+        """Return the cached audio for `key`, or None."""
+        if not self.enabled:
+            return None
+        path = self._path(key, suffix)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+        except OSError:
+            # Missing, or evicted by another process in the meantime
+            with self.lock:
+                self.misses += 1
+            return None
+        with self.lock:
+            self.hits += 1
+        return data
+
+    def put(self, key, data, suffix=".mp3"):
+        """Store `data` for `key`, evicting least recently used audio if needed."""
+        if not self.enabled:
+            return
+        path = self._path(key, suffix)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"Warning: Could not cache audio ({e}).")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return
+
+        with self.lock:
+            if self.size is None:
+                self.size = sum(size for _, size, _ in self._files())
+            else:
+                self.size += len(data)
+            if self.size > self.max_bytes:
+                self._evict()
+
+    def _files(self):
+        """Yield (path, size, mtime) for every cached file."""
+        if not os.path.isdir(self.directory):
+            return
+        for subdirectory in os.scandir(self.directory):
+            if not subdirectory.is_dir():
+                continue
+            for entry in os.scandir(subdirectory.path):
+                if not entry.name.endswith(tuple(SUFFIXES.values())):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                yield entry.path, stat.st_size, stat.st_mtime
+
+    def _evict(self):
+        # Rescan, as other processes may have added or evicted files
+        files = sorted(self._files(), key=lambda file: file[2])
+        self.size = sum(size for _, size, _ in files)
+        for path, size, _ in files:
+            if self.size <= self.max_bytes * EVICT_TO:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self.size -= size
+            self.evictions += 1
+
+    def get_stats(self):
+        with self.lock:
+            return {
+                "enabled": self.enabled,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size_bytes": self.size,
+            }
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_audio_cache():
+    """Return the audio cache shared by every debate in the process."""
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_lock:
+            if _shared_cache is None:
+                _shared_cache = AudioCache.from_env()
+    return _shared_cache
@@ -0,0 +1,189 @@
+"""Run many debates headlessly and write their results as JSON lines.
+
+Debates run concurrently as `AsyncDebate`s on one event loop, at most
+`--workers` at a time, and all their model calls share one rate limit.
+Each debate's result is appended to the output as soon as it ends:
+
+    python batch.py debate_examples --repeat 20 --workers 16 --output results.jsonl
+
+Arguments are config files or directories of them. With `--audio-dir`, each
+turn's speech is synthesized and saved there as an MP3 file.
+"""
+
+import argparse
+import asyncio
+import copy
+import json
+import os
+import sys
+import time
+
+from dotenv import load_dotenv
+
+from async_debate import AsyncDebate
+from clients import get_genai_client
+from gateway import get_gateway
+from utils import load_debate_config
+
+
+def find_configs(paths):
+    """Return the config files given, expanding directories to their JSON files."""
+    configs = []
+    for path in paths:
+        if os.path.isdir(path):
+            configs.extend(
+                os.path.join(path, filename)
+                for filename in sorted(os.listdir(path))
+                if filename.endswith(".json")
+            )
+        else:
+            configs.append(path)
+    return configs
+
+
+async def play(debate, result, audio_dir):
+    """Initialize the debate and run it to its end, filling in `result`."""
+    await debate.initialize_async()
+    debate.start()
+    while debate.debate_running:
+        start = time.perf_counter()
+        entry = await debate.run_next_turn()
+        if entry is None:
+            break
+        if debate.debate_running and not debate.debate_finished:
+            await debate.update_next_speaker()
+        result["turn_seconds"].append(time.perf_counter() - start)
+
+        if audio_dir:
+            record = await debate.synthesize_turn(entry)
+            path = os.path.join(audio_dir, f"{debate.current_turn:04d}.mp3")
+            with open(path, "wb") as f:
+                f.write(record["audio"])
+            result["audio"].append({"path": path, "duration": record["duration"]})
+
+
+async def run_debate(job, args, client, workers, output):
+    """Run one debate in a worker slot and write its result."""
+    async with workers:
+        config = copy.deepcopy(job["config"])
+        audio_dir = None
+        if args.audio_dir:
+            audio_dir = os.path.join(args.audio_dir, job["id"])
+            os.makedirs(audio_dir, exist_ok=True)
+        config["enable_voice"] = bool(audio_dir)
+
+        result = {
+            "id": job["id"],
+            "config": job["path"],
+            "title": config.get("title"),
+            "status": None,
+            "error": None,
+            "turn_seconds": [],
+            "audio": [],
+        }
+        start = time.perf_counter()
+        debate = None
+        try:
+            debate = AsyncDebate(config=config, model_name=args.model, client=client)
+            # Not wait_for: a TimeoutError raised by a model call past its own
+            # deadline is an error, only this debate's deadline is a timeout
+            task = asyncio.ensure_future(play(debate, result, audio_dir))
+            done, _ = await asyncio.wait([task], timeout=args.timeout)
+            if done:
+                task.result()
+                result["status"] = "finished" if debate.debate_finished else "max_turns"
+            else:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+                result["status"] = "timeout"
+        except Exception as e:
+            result["status"] = "error"
+            result["error"] = str(e)
+        result["seconds"] = time.perf_counter() - start
+
+        if debate is not None:
+            result["language"] = getattr(debate, "language", None)
+            result["turns"] = debate.current_turn
+            result["transcript"] = debate.transcript
+            result["usage"] = debate.usage.get_stats()
+            if hasattr(debate, "context_cache"):
+                await debate.close()
+
+        output.write(json.dumps(result, ensure_ascii=False) + "\n")
+        output.flush()
+        return result
+
+
+async def run_batch(jobs, args):
+    # Model calls go through the process-wide gateway, which the client uses
+    gateway = get_gateway()
+    if args.calls_per_minute:
+        gateway.configure(calls_per_minute=args.calls_per_minute, burst=args.burst)
+    client = get_genai_client()
+    workers = asyncio.Semaphore(args.workers)
+
+    start = time.perf_counter()
+    with open(args.output, "a", encoding="utf-8") as output:
+        tasks = [
+            asyncio.create_task(run_debate(job, args, client, workers, output))
+            for job in jobs
+        ]
+        for done, task in enumerate(asyncio.as_completed(tasks), start=1):
+            result = await task
+            print(
+                f"[{done}/{len(jobs)}] {result['config']}: {result['status']} "
+                f"after {result.get('turns', 0)} turns in {result['seconds']:.1f}s",
+                file=sys.stderr,
+            )
+    elapsed = time.perf_counter() - start
+    print(
+        f"Ran {len(jobs)} debates in {elapsed:.1f}s ({len(jobs) / elapsed * 3600:.0f} per hour).",
+        file=sys.stderr,
+    )
+    calls = gateway.get_stats()["total"]
+    print(
+        f"Model calls: {calls['calls']}, {calls['throttled']} throttled, "
+        f"{calls['retries']} retried, {calls['failures']} failed.",
+        file=sys.stderr,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("configs", nargs="+", help="config files or directories")
+    parser.add_argument(
+        "--repeat", type=int, default=1, help="number of debates per config"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=8, help="debates running at the same time"
+    )
+    parser.add_argument(
+        "--calls-per-minute",
+        type=float,
+        default=0,
+        help="limit on calls per model across all debates (0: DEBATE_CALLS_PER_MINUTE)",
+    )
+    parser.add_argument(
+        "--burst", type=int, default=1, help="model calls allowed back to back"
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=600, help="seconds allowed per debate"
+    )
+    parser.add_argument("--output", default="batch_results.jsonl")
+    parser.add_argument("--audio-dir", help="synthesize speech and save it here")
+    parser.add_argument("--model", default="gemini-2.0-flash-lite")
+    args = parser.parse_args()
+
+    load_dotenv()
+    jobs = []
+    for path in find_configs(args.configs):
+        config = load_debate_config(path)
+        name = os.path.splitext(os.path.basename(path))[0]
+        for i in range(args.repeat):
+            jobs.append({"id": f"{name}-{i + 1}", "path": path, "config": config})
+
+    asyncio.run(run_batch(jobs, args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Benchmark listing the debate examples as the library grows.
+
+For libraries of copies of the bundled examples, it compares parsing every
+file on each page load (what the index route used to do) with the example
+catalog: its first indexing, a forced re-check with no file changed, and a
+cached listing, which is what a page load costs between checks. Run from
+the repository root:
+
+    python benchmarks/bench_example_catalog.py --sizes 10 100 1000 5000
+"""
+
+import argparse
+import glob
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from example_catalog import ExampleCatalog  # noqa: E402
+
+
+def make_library(directory, size):
+    """Write `size` example configs to `directory`."""
+    examples = []
+    for path in sorted(glob.glob(os.path.join(ROOT, "debate_examples", "*.json"))):
+        with open(path) as f:
+            examples.append(json.load(f))
+    for i in range(size):
+        config = dict(examples[i % len(examples)])
+        config["title"] = f"{config['title']} ({i})"
+        with open(os.path.join(directory, f"example_{i:05d}.json"), "w") as f:
+            json.dump(config, f)
+
+
+def parse_all(directory):
+    """List the examples by parsing every file, as the index route used to."""
+    examples = []
+    for filename in os.listdir(directory):
+        if filename.endswith(".json"):
+            with open(os.path.join(directory, filename)) as f:
+                config = json.load(f)
+            examples.append({"filename": filename, "title": config.get("title")})
+    return examples
+
+
+def timed(function, repeat):
+    """Return the mean time of `function()` in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        f"{'examples':>8} {'parse all':>12} {'first index':>12} "
+        f"{'re-check':>12} {'cached':>12}"
+    )
+    for size in args.sizes:
+        directory = tempfile.mkdtemp()
+        try:
+            make_library(directory, size)
+            parse_ms = timed(lambda: parse_all(directory), args.repeat)
+
+            start = time.perf_counter()
+            catalog = ExampleCatalog(directory)
+            catalog.options_html()
+            first_ms = (time.perf_counter() - start) * 1000
+
+            recheck_ms = timed(lambda: catalog.refresh(force=True), args.repeat)
+            cached_ms = timed(catalog.options_html, args.repeat * 1000)
+            print(
+                f"{size:>8} {parse_ms:>10.3f}ms {first_ms:>10.3f}ms "
+                f"{recheck_ms:>10.3f}ms {cached_ms:>10.4f}ms"
+            )
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
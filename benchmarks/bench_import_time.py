@@ -0,0 +1,81 @@
+"""Benchmark the import time of the debate modules with `python -X importtime`.
+
+Each module is imported in a fresh interpreter, without GEMINI_API_KEY set,
+and the cumulative import time is the median of `--runs` runs. The text-only
+path should not load google.cloud.texttospeech at all, and no debate module
+should load google.genai before the first model call; their own import times
+are reported for comparison. Run from the repository root:
+
+    python benchmarks/bench_import_time.py --runs 5
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = [
+    "debate",
+    "async_debate",
+    "app",
+    "asgi_app",
+    "google.genai",
+    "google.cloud.texttospeech",
+]
+
+
+def import_time(module):
+    """Return the cumulative import time of `module` in microseconds, and
+    the set of modules it imported."""
+    env = dict(os.environ)
+    env.pop("GEMINI_API_KEY", None)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    cumulative = 0
+    imported = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative_us, name = line[len("import time:") :].split("|")
+        if not cumulative_us.strip().isdigit():
+            continue  # header line
+        name = name.strip()
+        imported.add(name)
+        if name == module:
+            cumulative = int(cumulative_us)
+    return cumulative, imported
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    for module in MODULES:
+        try:
+            runs = [import_time(module) for _ in range(args.runs)]
+        except RuntimeError as e:
+            print(f"{module:28} failed: {e}")
+            continue
+        median_ms = statistics.median(us for us, _ in runs) / 1000
+        genai = "google.genai" in runs[0][1]
+        tts = "google.cloud.texttospeech" in runs[0][1]
+        print(
+            f"{module:28} {median_ms:8.1f} ms  loads genai: {'yes' if genai else 'no'}"
+            f"  loads texttospeech: {'yes' if tts else 'no'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
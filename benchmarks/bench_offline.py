@@ -0,0 +1,311 @@
+"""Offline benchmark of whole debates, with fake Gemini and TTS clients.
+
+For debates of 10, 100 and 1000 turns, it measures:
+
+* the per-turn latency of each phase (turn generation, speaker selection,
+  speech synthesis), with the fake services answering after `--latency`
+  and `--tts-latency` seconds (plus or minus `--jitter`);
+* the growth of the prompts sent, in estimated tokens;
+* the memory retained by the debate and its allocation peak;
+* the SSE throughput of app.py, replaying the whole debate to a client and
+  fanning a live debate out to `--subscribers` clients.
+
+Results are written as JSON, with the commit they were measured on, so
+runs on different commits can be compared. Run from the repository root:
+
+    python benchmarks/bench_offline.py --output bench_output.json
+    python benchmarks/bench_offline.py --compare bench_output.json
+"""
+
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Measure synthesis, not the on-disk audio cache
+os.environ["DEBATE_AUDIO_CACHE_MB"] = "0"
+
+import app  # noqa: E402
+from debate import Debate  # noqa: E402
+from fakes import Distribution, FakeGenaiClient, FakeTTSClient  # noqa: E402
+from pacing import FixedDelay  # noqa: E402
+
+CONFIG = {
+    "title": "Should cities ban cars from their centres?",
+    "description": "Urban planners, residents and shop owners debate car-free city centres.",
+    "agents": [
+        {
+            "name": "Moderator",
+            "role": "Debate Moderator",
+            "persona": "Keeps the debate focused and fair.",
+            "is_moderator": True,
+        },
+        {
+            "name": "Alice Martin",
+            "role": "Urban Planner",
+            "persona": "Argues for pedestrian zones and public transport.",
+        },
+        {
+            "name": "Bob Stone",
+            "role": "Shop Owner",
+            "persona": "Worries that customers won't come without parking.",
+        },
+        {
+            "name": "Carol Wu",
+            "role": "Resident",
+            "persona": "Wants cleaner air but needs to drive to work.",
+        },
+    ],
+    "enable_voice": True,
+}
+
+TURNS = (10, 100, 1000)
+
+
+def create_debate(args, max_turns):
+    config = dict(
+        CONFIG,
+        max_turns=max_turns,
+        speaker_selection=args.speaker_selection,
+        single_call_turns=args.single_call,
+    )
+    client = FakeGenaiClient(
+        latency=Distribution(args.latency, args.jitter * args.latency, seed=1)
+    )
+    tts_client = FakeTTSClient(
+        latency=Distribution(args.tts_latency, args.jitter * args.tts_latency, seed=2)
+    )
+    return Debate(config=config, client=client, tts_client=tts_client)
+
+
+def percentiles(samples):
+    """Return the mean, median and 95th percentile of `samples` in milliseconds."""
+    if not samples:
+        return {"mean_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0}
+    ordered = sorted(samples)
+    return {
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "p50_ms": ordered[len(ordered) // 2] * 1000,
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+    }
+
+
+def run_turns(debate):
+    """Run the debate to its end, returning the seconds spent in each phase per turn."""
+    phases = {"generate": [], "select_speaker": [], "synthesize": []}
+    debate.start()
+    while debate.debate_running:
+        start = time.perf_counter()
+        entry = debate.run_next_turn()
+        generated = time.perf_counter()
+        if entry is None:
+            break
+        debate.update_next_speaker()
+        selected = time.perf_counter()
+        debate.synthesize_turn(entry)
+        synthesized = time.perf_counter()
+
+        phases["generate"].append(generated - start)
+        phases["select_speaker"].append(selected - generated)
+        phases["synthesize"].append(synthesized - selected)
+    return phases
+
+
+def bench_latency(args, max_turns):
+    debate = create_debate(args, max_turns)
+    start = time.perf_counter()
+    phases = run_turns(debate)
+    elapsed = time.perf_counter() - start
+
+    turn_prompts = debate.client.prompt_chars.get("turn", [])
+    selection_prompts = debate.client.prompt_chars.get("speaker_selection", [])
+    results = {"turns": debate.current_turn, "seconds_per_turn": elapsed / max_turns}
+    for phase, samples in phases.items():
+        for name, value in percentiles(samples).items():
+            results[f"{phase}_{name}"] = value
+    results.update(
+        first_turn_prompt_tokens=turn_prompts[0] // 4 if turn_prompts else 0,
+        last_turn_prompt_tokens=turn_prompts[-1] // 4 if turn_prompts else 0,
+        last_selection_prompt_tokens=(
+            selection_prompts[-1] // 4 if selection_prompts else 0
+        ),
+        input_tokens=debate.usage.total["input_tokens"],
+    )
+    debate.close()
+    return results
+
+
+def bench_memory(args, max_turns):
+    tracemalloc.start()
+    debate = create_debate(args, max_turns)
+    run_turns(debate)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    debate.close()
+    return {
+        "retained_kib": current / 1024,
+        "peak_kib": peak / 1024,
+        "retained_bytes_per_turn": current / max_turns,
+    }
+
+
+def read_stream(client, url, received, until=None):
+    """Read an SSE stream from the Flask test client, counting messages and bytes."""
+    response = client.get(url, buffered=False)
+    try:
+        for chunk in response.response:
+            text = chunk.decode() if isinstance(chunk, bytes) else chunk
+            received["messages"] += 1
+            received["bytes"] += len(text.encode())
+            if until(text):
+                break
+    finally:
+        response.close()
+
+
+def bench_sse(args, max_turns):
+    client = app.app.test_client()
+
+    # Replay a finished debate to a client that has seen nothing
+    debate = create_debate(args, max_turns)
+    run_turns(debate)
+    session = app.registry.create(debate)
+    last_id = debate.events.last_seq
+    received = {"messages": 0, "bytes": 0}
+    start = time.perf_counter()
+    read_stream(
+        client,
+        f"/stream_debate?debate_id={session.id}&last_event_id=0",
+        received,
+        until=lambda text: text.startswith(f"id: {last_id}\n")
+        or '"last_event_id": ' in text,
+    )
+    replay_seconds = time.perf_counter() - start
+    app.registry.remove(session.id)
+
+    # Fan a live debate out to several clients, through the single producer
+    debate = create_debate(args, max_turns)
+    session = app.registry.create(debate)
+    session.broadcaster.pacing.policy = FixedDelay(0)
+    counters = [{"messages": 0, "bytes": 0} for _ in range(args.subscribers)]
+    readers = [
+        threading.Thread(
+            target=read_stream,
+            args=(
+                client,
+                f"/stream_debate?debate_id={session.id}",
+                counter,
+                lambda text: "event: status_changed" in text
+                and '"is_running": false' in text,
+            ),
+        )
+        for counter in counters
+    ]
+    for reader in readers:
+        reader.start()
+    while len(session.broadcaster.subscribers) < args.subscribers:
+        time.sleep(0.01)
+    start = time.perf_counter()
+    with session.lock:
+        debate.start()
+        session.broadcaster.start()
+    for reader in readers:
+        reader.join()
+    live_seconds = time.perf_counter() - start
+    app.registry.remove(session.id)
+
+    live_messages = sum(counter["messages"] for counter in counters)
+    return {
+        "replay_messages": received["messages"],
+        "replay_messages_per_second": received["messages"] / replay_seconds,
+        "replay_mib_per_second": received["bytes"] / replay_seconds / 2**20,
+        "live_messages": live_messages,
+        "live_messages_per_second": live_messages / live_seconds,
+        "live_turns_per_second": debate.current_turn / live_seconds,
+    }
+
+
+def commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(previous, results):
+    """Print each metric next to its value in a previous run."""
+    print(f"\nCompared to {previous['meta'].get('commit')}:")
+    for turns, metrics in results.items():
+        for name, value in metrics.items():
+            old = previous["results"].get(turns, {}).get(name)
+            if old is None:
+                continue
+            ratio = f"{value / old:6.2f}x" if old else "     -"
+            print(f"{turns:>5} {name:32} {old:12.2f} -> {value:12.2f} {ratio}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, nargs="+", default=list(TURNS))
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--tts-latency", type=float, default=0.0)
+    parser.add_argument(
+        "--jitter", type=float, default=0.2, help="standard deviation / mean"
+    )
+    parser.add_argument("--speaker-selection", choices=["llm", "local"], default="llm")
+    parser.add_argument("--single-call", action="store_true")
+    parser.add_argument("--subscribers", type=int, default=10)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="compare with the results in this JSON file")
+    args = parser.parse_args()
+
+    results = {}
+    for max_turns in args.turns:
+        # The debate code prints every turn; keep the report readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            metrics = bench_latency(args, max_turns)
+            metrics.update(bench_memory(args, max_turns))
+            metrics.update(bench_sse(args, max_turns))
+        results[str(max_turns)] = metrics
+        print(f"{max_turns} turns:")
+        for name, value in metrics.items():
+            print(f"  {name:32} {value:12.2f}")
+
+    report = {
+        "meta": {
+            "commit": commit(),
+            "date": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "args": vars(args),
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Benchmark prompt construction: legacy string concatenation vs PromptBuilder.
+
+Simulates a debate of N turns and measures, for each turn, the time and
+memory allocated to build the prompt, and the prompt's estimated tokens at
+the last turn. The "window" method keeps the 12 latest turns verbatim under
+an 8000 token budget, folding older turns into a summary as soon as they
+leave the window (a real debate summarizes in the background, with a lag of
+one model call). Run from the repository root:
+
+    python benchmarks/bench_prompt_builder.py
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from prompt_builder import CHARS_PER_TOKEN, PromptBuilder  # noqa: E402
+
+
+class FakeAgent:
+    def __init__(self, name, role, persona, is_moderator=False):
+        self.name = name
+        self.role = role
+        self.persona = persona
+        self.is_moderator = is_moderator
+
+
+AGENTS = [
+    FakeAgent("Moderator", "Debate Moderator", "Guides the discussion.", True),
+    FakeAgent("Alice", "Economist", "Focuses on costs and incentives."),
+    FakeAgent("Bob", "Engineer", "Focuses on feasibility."),
+    FakeAgent("Carol", "Ethicist", "Focuses on long-term consequences."),
+]
+MESSAGE = "I think we should consider the broader implications of this. " * 4
+SUMMARY = "Alice and Bob disagree on costs; Carol asks about consequences. " * 10
+
+
+def legacy_prompt(title, description, agents, language, transcript, agent, turn):
+    """Copy of the original Debate.generate_prompt."""
+    debate_context = f"""
+Debate topic: {title}
+Debate description: {description}
+Participants: {", ".join([f"{a.name} ({a.role})" for a in agents])}
+Debate language: {language}
+
+You are {agent.name}, playing the role of {agent.role}.
+Your persona: {agent.persona}
+
+Current debate transcript:
+"""
+    if turn == 0:
+        debate_context += "(The debate is just starting. As the moderator, introduce the topic and participants.)"
+    else:
+        for entry in transcript:
+            debate_context += f"{entry['speaker']}: {entry['message']}"
+
+    debate_context += f"""
+Based on the debate so far, provide your next contribution as {agent.name}.
+Your response should reflect your role and persona.
+Be concise and to the point. You can respond with just a few words, a sentence or sometimes a few sentences.
+"""
+    if agent.is_moderator:
+        debate_context += "You will be the moderator of this debate. After introducing the debate and its participants, you will guide the discussion. If the debate has come to an end, clearly state 'The debate is now closed' at the end of your message."
+
+    debate_context += f"You MUST respond in {language} language."
+    return debate_context
+
+
+def run(n_turns, method):
+    """Return (mean seconds per turn, mean bytes allocated per turn, last prompt tokens)."""
+    transcript = []
+    if method == "window":
+        builder = PromptBuilder(
+            "Topic",
+            "Description",
+            AGENTS,
+            "English",
+            recent_turns=12,
+            token_budget=8000,
+        )
+    else:
+        builder = PromptBuilder("Topic", "Description", AGENTS, "English")
+    total_time = 0.0
+    total_alloc = 0
+    prompt = ""
+
+    tracemalloc.start()
+    for turn in range(n_turns):
+        agent = AGENTS[turn % len(AGENTS)]
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        start = time.perf_counter()
+        if method == "legacy":
+            prompt = legacy_prompt(
+                "Topic", "Description", AGENTS, "English", transcript, agent, turn
+            )
+        else:
+            builder.sync(transcript)
+            prompt = builder.build(agent, first_turn=turn == 0)
+        total_time += time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        total_alloc += peak - before
+        transcript.append({"speaker": agent.name, "message": MESSAGE})
+        if method == "window":
+            builder.sync(transcript)
+            job = builder.pending_summary()
+            if job:
+                builder.fold(job, SUMMARY)
+    tracemalloc.stop()
+
+    return total_time / n_turns, total_alloc / n_turns, len(prompt) // CHARS_PER_TOKEN
+
+
+def main():
+    print(f"{'turns':>6} {'method':>8} {'us/turn':>10} {'KiB/turn':>10} {'tokens':>8}")
+    for n_turns in (10, 100, 1000):
+        for method in ("legacy", "builder", "window"):
+            seconds, allocated, tokens = run(n_turns, method)
+            print(
+                f"{n_turns:>6} {method:>8} {seconds * 1e6:>10.1f} {allocated / 1024:>10.1f} {tokens:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
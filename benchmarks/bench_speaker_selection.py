@@ -0,0 +1,101 @@
+"""Benchmark speaker selection: LocalSpeakerSelector vs LLMSpeakerSelector.
+
+The LLM strategy runs against a fake context cache that answers after
+`--llm-latency` seconds (0 by default, i.e. only its local prompt building
+is measured; a real Gemini round trip typically adds hundreds of ms).
+Run from the repository root:
+
+    python benchmarks/bench_speaker_selection.py --llm-latency 0.3
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from prompt_builder import PromptBuilder  # noqa: E402
+from speaker_selection import LLMSpeakerSelector, LocalSpeakerSelector  # noqa: E402
+
+
+class FakeAgent:
+    def __init__(self, name, role, persona="", is_moderator=False):
+        self.name = name
+        self.role = role
+        self.persona = persona
+        self.is_moderator = is_moderator
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeContextCache:
+    def __init__(self, latency):
+        self.latency = latency
+
+    def generate(self, prompt, **kwargs):
+        time.sleep(self.latency)
+        return FakeResponse("Alice Martin")
+
+
+class FakeDebate:
+    def __init__(self, latency):
+        self.agents = [
+            FakeAgent("Moderator", "Debate Moderator", is_moderator=True),
+            FakeAgent("Alice Martin", "Economist"),
+            FakeAgent("Bob Stone", "Engineer"),
+            FakeAgent("Carol Wu", "Ethicist"),
+        ]
+        self.transcript = []
+        self.context_cache = FakeContextCache(latency)
+        self.prompt_builder = PromptBuilder(
+            "Topic", "Description", self.agents, "English", token_budget=8000
+        )
+
+
+MESSAGES = [
+    "I think we should consider the broader implications of this.",
+    "Alice, what would that cost in practice?",
+    "Bob raised a good point earlier. Carol, do you agree?",
+]
+
+
+def run(selector, n_turns, latency):
+    """Return the mean seconds per decision over a debate of `n_turns`."""
+    debate = FakeDebate(latency)
+    speaker = debate.agents[0].name
+    total = 0.0
+    for turn in range(n_turns):
+        debate.transcript.append(
+            {"speaker": speaker, "message": MESSAGES[turn % len(MESSAGES)]}
+        )
+        start = time.perf_counter()
+        chosen = selector.choose(debate)
+        total += time.perf_counter() - start
+        # Keep the debate moving even if the fake LLM always picks one name
+        if chosen == speaker:
+            chosen = debate.agents[(turn + 1) % len(debate.agents)].name
+        speaker = chosen
+    return total / n_turns
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--llm-latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    print(f"{'turns':>6} {'strategy':>8} {'us/decision':>12}")
+    for n_turns in (10, 100, 1000):
+        local = run(LocalSpeakerSelector(), n_turns, args.llm_latency)
+        # Simulated latency makes long LLM runs slow; cap them at 100 turns
+        llm_turns = n_turns if not args.llm_latency else min(n_turns, 100)
+        llm = run(LLMSpeakerSelector(), llm_turns, args.llm_latency)
+        print(f"{n_turns:>6} {'local':>8} {local * 1e6:>12.1f}")
+        print(f"{n_turns:>6} {'llm':>8} {llm * 1e6:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
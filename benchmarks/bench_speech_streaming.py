@@ -0,0 +1,77 @@
+"""Benchmark the time to first audio of a turn, synthesized whole or streamed.
+
+For messages of increasing length, it compares `synthesize_turn`, whose MP3
+is only returned once the whole message is rendered, with `stream_speech`,
+whose first Ogg Opus chunk can be played as soon as it is rendered. The fake
+TTS client answers after `--latency` seconds, then renders audio at
+`--real-time-factor` seconds per second of speech. It also checks that the
+streamed audio lasts as long as the whole clip. Run from the repository root:
+
+    python benchmarks/bench_speech_streaming.py --latency 0.3 --real-time-factor 0.2
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Measure synthesis, not the on-disk audio cache
+os.environ["DEBATE_AUDIO_CACHE_MB"] = "0"
+
+import ogg  # noqa: E402
+from bench_offline import CONFIG  # noqa: E402
+from debate import Debate  # noqa: E402
+from fakes import WORDS, Distribution, FakeGenaiClient, FakeTTSClient  # noqa: E402
+
+
+def message(words):
+    return " ".join(WORDS[i % len(WORDS)] for i in range(words)) + "."
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--words", type=int, nargs="+", default=[20, 80, 200])
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--real-time-factor", type=float, default=0.2)
+    args = parser.parse_args()
+
+    tts_client = FakeTTSClient(
+        latency=Distribution(args.latency), real_time_factor=args.real_time_factor
+    )
+    debate = Debate(config=CONFIG, client=FakeGenaiClient(), tts_client=tts_client)
+    speaker = debate.agents[1].name
+
+    print(
+        f"{'words':>6} {'audio':>8} {'whole clip':>12} {'first chunk':>12} "
+        f"{'stream end':>12} {'streamed audio':>15}"
+    )
+    for words in args.words:
+        entry = {"speaker": speaker, "message": message(words)}
+
+        start = time.perf_counter()
+        clip = debate.synthesize_turn(entry)
+        whole = time.perf_counter() - start
+
+        start = time.perf_counter()
+        first = None
+        chunks = []
+        for chunk in debate.stream_speech(speaker, debate.language, entry["message"]):
+            if first is None and ogg.duration(b"".join(chunks + [chunk])) > 0:
+                first = time.perf_counter() - start
+            chunks.append(chunk)
+        end = time.perf_counter() - start
+
+        print(
+            f"{words:>6} {clip['duration']:>7.2f}s {whole * 1000:>10.0f}ms "
+            f"{first * 1000:>10.0f}ms {end * 1000:>10.0f}ms "
+            f"{ogg.duration(b''.join(chunks)):>14.2f}s"
+        )
+    debate.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Measure SSE bytes per turn: full get_state() payloads vs delta events.
+
+Run from the repository root:
+
+    python benchmarks/bench_sse_events.py
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from debate_events import EventLog, format_snapshot, format_sse  # noqa: E402
+
+AGENTS = [
+    {
+        "name": "Moderator",
+        "role": "Debate Moderator",
+        "persona": "Guides the discussion.",
+        "is_moderator": True,
+    },
+    {
+        "name": "Alice",
+        "role": "Economist",
+        "persona": "Focuses on costs and incentives.",
+        "is_moderator": False,
+    },
+    {
+        "name": "Bob",
+        "role": "Engineer",
+        "persona": "Focuses on feasibility.",
+        "is_moderator": False,
+    },
+]
+MESSAGE = "I think we should consider the broader implications of this. " * 3
+
+
+def main():
+    events = EventLog()
+    transcript = []
+    state = {
+        "title": "Topic",
+        "description": "Description",
+        "agents": AGENTS,
+        "transcript": transcript,
+        "max_turns": 100,
+        "is_running": True,
+        "is_finished": False,
+        "language": "English",
+    }
+
+    print(
+        f"{'turn':>5} {'full state (B)':>15} {'delta events (B)':>17} {'snapshot (B)':>13}"
+    )
+    for turn in range(1, 101):
+        speaker = AGENTS[turn % len(AGENTS)]["name"]
+        entry = {"speaker": speaker, "message": MESSAGE}
+        transcript.append(entry)
+        next_speaker = AGENTS[(turn + 1) % len(AGENTS)]["name"]
+        state.update(current_turn=turn, next_speaker=next_speaker)
+
+        # What the old /stream_debate sent after every turn
+        full = len(f"data: {json.dumps(state)}\n\n".encode())
+
+        # What is sent now: a turn_appended and a next_speaker event
+        turn_event = events.append("turn_appended", {"turn": turn, "entry": entry})
+        speaker_event = events.append("next_speaker", {"name": next_speaker})
+        delta = len(format_sse(turn_event).encode()) + len(
+            format_sse(speaker_event).encode()
+        )
+
+        if turn in (5, 100):
+            state["last_event_id"] = events.last_seq
+            snapshot = len(format_snapshot(state).encode())
+            print(f"{turn:>5} {full:>15} {delta:>17} {snapshot:>13}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Check offline language detection against the bundled debate configs.
+
+The examples in debate_examples/ are expected to be detected as English,
+and their translations in benchmarks/language_samples/fr/ as French.
+Configs below the confidence threshold would be sent to Gemini instead.
+Run from the repository root:
+
+    python benchmarks/check_language_detection.py
+"""
+
+import glob
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from language_detection import (  # noqa: E402
+    MIN_CONFIDENCE,
+    debate_texts,
+    detect_language,
+)
+
+SAMPLES = [
+    ("English", os.path.join(ROOT, "debate_examples", "*.json")),
+    ("French", os.path.join(ROOT, "benchmarks", "language_samples", "fr", "*.json")),
+]
+
+
+def main():
+    correct = fallbacks = total = 0
+    elapsed = 0.0
+    for expected, pattern in SAMPLES:
+        for path in sorted(glob.glob(pattern)):
+            with open(path, "r", encoding="utf-8") as f:
+                texts = debate_texts(json.load(f))
+
+            start = time.perf_counter()
+            language, confidence = detect_language(texts)
+            elapsed += time.perf_counter() - start
+
+            total += 1
+            if confidence < MIN_CONFIDENCE:
+                fallbacks += 1
+                verdict = "ask Gemini"
+            elif language == expected:
+                correct += 1
+                verdict = "ok"
+            else:
+                verdict = "WRONG"
+            print(
+                f"{os.path.relpath(path, ROOT):50} {expected:8} -> {language:8} ({confidence:.2f}) {verdict}"
+            )
+
+    print(
+        f"\n{correct}/{total} detected locally and correctly, {fallbacks} sent to Gemini, "
+        f"{total - correct - fallbacks} wrong; {elapsed / total * 1000:.3f} ms per config"
+    )
+    return 0 if correct + fallbacks == total else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
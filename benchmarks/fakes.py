@@ -0,0 +1,269 @@
+"""Local stand-ins for the Gemini and Google Cloud TTS clients.
+
+They implement the subset of the client interfaces that `Debate` uses, answer
+after a configurable latency with responses of a configurable size, and
+report token usage like the real services, so debates can be benchmarked
+without network access or credentials.
+"""
+
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+
+from mp3 import MPEG2_BITRATES
+
+WORDS = (
+    "we should consider the costs and the long term consequences of this plan".split()
+)
+
+# One silent MPEG 2 Layer III frame: 24 kHz, mono, 32 kbps, 24 ms of audio
+MP3_FRAME = bytes([0xFF, 0xF3, 0x44, 0xC0]) + bytes(
+    72 * MPEG2_BITRATES[4] * 1000 // 24000 - 4
+)
+MP3_FRAME_SECONDS = 576 / 24000
+
+# Speech rate used to size the fake audio
+CHARACTERS_PER_SECOND = 15
+
+# Seconds of fake Ogg Opus audio per streamed chunk, and its bytes per second
+OPUS_CHUNK_SECONDS = 0.5
+OPUS_BYTES_PER_SECOND = 4000
+
+
+def ogg_page(granule, payload, sequence):
+    """Build an Ogg page holding `payload` (CRC left out, as it isn't checked)."""
+    segments = [255] * (len(payload) // 255) + [len(payload) % 255]
+    return (
+        b"OggS"
+        + bytes(2)
+        + granule.to_bytes(8, "little", signed=True)
+        + bytes(4)
+        + sequence.to_bytes(4, "little")
+        + bytes(4)
+        + bytes([len(segments)] + segments)
+        + payload
+    )
+
+
+OPUS_HEAD = ogg_page(
+    0, b"OpusHead" + bytes([1, 1]) + (312).to_bytes(2, "little") + bytes(7), 0
+)
+
+
+class Distribution:
+    """A normal distribution clipped at zero, or a constant when `jitter` is 0."""
+
+    def __init__(self, mean, jitter=0.0, seed=None):
+        self.mean = mean
+        self.jitter = jitter
+        self.random = random.Random(seed)
+
+    def sample(self):
+        if not self.jitter:
+            return self.mean
+        return max(0.0, self.random.gauss(self.mean, self.jitter))
+
+
+class FakeUsage:
+    def __init__(self, prompt, text, cached_tokens=0):
+        self.prompt_token_count = len(prompt) // 4 + cached_tokens
+        self.candidates_token_count = len(text) // 4
+        self.cached_content_token_count = cached_tokens
+        self.total_token_count = self.prompt_token_count + self.candidates_token_count
+
+
+class FakeResponse:
+    def __init__(self, text, usage_metadata=None):
+        self.text = text
+        self.usage_metadata = usage_metadata
+
+
+class FakeCache:
+    def __init__(self, name, tokens):
+        self.name = name
+        self.usage_metadata = FakeUsage("", "", cached_tokens=tokens)
+
+
+class FakeModels:
+    def __init__(self, client):
+        self.client = client
+
+    def generate_content(self, model, contents, config=None):
+        time.sleep(self.client.latency.sample())
+        return self.client.respond(contents, config)
+
+    def generate_content_stream(self, model, contents, config=None):
+        response = self.generate_content(model, contents, config)
+        yield from self.client.chunks(response)
+
+
+class FakeAsyncModels:
+    def __init__(self, client):
+        self.client = client
+
+    async def generate_content(self, model, contents, config=None):
+        await asyncio.sleep(self.client.latency.sample())
+        return self.client.respond(contents, config)
+
+    async def generate_content_stream(self, model, contents, config=None):
+        response = await self.generate_content(model, contents, config)
+
+        async def stream():
+            for chunk in self.client.chunks(response):
+                yield chunk
+
+        return stream()
+
+
+class FakeCaches:
+    def __init__(self, client):
+        self.client = client
+        self.caches = {}
+
+    def create(self, model, config):
+        text = "".join(
+            part.text for content in config.contents for part in content.parts
+        )
+        name = f"cachedContents/fake-{len(self.caches)}"
+        self.caches[name] = len(text) // 4
+        return FakeCache(name, self.caches[name])
+
+    def delete(self, name):
+        self.caches.pop(name, None)
+
+
+class FakeAsyncCaches:
+    def __init__(self, caches):
+        self.caches = caches
+
+    async def create(self, model, config):
+        return self.caches.create(model, config)
+
+    async def delete(self, name):
+        self.caches.delete(name)
+
+
+class FakeAsyncClient:
+    def __init__(self, client):
+        self.models = FakeAsyncModels(client)
+        self.caches = FakeAsyncCaches(client.caches)
+
+
+class FakeGenaiClient:
+    """Answers `generate_content` calls like Gemini would, from the prompt alone.
+
+    Structured requests get JSON matching their schema, speaker selection
+    prompts get a participant name, and other prompts get `words` random
+    words. Every call's prompt size is kept in `prompt_chars`, by kind.
+    The same calls are available from the asyncio API, under `aio`.
+    """
+
+    def __init__(self, latency=None, words=None, stream_chunks=4, seed=0):
+        self.latency = latency or Distribution(0.0)
+        self.words = words or Distribution(40, 15, seed=seed)
+        self.stream_chunks = stream_chunks
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.prompt_chars = {}
+        self.models = FakeModels(self)
+        self.caches = FakeCaches(self)
+        self.aio = FakeAsyncClient(self)
+
+    def respond(self, contents, config):
+        schema = getattr(config, "response_schema", None)
+        names = self._names(contents)
+        if schema is not None and schema.type == "ARRAY":
+            kind = "voice_choice"
+            voices = schema.items.properties["voice"].enum
+            agents = re.findall(r"^\s*- (.+?) \(", contents, re.MULTILINE)
+            text = json.dumps(
+                [
+                    {"name": name, "voice": voices[i % len(voices)]}
+                    for i, name in enumerate(agents)
+                ]
+            )
+        elif schema is not None:
+            kind = "turn"
+            next_speaker = schema.properties["next_speaker"].enum
+            text = json.dumps(
+                {
+                    "message": self._sentence(),
+                    "next_speaker": self.random.choice(next_speaker),
+                }
+            )
+        elif "should speak next" in contents and names:
+            kind = "speaker_selection"
+            text = self.random.choice(names)
+        elif "determine what language" in contents:
+            kind = "language_detection"
+            text = "English"
+        else:
+            kind = "summary" if "Update the summary" in contents else "turn"
+            text = self._sentence()
+
+        with self.lock:
+            self.prompt_chars.setdefault(kind, []).append(len(contents))
+        return FakeResponse(text, FakeUsage(contents, text))
+
+    def chunks(self, response):
+        """Split a response in a few stream chunks; usage comes with the last one."""
+        words = response.text.split(" ")
+        size = max(1, len(words) // self.stream_chunks)
+        for i in range(0, len(words), size):
+            last = i + size >= len(words)
+            yield FakeResponse(
+                " ".join(words[i : i + size]) + ("" if last else " "),
+                response.usage_metadata if last else None,
+            )
+
+    def _names(self, contents):
+        match = re.search(r"from this list: (.*)", contents)
+        return match.group(1).strip().split(", ") if match else []
+
+    def _sentence(self):
+        count = max(1, round(self.words.sample()))
+        return " ".join(self.random.choice(WORDS) for _ in range(count)) + "."
+
+
+class FakeTTSResponse:
+    def __init__(self, audio_content):
+        self.audio_content = audio_content
+
+
+class FakeTTSClient:
+    """Returns silent MP3 audio whose duration grows with the text length.
+
+    Synthesis answers after `latency`, plus `real_time_factor` times the
+    duration of the audio rendered. Streaming synthesis returns Ogg Opus
+    in chunks, each one as soon as it is rendered.
+    """
+
+    def __init__(self, latency=None, real_time_factor=0.0):
+        self.latency = latency or Distribution(0.0)
+        self.real_time_factor = real_time_factor
+
+    def synthesize_speech(self, input, voice, audio_config, **kwargs):
+        seconds = len(input.text) / CHARACTERS_PER_SECOND
+        time.sleep(self.latency.sample() + seconds * self.real_time_factor)
+        frames = max(1, round(seconds / MP3_FRAME_SECONDS))
+        return FakeTTSResponse(MP3_FRAME * frames)
+
+    def streaming_synthesize(self, requests, **kwargs):
+        text = "".join(request.input.text for request in requests)
+        seconds = len(text) / CHARACTERS_PER_SECOND
+        time.sleep(self.latency.sample())
+        yield FakeTTSResponse(OPUS_HEAD)
+        rendered = 0.0
+        sequence = 1
+        while rendered < seconds:
+            chunk = min(OPUS_CHUNK_SECONDS, seconds - rendered)
+            time.sleep(chunk * self.real_time_factor)
+            rendered += chunk
+            payload = bytes(round(chunk * OPUS_BYTES_PER_SECOND))
+            yield FakeTTSResponse(
+                ogg_page(round(rendered * 48000) + 312, payload, sequence)
+            )
+            sequence += 1
@@ -0,0 +1,85 @@
+"""Process-wide Gemini and Google Cloud TTS clients, created on first use.
+
+The client libraries are imported lazily too, so importing the debate
+modules stays cheap and text-only debates never load the TTS stack. Every
+debate in the process shares the same clients and their connection pools,
+and their calls all go through the process-wide gateway (see gateway.py).
+"""
+
+import asyncio
+import os
+import threading
+
+from dotenv import load_dotenv
+
+from gateway import (
+    AsyncGatewayTTSClient,
+    GatewayClient,
+    GatewayTTSClient,
+    get_gateway,
+)
+
+load_dotenv()
+
+_lock = threading.Lock()
+_genai_client = None
+_tts_client = None
+_async_tts_clients = {}
+
+
+def get_genai_client():
+    """Return the shared Gemini client."""
+    global _genai_client
+    if _genai_client is None:
+        with _lock:
+            if _genai_client is None:
+                import google.genai as genai
+                from google.genai import types
+
+                api_key = os.getenv("GEMINI_API_KEY")
+                if not api_key:
+                    raise ValueError(
+                        "Please set GEMINI_API_KEY in environment variables."
+                    )
+                gateway = get_gateway()
+                # Bound each attempt, as the gateway can't interrupt a blocking call
+                client = genai.Client(
+                    api_key=api_key,
+                    http_options=types.HttpOptions(
+                        timeout=int(gateway.deadline * 1000)
+                    ),
+                )
+                _genai_client = GatewayClient(client, gateway)
+    return _genai_client
+
+
+def get_tts_client():
+    """Return the shared Google Cloud TTS client."""
+    global _tts_client
+    if _tts_client is None:
+        with _lock:
+            if _tts_client is None:
+                from google.cloud import texttospeech
+
+                _tts_client = GatewayTTSClient(
+                    texttospeech.TextToSpeechClient(), get_gateway()
+                )
+    return _tts_client
+
+
+def get_async_tts_client():
+    """Return the Google Cloud TTS async client of the running event loop.
+
+    The async client binds to the loop it is created on, so there is one per loop.
+    """
+    loop = asyncio.get_running_loop()
+    with _lock:
+        client = _async_tts_clients.get(loop)
+        if client is None:
+            from google.cloud import texttospeech
+
+            client = AsyncGatewayTTSClient(
+                texttospeech.TextToSpeechAsyncClient(), get_gateway()
+            )
+            _async_tts_clients[loop] = client
+    return client
@@ -0,0 +1,273 @@
+import time
+
+from prompt_builder import CHARS_PER_TOKEN
+
+# Gemini refuses to cache contents smaller than this many tokens
+MIN_CACHE_TOKENS = 4096
+
+
+class ContextCache:
+    """Sends the static debate preamble once as a Gemini cached context.
+
+    Prompts passed to `generate` only contain the per-turn part. When a cache
+    could be created they reference it; otherwise the preamble is prepended
+    inline, exactly as if caching did not exist. Each method has an `_async`
+    twin that goes through the client's asyncio API. Generation calls are
+    recorded in the `usage` tracker, if any, under a call type and agent.
+
+    Gemini only caches contents of at least MIN_CACHE_TOKENS tokens, so a
+    debate's preamble is only cached when its personas are long: those of
+    the bundled examples are about 300 to 400 tokens, and sent inline.
+    """
+
+    def __init__(self, client, model_name, preamble, ttl="3600s", usage=None):
+        self.client = client
+        self.usage = usage
+        self.model_name = model_name
+        self.preamble = preamble
+        self.ttl = ttl
+        self.name = None
+        self.cached_tokens = 0
+        self.cached_calls = 0
+        self.tokens_saved = 0
+
+    def _worth_caching(self, min_tokens):
+        estimated_tokens = len(self.preamble) // CHARS_PER_TOKEN
+        if estimated_tokens < min_tokens:
+            print(
+                f"Context cache: preamble is ~{estimated_tokens} tokens, below the {min_tokens} token minimum. Sending it inline."
+            )
+            return False
+        return True
+
+    def _create_config(self):
+        from google.genai import types
+
+        return types.CreateCachedContentConfig(
+            contents=[
+                types.Content(role="user", parts=[types.Part(text=self.preamble)])
+            ],
+            ttl=self.ttl,
+        )
+
+    def _created(self, cache):
+        self.name = cache.name
+        if cache.usage_metadata:
+            self.cached_tokens = cache.usage_metadata.total_token_count or 0
+        print(f"Context cache created: {self.name} ({self.cached_tokens} tokens).")
+
+    def _cached_request(self, prompt, config):
+        from google.genai import types
+
+        return {
+            "model": self.model_name,
+            "contents": prompt,
+            "config": types.GenerateContentConfig(cached_content=self.name, **config),
+        }
+
+    def _inline_request(self, prompt, config):
+        from google.genai import types
+
+        return {
+            "model": self.model_name,
+            "contents": self.preamble + prompt,
+            "config": types.GenerateContentConfig(**config) if config else None,
+        }
+
+    def _cache_failed(self, error):
+        # The cache may have expired or been deleted; stop using it
+        print(f"Warning: Cached context failed ({error}). Sending it inline.")
+        self.name = None
+
+    def create(self, min_tokens=MIN_CACHE_TOKENS):
+        """Register the preamble as a cached context, if possible."""
+        if not self._worth_caching(min_tokens):
+            return False
+        try:
+            cache = self.client.caches.create(
+                model=self.model_name, config=self._create_config()
+            )
+        except Exception as e:
+            print(f"Warning: Context caching unavailable ({e}). Sending it inline.")
+            return False
+        self._created(cache)
+        return True
+
+    async def create_async(self, min_tokens=MIN_CACHE_TOKENS):
+        """Async version of `create`."""
+        if not self._worth_caching(min_tokens):
+            return False
+        try:
+            cache = await self.client.aio.caches.create(
+                model=self.model_name, config=self._create_config()
+            )
+        except Exception as e:
+            print(f"Warning: Context caching unavailable ({e}). Sending it inline.")
+            return False
+        self._created(cache)
+        return True
+
+    def _record_usage(self, call_type, agent, start, response):
+        if self.usage:
+            self.usage.record(
+                call_type,
+                self.model_name,
+                time.perf_counter() - start,
+                agent=agent,
+                response=response,
+            )
+
+    def generate(self, prompt, call_type="turn", agent=None, **config):
+        """Generate content for `prompt`, which follows the cached preamble.
+
+        Extra keyword arguments are passed to `types.GenerateContentConfig`.
+        """
+        start = time.perf_counter()
+        response = self._generate(prompt, config)
+        self._record_usage(call_type, agent, start, response)
+        return response
+
+    async def generate_async(self, prompt, call_type="turn", agent=None, **config):
+        """Async version of `generate`."""
+        start = time.perf_counter()
+        response = await self._generate_async(prompt, config)
+        self._record_usage(call_type, agent, start, response)
+        return response
+
+    def generate_stream(self, prompt, call_type="turn", agent=None, **config):
+        """Like `generate`, but yields response chunks as they arrive."""
+        start = time.perf_counter()
+        chunk = None
+        for chunk in self._generate_stream(prompt, config):
+            yield chunk
+        # Usage is reported on the final chunk
+        self._record_usage(call_type, agent, start, chunk)
+
+    async def generate_stream_async(
+        self, prompt, call_type="turn", agent=None, **config
+    ):
+        """Async version of `generate_stream`."""
+        start = time.perf_counter()
+        chunk = None
+        async for chunk in self._generate_stream_async(prompt, config):
+            yield chunk
+        self._record_usage(call_type, agent, start, chunk)
+
+    def _generate(self, prompt, config):
+        if self.name:
+            try:
+                response = self.client.models.generate_content(
+                    **self._cached_request(prompt, config)
+                )
+            except Exception as e:
+                self._cache_failed(e)
+            else:
+                self._record_savings(response)
+                return response
+
+        return self.client.models.generate_content(
+            **self._inline_request(prompt, config)
+        )
+
+    async def _generate_async(self, prompt, config):
+        if self.name:
+            try:
+                response = await self.client.aio.models.generate_content(
+                    **self._cached_request(prompt, config)
+                )
+            except Exception as e:
+                self._cache_failed(e)
+            else:
+                self._record_savings(response)
+                return response
+
+        return await self.client.aio.models.generate_content(
+            **self._inline_request(prompt, config)
+        )
+
+    def _generate_stream(self, prompt, config):
+        if self.name:
+            try:
+                stream = self.client.models.generate_content_stream(
+                    **self._cached_request(prompt, config)
+                )
+                # Errors about the cache surface with the first chunk
+                first_chunk = next(stream, None)
+            except Exception as e:
+                self._cache_failed(e)
+            else:
+                last_chunk = first_chunk
+                if first_chunk is not None:
+                    yield first_chunk
+                    for chunk in stream:
+                        last_chunk = chunk
+                        yield chunk
+                    # Usage is reported on the final chunk
+                    self._record_savings(last_chunk)
+                return
+
+        yield from self.client.models.generate_content_stream(
+            **self._inline_request(prompt, config)
+        )
+
+    async def _generate_stream_async(self, prompt, config):
+        if self.name:
+            try:
+                stream = await self.client.aio.models.generate_content_stream(
+                    **self._cached_request(prompt, config)
+                )
+                # Errors about the cache surface with the first chunk
+                first_chunk = await anext(stream, None)
+            except Exception as e:
+                self._cache_failed(e)
+            else:
+                last_chunk = first_chunk
+                if first_chunk is not None:
+                    yield first_chunk
+                    async for chunk in stream:
+                        last_chunk = chunk
+                        yield chunk
+                    # Usage is reported on the final chunk
+                    self._record_savings(last_chunk)
+                return
+
+        stream = await self.client.aio.models.generate_content_stream(
+            **self._inline_request(prompt, config)
+        )
+        async for chunk in stream:
+            yield chunk
+
+    def _record_savings(self, response):
+        usage = getattr(response, "usage_metadata", None)
+        saved = (usage.cached_content_token_count if usage else None) or 0
+        self.cached_calls += 1
+        self.tokens_saved += saved
+        print(f"Context cache: {saved} input tokens served from cache.")
+
+    def delete(self):
+        """Delete the cached context on the server."""
+        if not self.name:
+            return
+        try:
+            self.client.caches.delete(name=self.name)
+        except Exception as e:
+            print(f"Warning: Could not delete cached context {self.name} ({e}).")
+        self.name = None
+
+    async def delete_async(self):
+        """Async version of `delete`."""
+        if not self.name:
+            return
+        try:
+            await self.client.aio.caches.delete(name=self.name)
+        except Exception as e:
+            print(f"Warning: Could not delete cached context {self.name} ({e}).")
+        self.name = None
+
+    def get_stats(self):
+        return {
+            "enabled": self.name is not None,
+            "cached_tokens": self.cached_tokens,
+            "cached_calls": self.cached_calls,
+            "total_tokens_saved": self.tokens_saved,
+        }
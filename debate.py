@@ -1,18 +1,20 @@
-import google.genai as genai
-import os
 import json
 import random
-from dotenv import load_dotenv
-from google.cloud import texttospeech
-
-load_dotenv()
-
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-if not GEMINI_API_KEY:
-    raise ValueError("Please set GEMINI_API_KEY in environment variables.")
-
-tts_client = texttospeech.TextToSpeechClient()
-
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import mp3
+from audio_cache import SUFFIXES, cache_key, get_audio_cache
+from clients import get_genai_client, get_tts_client
+from context_cache import ContextCache
+from debate_events import EventLog
+from language_detection import MIN_CONFIDENCE, debate_texts, detect_language
+from pacing import create_pacing_policy
+from prompt_builder import PromptBuilder
+from shared_stream import SharedStream
+from speaker_selection import create_speaker_selector
+from usage import UsageTracker, process_usage
 
 google_chirp3_voices = {
     "Aoede": "neutral female voice",
@@ -26,32 +28,143 @@ google_chirp3_voices = {
 }
 
 
-def choose_voices(agents, client, model_name):
-    """Choose a voice for each agent using Gemini."""
+def describe_voices(voices):
+    return ", ".join([f"{voice} ({google_chirp3_voices[voice]})" for voice in voices])
 
-    remaining_voices = list(google_chirp3_voices.keys())
-    for agent in agents:
-        prompt = f"""
+
+def voices_request(agents):
+    """Build one prompt and response config asking for every agent's voice."""
+    from google.genai import types
+
+    voices = list(google_chirp3_voices.keys())
+    agent_lines = "\n".join(
+        [f"        - {a.name} ({a.role}): {a.persona}" for a in agents]
+    )
+    prompt = f"""
+        Choose a different voice for each of the following agents:
+{agent_lines}
+
+        The available voices are: {describe_voices(voices)}
+
+        Respond in JSON with one object per agent, with its exact "name" and its "voice".
+        """
+    config = {
+        "response_mime_type": "application/json",
+        "response_schema": types.Schema(
+            type=types.Type.ARRAY,
+            items=types.Schema(
+                type=types.Type.OBJECT,
+                properties={
+                    "name": types.Schema(type=types.Type.STRING),
+                    "voice": types.Schema(type=types.Type.STRING, enum=voices),
+                },
+                required=["name", "voice"],
+            ),
+        ),
+    }
+    return prompt, config
+
+
+def parse_voices_response(text):
+    """Parse the structured voice choices into an agent name -> voice mapping."""
+    return {choice["name"]: choice["voice"] for choice in json.loads(text)}
+
+
+def voice_prompt(agent):
+    """Build the prompt asking Gemini to choose a voice for a single agent."""
+    return f"""
         Choose a voice for the following agent:
         - Name: {agent.name}
         - Role: {agent.role}
         - Persona: {agent.persona}
 
-        The available voices are: {", ".join([f"{voice} ({google_chirp3_voices[voice]})" for voice in remaining_voices])}
+        The available voices are: {describe_voices(google_chirp3_voices.keys())}
 
         Simply respond with the name of the voice.
         """
-        response = client.models.generate_content(model=model_name, contents=prompt)
-        voice = response.text.strip()
+
+
+def resolve_voices(agents, proposals):
+    """Assign the proposed voices, keeping every agent's voice unique.
+
+    Agents whose proposal is missing, unknown or already taken by an earlier
+    agent get one of the voices nobody was given.
+    """
+    remaining_voices = list(google_chirp3_voices.keys())
+    unassigned = []
+    for agent in agents:
+        voice = proposals.get(agent.name)
         if voice in remaining_voices:
             agent.voice = voice
             remaining_voices.remove(voice)
         else:
-            print(
-                f"Warning: Voice {voice} not available. Falling back to random voice."
+            unassigned.append(agent)
+
+    for i, agent in enumerate(unassigned):
+        voice = proposals.get(agent.name)
+        if remaining_voices:
+            agent.voice = remaining_voices.pop(0)
+        else:
+            # More agents than voices: uniqueness can't hold
+            agent.voice = list(google_chirp3_voices.keys())[
+                i % len(google_chirp3_voices)
+            ]
+        print(
+            f"Warning: Voice {voice} not available for {agent.name}. Falling back to {agent.voice}."
+        )
+
+
+def choose_voices(agents, client, model_name, usage=None):
+    """Choose a voice for each agent using Gemini.
+
+    All voices are chosen in one structured request. If that fails, one
+    request per agent is made concurrently instead. Calls are recorded in
+    the `usage` tracker, if any.
+    """
+    from google.genai import types
+
+    prompt, config = voices_request(agents)
+    try:
+        start = time.perf_counter()
+        response = client.models.generate_content(
+            model=model_name,
+            contents=prompt,
+            config=types.GenerateContentConfig(**config),
+        )
+        if usage:
+            usage.record(
+                "voice_choice",
+                model_name,
+                time.perf_counter() - start,
+                response=response,
             )
-            agent.voice = remaining_voices[0]
-            remaining_voices = remaining_voices[1:]
+        proposals = parse_voices_response(response.text)
+    except Exception as e:
+        print(f"Warning: Could not choose all voices at once ({e}). Asking per agent.")
+
+        def choose_voice(agent):
+            try:
+                start = time.perf_counter()
+                response = client.models.generate_content(
+                    model=model_name, contents=voice_prompt(agent)
+                )
+                if usage:
+                    usage.record(
+                        "voice_choice",
+                        model_name,
+                        time.perf_counter() - start,
+                        agent=agent.name,
+                        response=response,
+                    )
+                return agent.name, response.text.strip()
+            except Exception as e:
+                print(f"Warning: Could not choose a voice for {agent.name} ({e}).")
+                return agent.name, None
+
+        with ThreadPoolExecutor(max_workers=len(agents)) as executor:
+            proposals = dict(executor.map(choose_voice, agents))
+
+    resolve_voices(agents, proposals)
 
 
 class Agent:
@@ -75,22 +188,86 @@ class Agent:
 class Debate:
     """Manages the state and flow of the AI debate."""
 
+    # Whether its log is written by a thread rather than by the caller
+    log_in_background = False
+
     def __init__(
         self,
         config=None,
         config_path=None,
         model_name="gemini-2.0-flash-lite",
+        client=None,
+        tts_client=None,
+        setup=None,
     ):
-        """Initialize the debate with its parameters."""
+        """Initialize the debate with its parameters.
+
+        `client` and `tts_client` default to the process-wide Gemini and TTS
+        clients; other clients with the same interface can be passed instead.
+        With `setup`, a record from a debate log (see debate_log.py), the
+        recorded decisions are restored instead of being made again.
+        """
         self.config = config
         self.model_name = model_name
-        self.client = genai.Client(api_key=GEMINI_API_KEY)
+        self.client = client or get_genai_client()
+        # Created on first synthesis, so text-only debates never load it
         self.tts_client = tts_client
+        self.audio_cache = get_audio_cache()
+        self.events = EventLog()
+        # Model and TTS usage, also counted in the process-wide totals
+        self.usage = UsageTracker(parent=process_usage)
+        # Summarizes old turns off the turn's critical path, one job at a time
+        self.summary_executor = ThreadPoolExecutor(max_workers=1)
+        self.summary_job = None
+        # Durable log of the debate, if one is attached
+        self.log = None
+        # Speech being streamed, shared by every request for the same turn
+        self.speech_streams = {}
+        self.speech_lock = threading.Lock()
         self.reset()
-        self.initialize_debate(config_path)
+        if setup:
+            self.restore_setup(setup)
+        else:
+            self.initialize_debate(config_path)
 
     def initialize_debate(self, config_path=None):
         """Loads debate configuration from the JSON file."""
+        self.load_config(config_path)
+
+        # Set voices
+        if self.config.get("enable_voice", False):
+            choose_voices(self.agents, self.client, self.model_name, self.usage)
+
+        # Set debate language
+        self.language = self.detect_language()
+
+        self.setup_context()
+        if self.config.get("enable_context_cache", True):
+            self.context_cache.create()
+
+        # Initialize the next speaker
+        self.update_next_speaker()
+
+    def restore_setup(self, setup):
+        """Restores the setup decisions and state recorded in a debate log.
+
+        No model call is made. The context cache isn't created again: the
+        preamble is sent inline with each turn.
+        """
+        self.load_config()
+        for agent in self.agents:
+            if agent.name in setup["voices"]:
+                agent.voice = setup["voices"][agent.name]
+        self.language = setup["language"]
+        self.setup_context()
+
+        self.transcript = list(setup["transcript"])
+        self.current_turn = setup["current_turn"]
+        if setup["next_speaker"]:
+            self.set_next_speaker(setup["next_speaker"])
+
+    def load_config(self, config_path=None):
+        """Creates the agents and debate parameters from the configuration."""
 
         if not self.config:  # load from config_path
             with open(config_path, "r") as f:
@@ -118,42 +295,96 @@ class Debate:
             )
             agents = [moderator] + agents
 
-        # Set voices
-        if self.config.get("enable_voice", False):
-            choose_voices(agents, self.client, self.model_name)
-
         # Initialize debate parameters
         self.title = self.config["title"]
         self.description = self.config["description"]
         self.max_turns = self.config.get("max_turns", 10)
         self.agents = agents
 
-        # Set debate language
-        self.language = self.detect_language()
+        # Return the message and the next speaker from a single model call
+        self.single_call_turns = self.config.get("single_call_turns", False)
 
-        # Initialize the next speaker
-        self.update_next_speaker()
+        # Strategy used to choose who speaks next
+        self.speaker_selector = create_speaker_selector(
+            self.config.get("speaker_selection", "llm"),
+            moderator_every=self.config.get("moderator_every", 5),
+        )
+
+        # When generated turns are released to viewers
+        self.pacing_policy = create_pacing_policy(self.config)
+
+        # Turns kept verbatim in prompts, older ones being summarized
+        self.context_recent_turns = self.config.get("context_recent_turns", 12)
+        self.context_token_budget = self.config.get("context_token_budget", 8000)
+
+    def setup_context(self):
+        """Prepares the prompt builder and context cache (without creating it)."""
+        # Render the static part of the prompt once
+        self.prompt_builder = PromptBuilder(
+            self.title,
+            self.description,
+            self.agents,
+            self.language,
+            recent_turns=self.context_recent_turns,
+            token_budget=self.context_token_budget,
+        )
+
+        # Register the static preamble once and reference it on every turn
+        self.context_cache = ContextCache(
+            self.client,
+            self.model_name,
+            self.prompt_builder.preamble,
+            usage=self.usage,
+        )
 
     def detect_language(self):
         """Auto-detect the debate language based on title, description, and personas."""
-        # Combine all texts
-        texts = f"{self.title}\n{self.description}"
-        for agent in self.agents:
-            texts += f"\n{agent.persona}"
+        language = self.detect_language_locally()
+        if language:
+            return language
+
+        start = time.perf_counter()
+        response = self.client.models.generate_content(
+            model=self.model_name, contents=self.language_prompt()
+        )
+        self.usage.record(
+            "language_detection",
+            self.model_name,
+            time.perf_counter() - start,
+            response=response,
+        )
+        return self.parse_language(response.text)
+
+    def language_texts(self):
+        """Combines the texts the debate language is detected from."""
+        # The default moderator's persona is always English, so only use the config
+        return debate_texts(self.config)
 
+    def detect_language_locally(self):
+        """Detects the language without a model call, or returns None if unsure."""
+        language, confidence = detect_language(self.language_texts())
+        if confidence < MIN_CONFIDENCE:
+            print(
+                f"Local language detection is unsure ({language}, confidence {confidence:.2f}). Asking Gemini."
+            )
+            return None
+        return language
+
+    def language_prompt(self):
+        """Builds the prompt asking Gemini for the debate language."""
         # Ask Gemini to detect the language
         prompt = f"""
         Based on the following texts, determine what language it's in.
         Simply respond with the name of the language in English. The only available options are the following: English, French or Other.
         
         Texts to analyze:
-        {texts}
+        {self.language_texts()}
         """
+        return prompt
 
-        response = self.client.models.generate_content(
-            model=self.model_name, contents=prompt
-        )
-        detected_language = response.text.strip()
+    def parse_language(self, text):
+        """Validates the language answered by Gemini."""
+        detected_language = text.strip()
         if detected_language not in ["English", "French", "Other"]:
             print(
                 f"Warning: Auto-detected language {detected_language} is not in the available options. Falling back to English."
@@ -168,92 +399,76 @@ class Debate:
         self.debate_running = False
         self.debate_finished = False
         self.next_speaker = None
+        self.proposed_next_speaker = None
+        if getattr(self, "prompt_builder", None):
+            self.prompt_builder.reset()
+        self.events.clear()
         print("Debate reset.")
 
     def start(self):
         """Starts the debate."""
         self.debate_running = True
         self.debate_finished = False
+        self.status_changed()
         print("Debate started.")
 
     def stop(self):
         """Stops the debate."""
         self.debate_running = False
+        self.status_changed()
         print("Debate stopped.")
 
-    def generate_prompt(self, agent):
-        """Generate a prompt for the agent to respond in the debate."""
-        debate_context = f"""
-Debate topic: {self.title}
-Debate description: {self.description}
-Participants: {", ".join([f"{a.name} ({a.role})" for a in self.agents])}
-Debate language: {self.language}
-
-You are {agent.name}, playing the role of {agent.role}.
-Your persona: {agent.persona}
-
-Current debate transcript:
-"""
-        # Special instruction for first turn
-        if self.current_turn == 0:
-            debate_context += "(The debate is just starting. As the moderator, introduce the topic and participants.)"
-
-        # Add the transcript so far
-        else:
-            for entry in self.transcript:
-                debate_context += f"{entry['speaker']}: {entry['message']}"
-
-        debate_context += f"""
-Based on the debate so far, provide your next contribution as {agent.name}.
-Your response should reflect your role and persona.
-Be concise and to the point. You can respond with just a few words, a sentence or sometimes a few sentences.
-"""
-        if agent.is_moderator:
-            debate_context += "You will be the moderator of this debate. After introducing the debate and its participants, you will guide the discussion. If the debate has come to an end, clearly state 'The debate is now closed' at the end of your message."
+    def status_changed(self):
+        """Records the current running status in the event log."""
+        self.events.append(
+            "status_changed",
+            {
+                "current_turn": self.current_turn,
+                "is_running": self.debate_running,
+                "is_finished": self.debate_finished,
+            },
+        )
 
-        debate_context += f"You MUST respond in {self.language} language."
-        return debate_context
+    def generate_prompt(self, agent, include_preamble=True):
+        """Generate a prompt for the agent to respond in the debate."""
+        self.prompt_builder.sync(self.transcript)
+        return self.prompt_builder.build(
+            agent,
+            first_turn=self.current_turn == 0,
+            include_preamble=include_preamble,
+        )
 
     def update_next_speaker(self):
         """Update the next speaker based on the current debate context."""
+        self.choose_next_speaker()
+        self.events.append("next_speaker", {"name": self.next_speaker.name})
+
+    def choose_next_speaker(self):
+        """Choose the next speaker, without recording the decision."""
         # Moderator is always the first speaker
         if self.current_turn == 0:
-            for agent in self.agents:
-                if agent.is_moderator:
-                    self.next_speaker = agent
-                    return
-            # If no moderator found
-            print("Warning: No moderator found. Falling back to first agent.")
-            self.next_speaker = self.agents[0]
+            self.next_speaker = self.first_speaker()
             return
 
-        # Use Gemini to determine the next speaker
-        prompt = f"""
-Based on the following debate transcript, determine which participant should speak next.
-Choose the participant who would most naturally continue the conversation based on:
-1. Who hasn't spoken recently
-2. Who has been directly addressed or challenged
-3. Who might have the most relevant perspective to add now
-
-Debate Title: {self.title}
-Debate Description: {self.description}
-
-Participants and their Roles:
-{json.dumps([{"name": a.name, "role": a.role} for a in self.agents], indent=2)}
-
-Transcript:
-{json.dumps(self.transcript, indent=2)}
-
-Which participant should speak next to continue the debate?
+        # The speaker was already chosen along with the last message
+        if self.proposed_next_speaker is not None:
+            self.set_next_speaker(self.proposed_next_speaker)
+            self.proposed_next_speaker = None
+            return
 
-Answer with ONLY the EXACT full name of the participant from this list: {", ".join([agent.name for agent in self.agents])}
-Do not include any other text, reasoning, or formatting. Just the name.
-"""
-        response = self.client.models.generate_content(
-            model=self.model_name, contents=prompt
-        )
-        next_speaker = response.text.strip()
+        self.set_next_speaker(self.speaker_selector.choose(self))
 
+    def first_speaker(self):
+        """Returns the agent opening the debate: the moderator."""
+        for agent in self.agents:
+            if agent.is_moderator:
+                return agent
+        # If no moderator found
+        print("Warning: No moderator found. Falling back to first agent.")
+        return self.agents[0]
+
+    def set_next_speaker(self, next_speaker):
+        """Set the next speaker from a model-chosen name, with a random fallback."""
         # Find the agent by name
         for agent in self.agents:
             if agent.name.lower() == next_speaker.lower():
@@ -268,22 +483,21 @@ Do not include any other text, reasoning, or formatting. Just the name.
         available_agents = [a for a in self.agents if a.name != last_speaker]
         self.next_speaker = random.choice(available_agents)
 
-    def run_next_turn(self):
-        """Determines the next speaker, generates their message, and updates the state."""
+    def begin_turn(self):
+        """Returns the prompt for the next turn, or None if the debate is over."""
 
         if self.current_turn >= self.max_turns:
             self.debate_finished = False
             self.debate_running = False
+            self.status_changed()
             print(f"Reached maximum turns ({self.max_turns}).")
             return None
         print(f"Turn {self.current_turn + 1}: {self.next_speaker.name}")
 
-        prompt = self.generate_prompt(self.next_speaker)
+        return self.generate_prompt(self.next_speaker, include_preamble=False)
 
-        response = self.client.models.generate_content(
-            model=self.model_name, contents=prompt
-        )
-        message = response.text.strip()
+    def finish_turn(self, message):
+        """Records the next speaker's message in the transcript."""
 
         # Check for moderator's conclusion phrase
         if "the debate is now concluded" in message.lower():
@@ -294,10 +508,214 @@ Do not include any other text, reasoning, or formatting. Just the name.
         entry = {"speaker": self.next_speaker.name, "message": message}
         self.transcript.append(entry)
         self.current_turn += 1
+        self.events.append("turn_appended", {"turn": self.current_turn, "entry": entry})
+        if self.debate_finished:
+            self.status_changed()
+        else:
+            self.summarize_in_background()
         return entry
 
+    def summarize_in_background(self):
+        """Starts folding turns older than the recent ones into the summary."""
+        if self.summary_job and not self.summary_job.done():
+            return  # The next turn will fold what this one would have
+        self.prompt_builder.sync(self.transcript)
+        job = self.prompt_builder.pending_summary()
+        if job:
+            self.summary_job = self.summary_executor.submit(self.summarize, job)
+
+    def summarize(self, job):
+        """Folds the turns of a prompt builder summary job into the summary."""
+        try:
+            response = self.context_cache.generate(
+                self.summary_prompt(job), call_type="summary"
+            )
+        except Exception as e:
+            print(f"Warning: Could not summarize old turns ({e}). Keeping them.")
+            return
+        self.fold_summary(job, response.text.strip())
+
+    def fold_summary(self, job, summary):
+        """Folds the result of a summary job into the prompts, and logs it."""
+        if self.prompt_builder.fold(job, summary) and self.log:
+            self.log.write("summary", {"summary": summary, "summarized": job["end"]})
+
+    def summary_prompt(self, job):
+        """Builds the prompt updating the rolling summary of the debate."""
+        return f"""
+Update the summary of the debate so far with the turns below. Participants will only see this summary and the latest turns.
+Keep who holds which position, the main arguments, points of disagreement and open questions. Use at most 200 words, in {self.language}.
+Respond with the summary only.
+
+Current summary:
+{job["summary"] or "(none yet)"}
+
+Turns to add:
+{job["text"]}
+"""
+
+    def run_next_turn(self):
+        """Determines the next speaker, generates their message, and updates the state."""
+        prompt = self.begin_turn()
+        if prompt is None:
+            return None
+
+        if self.single_call_turns:
+            message = self.generate_message_and_next_speaker(prompt)
+        else:
+            response = self.context_cache.generate(prompt, agent=self.next_speaker.name)
+            message = response.text.strip()
+
+        return self.finish_turn(message)
+
+    def stream_message(self, prompt):
+        """Yields the next speaker's message for `prompt` as it is generated.
+
+        Nothing is recorded: pass the joined, stripped text to `finish_turn`.
+        """
+        # Structured responses can't be shown until they are complete
+        if self.single_call_turns:
+            yield self.generate_message_and_next_speaker(prompt)
+            return
+        for chunk in self.context_cache.generate_stream(
+            prompt, agent=self.next_speaker.name
+        ):
+            if chunk.text:
+                yield chunk.text
+
+    def generate_message_and_next_speaker(self, prompt):
+        """Generate the next message and propose who speaks after it in one call."""
+        prompt, config = self.single_call_request(prompt)
+        response = self.context_cache.generate(
+            prompt, agent=self.next_speaker.name, **config
+        )
+        return self.parse_single_call_response(response.text)
+
+    def single_call_request(self, prompt):
+        """Extends a turn prompt to also ask for the next speaker, as JSON."""
+        from google.genai import types
+
+        names = [agent.name for agent in self.agents]
+        prompt += f"""
+Also choose which participant should speak after you, based on who hasn't spoken recently, who has been directly addressed or challenged, and who has the most relevant perspective to add now.
+Respond in JSON with your contribution in "message" and the EXACT full name of that participant in "next_speaker", chosen from this list: {", ".join(names)}
+"""
+        config = {
+            "response_mime_type": "application/json",
+            "response_schema": types.Schema(
+                type=types.Type.OBJECT,
+                properties={
+                    "message": types.Schema(type=types.Type.STRING),
+                    "next_speaker": types.Schema(type=types.Type.STRING, enum=names),
+                },
+                required=["message", "next_speaker"],
+            ),
+        }
+        return prompt, config
+
+    def parse_single_call_response(self, text):
+        """Returns the message and stores the proposed next speaker."""
+        try:
+            result = json.loads(text)
+            message = result["message"].strip()
+            self.proposed_next_speaker = str(result.get("next_speaker", ""))
+        except (ValueError, KeyError, TypeError, AttributeError):
+            print(
+                "Warning: Could not parse structured turn response. Using it as the message."
+            )
+            message = text.strip()
+            self.proposed_next_speaker = ""
+        return message
+
     def synthesize_speech(self, agent_name, language, text):
         """Synthesizes speech from text using Google Cloud TTS."""
+        request = self.speech_request(agent_name, language, text)
+        key, suffix = self.speech_cache_key(request)
+        audio = self.audio_cache.get(key, suffix)
+        if audio is not None:
+            return audio
+
+        if self.tts_client is None:
+            self.tts_client = get_tts_client()
+        start = time.perf_counter()
+        response = self.tts_client.synthesize_speech(**request)
+        self.record_speech_usage(request, agent_name, start)
+        self.audio_cache.put(key, response.audio_content, suffix)
+        return response.audio_content
+
+    def synthesize_turn(self, entry):
+        """Synthesizes a transcript entry into a record of its audio and duration."""
+        audio = self.synthesize_speech(
+            entry["speaker"], self.language, entry["message"]
+        )
+        return {"audio": audio, "duration": mp3.duration(audio)}
+
+    def stream_turn_speech(self, turn):
+        """Yields the speech of transcript turn `turn` (from 1), like `stream_speech`.
+
+        Concurrent requests for the same turn share a single synthesis, each
+        of them getting all of its chunks.
+        """
+        entry = self.transcript[turn - 1]
+        key = (turn, entry["speaker"], entry["message"])
+        with self.speech_lock:
+            stream = self.speech_streams.get(key)
+            if stream is None:
+                chunks = self.stream_speech(
+                    entry["speaker"], self.language, entry["message"]
+                )
+                stream = SharedStream(chunks, on_done=lambda: self._speech_done(key))
+                self.speech_streams[key] = stream
+        return stream.reader()
+
+    def _speech_done(self, key):
+        # Later requests are served from the audio cache
+        with self.speech_lock:
+            self.speech_streams.pop(key, None)
+
+    def stream_speech(self, agent_name, language, text):
+        """Yields Ogg Opus speech of an agent's message as it is synthesized.
+
+        Each chunk is yielded as soon as Google Cloud TTS renders it, so
+        playback can start before the whole message is synthesized. Complete
+        audio is cached, and yielded at once on the next request.
+        """
+        request = self.speech_request(agent_name, language, text, streaming=True)
+        key, suffix = self.speech_cache_key(request)
+        audio = self.audio_cache.get(key, suffix)
+        if audio is not None:
+            yield audio
+            return
+
+        from google.cloud import texttospeech
+
+        if self.tts_client is None:
+            self.tts_client = get_tts_client()
+        start = time.perf_counter()
+        config = texttospeech.StreamingSynthesizeConfig(
+            voice=request["voice"], streaming_audio_config=request["audio_config"]
+        )
+        responses = self.tts_client.streaming_synthesize(
+            [
+                texttospeech.StreamingSynthesizeRequest(streaming_config=config),
+                texttospeech.StreamingSynthesizeRequest(input=request["input"]),
+            ]
+        )
+        chunks = []
+        for response in responses:
+            if response.audio_content:
+                chunks.append(response.audio_content)
+                yield response.audio_content
+        self.record_speech_usage(request, agent_name, start)
+        self.audio_cache.put(key, b"".join(chunks), suffix)
+
+    def speech_request(self, agent_name, language, text, streaming=False):
+        """Builds the Google Cloud TTS request for an agent's message.
+
+        With `streaming`, the request is for `stream_speech`: streaming
+        synthesis doesn't support MP3, so it asks for Ogg Opus.
+        """
+        from google.cloud import texttospeech
 
         # Find the agent by name
         for agent in self.agents:
@@ -314,17 +732,53 @@ Do not include any other text, reasoning, or formatting. Just the name.
             name=f"{language_code}-Chirp3-HD-{voice_name}",
         )
 
-        audio_config = texttospeech.AudioConfig(
-            audio_encoding=texttospeech.AudioEncoding.MP3,
-            speaking_rate=1.1,
+        if streaming:
+            audio_config = texttospeech.StreamingAudioConfig(
+                audio_encoding=texttospeech.AudioEncoding.OGG_OPUS,
+                speaking_rate=1.1,
+            )
+            synthesis_input = texttospeech.StreamingSynthesisInput(text=text)
+        else:
+            audio_config = texttospeech.AudioConfig(
+                audio_encoding=texttospeech.AudioEncoding.MP3,
+                speaking_rate=1.1,
+            )
+            synthesis_input = texttospeech.SynthesisInput(text=text)
+
+        return {"input": synthesis_input, "voice": voice, "audio_config": audio_config}
+
+    def record_speech_usage(self, request, agent_name, start):
+        """Records a TTS call, billed by input characters, in the usage tracker."""
+        self.usage.record(
+            "tts",
+            request["voice"].name,
+            time.perf_counter() - start,
+            agent=agent_name,
+            characters=len(request["input"].text),
         )
-        synthesis_input = texttospeech.SynthesisInput(text=text)
 
-        response = self.tts_client.synthesize_speech(
-            input=synthesis_input, voice=voice, audio_config=audio_config
+    def speech_cache_key(self, request):
+        """Returns the audio cache key and file suffix of a `speech_request`.
+
+        Both depend on the encoding, so MP3 and Ogg Opus renders of the same
+        text are cached apart.
+        """
+        encoding = request["audio_config"].audio_encoding
+        key = cache_key(
+            voice=request["voice"].name,
+            language=request["voice"].language_code,
+            rate=request["audio_config"].speaking_rate,
+            encoding=int(encoding),
+            text=request["input"].text,
         )
+        return key, SUFFIXES[encoding.name]
 
-        return response.audio_content
+    def close(self):
+        """Releases server-side resources held by the debate."""
+        self.summary_executor.shutdown(wait=False, cancel_futures=True)
+        self.context_cache.delete()
+        if self.log:
+            self.log.close()
 
     def get_state(self):
         """Returns the current state of the debate for the UI."""
@@ -339,4 +793,10 @@ Do not include any other text, reasoning, or formatting. Just the name.
             "is_finished": self.debate_finished,
             "next_speaker": self.next_speaker.name if self.next_speaker else None,
             "language": self.language,
+            "enable_voice": self.config.get("enable_voice", False),
+            "context_cache": self.context_cache.get_stats(),
+            "audio_cache": self.audio_cache.get_stats(),
+            "context_window": self.prompt_builder.get_stats(),
+            "usage": self.usage.get_stats(),
+            "last_event_id": self.events.last_seq,
         }
@@ -0,0 +1,329 @@
+import asyncio
+import queue
+import threading
+import time
+
+from pacing import PacingScheduler
+
+# Queued in place of everything a slow subscriber missed
+RESYNC = ("resync", None)
+
+# Seconds a debate keeps producing without subscribers, e.g. across a reload
+VIEWER_GRACE = 15.0
+
+
+class Subscriber:
+    """One viewer of a debate, with a bounded queue of pending items."""
+
+    def __init__(self, maxsize):
+        self.queue = queue.Queue(maxsize)
+        self.resyncs = 0
+
+
+class DebateBroadcaster:
+    """Advances a debate on a single producer thread and fans it out.
+
+    Every viewer subscribes with its own bounded queue, so model spend per
+    debate doesn't depend on how many people are watching. A subscriber that
+    falls behind has its queue coalesced into a single resync marker, after
+    which it catches up from the debate's event log.
+
+    The next turn is generated as soon as the previous one is released, and
+    held until its `pacing` scheduler says viewers are done with the
+    previous one (see pacing.py). Its text is only streamed live once they
+    are waiting for it.
+
+    Once nobody has been subscribed for `viewer_grace` seconds, the producer
+    pauses before its next model call, until a subscriber attaches again.
+    """
+
+    def __init__(self, session, queue_size=256, viewer_grace=VIEWER_GRACE):
+        self.session = session
+        self.queue_size = queue_size
+        self.viewer_grace = viewer_grace
+        self.lock = threading.Lock()
+        self.subscribers = set()
+        # When the last subscriber left, or the broadcaster was created
+        self.unwatched_since = time.monotonic()
+        self.producer = None
+        self.closed = threading.Event()
+        # A generated turn waiting for its release: (turn, message)
+        self.held = None
+        self.wakeup = threading.Event()
+        self.pacing = PacingScheduler(session.debate.pacing_policy)
+        self.pacing.add_listener(self.wake)
+        session.debate.events.add_listener(self.publish_event)
+
+    def subscribe(self):
+        subscriber = Subscriber(self.queue_size)
+        with self.lock:
+            self.subscribers.add(subscriber)
+        # Resume a producer paused for lack of viewers
+        self.wake()
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self.lock:
+            self.subscribers.discard(subscriber)
+            if not self.subscribers:
+                self.unwatched_since = time.monotonic()
+
+    def _unwatched(self):
+        """Whether nobody has been subscribed for longer than the grace period."""
+        return (
+            not self.subscribers
+            and time.monotonic() - self.unwatched_since > self.viewer_grace
+        )
+
+    def publish(self, item):
+        """Queue `item` for every subscriber, coalescing full queues."""
+        with self.lock:
+            subscribers = list(self.subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.queue.put_nowait(item)
+            except queue.Full:
+                while True:
+                    try:
+                        subscriber.queue.get_nowait()
+                    except queue.Empty:
+                        break
+                subscriber.queue.put_nowait(RESYNC)
+                subscriber.resyncs += 1
+
+    def publish_event(self, event):
+        """Notify subscribers of an event appended to the debate's log."""
+        self.publish(("event", event))
+        if event["type"] == "status_changed":
+            # A stopped debate shouldn't keep its producer waiting
+            self.wake()
+
+    def wake(self):
+        """Interrupt the producer's wait for the next release."""
+        self.wakeup.set()
+
+    def start(self):
+        """Start the producer thread, unless it is already running."""
+        with self.lock:
+            if self.producer or self.closed.is_set():
+                return
+            self.producer = threading.Thread(target=self._produce, daemon=True)
+            self.producer.start()
+
+    def _should_stop(self):
+        debate = self.session.debate
+        return (
+            self.closed.is_set() or not debate.debate_running or debate.debate_finished
+        )
+
+    def _holds_next_turn(self):
+        """Whether the held turn, if any, is still the debate's next one."""
+        return self.held and self.held[0] == self.session.debate.current_turn + 1
+
+    def _generate(self):
+        """Generate the next turn and hold it, streaming its text once it is due."""
+        debate = self.session.debate
+        prompt = debate.begin_turn()
+        if prompt is None:
+            return  # The debate is over
+        turn = debate.current_turn + 1
+        speaker = debate.next_speaker.name
+        chunks = []
+        pending = []
+        for delta in debate.stream_message(prompt):
+            chunks.append(delta)
+            pending.append(delta)
+            if not self.pacing.remaining():
+                self.publish(
+                    (
+                        "partial",
+                        {"turn": turn, "speaker": speaker, "delta": "".join(pending)},
+                    )
+                )
+                pending = []
+        self.held = (turn, "".join(chunks).strip())
+
+    def _release(self):
+        """Add the held turn to the debate, then choose who speaks next."""
+        debate = self.session.debate
+        turn, message = self.held
+        self.held = None
+        entry = debate.finish_turn(message)
+        self.pacing.released(turn, entry)
+        if debate.debate_running and not debate.debate_finished:
+            debate.update_next_speaker()
+
+    def _wait_for_release(self):
+        """Wait until the held turn is due, or the debate stops."""
+        while not self._should_stop():
+            remaining = self.pacing.remaining()
+            if not remaining:
+                return
+            self.wakeup.wait(remaining)
+            self.wakeup.clear()
+
+    def _wait_for_viewers(self):
+        """Wait while the debate is unwatched, so it doesn't spend model calls."""
+        while not self._should_stop():
+            with self.lock:
+                if not self._unwatched():
+                    return
+            self.wakeup.wait()
+            self.wakeup.clear()
+
+    def _produce(self):
+        session = self.session
+        while True:
+            self._wait_for_viewers()
+            with session.lock:
+                with self.lock:
+                    if self._should_stop():
+                        self.producer = None
+                        return
+                try:
+                    if not self._holds_next_turn():
+                        self._generate()
+                except Exception as e:
+                    self._failed(e)
+                    return
+
+            # Viewers can stop the debate while the turn is held
+            self._wait_for_release()
+            self._wait_for_viewers()
+
+            with session.lock:
+                if self._should_stop() or not self._holds_next_turn():
+                    continue
+                try:
+                    self._release()
+                except Exception as e:
+                    self._failed(e)
+                    return
+
+    def _failed(self, error):
+        # Pause the debate; viewers can resume it
+        print(f"Error: Turn generation failed ({error}). Stopping debate.")
+        with self.lock:
+            self.producer = None
+        self.session.debate.stop()
+
+    def close(self):
+        """Stop producing after the current turn."""
+        self.closed.set()
+        self.wake()
+
+
+class AsyncDebateBroadcaster(DebateBroadcaster):
+    """Asyncio version of `DebateBroadcaster`, for an `AsyncDebate`.
+
+    The producer is a task on the event loop and subscribers use asyncio
+    queues, so idle viewers hold no thread.
+    """
+
+    def __init__(self, session, queue_size=256, viewer_grace=VIEWER_GRACE):
+        super().__init__(session, queue_size=queue_size, viewer_grace=viewer_grace)
+        self.closed = asyncio.Event()
+        self.wakeup = asyncio.Event()
+
+    def subscribe(self):
+        subscriber = Subscriber(self.queue_size)
+        subscriber.queue = asyncio.Queue(self.queue_size)
+        self.subscribers.add(subscriber)
+        self.wake()
+        return subscriber
+
+    def publish(self, item):
+        """Queue `item` for every subscriber, coalescing full queues."""
+        for subscriber in list(self.subscribers):
+            try:
+                subscriber.queue.put_nowait(item)
+            except asyncio.QueueFull:
+                while not subscriber.queue.empty():
+                    subscriber.queue.get_nowait()
+                subscriber.queue.put_nowait(RESYNC)
+                subscriber.resyncs += 1
+
+    def start(self):
+        """Start the producer task, unless it is already running."""
+        if self.producer or self.closed.is_set():
+            return
+        self.producer = asyncio.create_task(self._produce())
+
+    async def _generate(self):
+        debate = self.session.debate
+        prompt = debate.begin_turn()
+        if prompt is None:
+            return
+        turn = debate.current_turn + 1
+        speaker = debate.next_speaker.name
+        chunks = []
+        pending = []
+        async for delta in debate.stream_message(prompt):
+            chunks.append(delta)
+            pending.append(delta)
+            if not self.pacing.remaining():
+                self.publish(
+                    (
+                        "partial",
+                        {"turn": turn, "speaker": speaker, "delta": "".join(pending)},
+                    )
+                )
+                pending = []
+        self.held = (turn, "".join(chunks).strip())
+
+    async def _release(self):
+        debate = self.session.debate
+        turn, message = self.held
+        self.held = None
+        entry = debate.finish_turn(message)
+        self.pacing.released(turn, entry)
+        if debate.debate_running and not debate.debate_finished:
+            await debate.update_next_speaker()
+
+    async def _wait_for_release(self):
+        while not self._should_stop():
+            remaining = self.pacing.remaining()
+            if not remaining:
+                return
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+            self.wakeup.clear()
+
+    async def _wait_for_viewers(self):
+        while not self._should_stop() and self._unwatched():
+            await self.wakeup.wait()
+            self.wakeup.clear()
+
+    async def _produce(self):
+        session = self.session
+        while True:
+            await self._wait_for_viewers()
+            async with session.lock:
+                if self._should_stop():
+                    self.producer = None
+                    return
+                try:
+                    if not self._holds_next_turn():
+                        await self._generate()
+                except Exception as e:
+                    self._failed(e)
+                    return
+
+            await self._wait_for_release()
+            await self._wait_for_viewers()
+
+            async with session.lock:
+                if self._should_stop() or not self._holds_next_turn():
+                    continue
+                try:
+                    await self._release()
+                except Exception as e:
+                    self._failed(e)
+                    return
+
+    def _failed(self, error):
+        print(f"Error: Turn generation failed ({error}). Stopping debate.")
+        self.producer = None
+        self.session.debate.stop()
@@ -0,0 +1,83 @@
+import json
+import threading
+
+# Bumped whenever the shape of events changes
+PROTOCOL_VERSION = 1
+
+
+class EventLog:
+    """Sequence-numbered log of the changes made to a debate.
+
+    Clients receive a snapshot once, then only the small events appended
+    after it. A client that reconnects with the id of the last event it saw
+    gets just the events it missed.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.events = []
+        self.last_seq = 0
+        self.listeners = []
+
+    def add_listener(self, callback):
+        """Call `callback(event)` after each appended event."""
+        self.listeners.append(callback)
+
+    def append(self, event_type, data):
+        """Append an event and return it."""
+        with self.lock:
+            self.last_seq += 1
+            event = {"id": self.last_seq, "type": event_type, "data": data}
+            self.events.append(event)
+        for callback in self.listeners:
+            callback(event)
+        return event
+
+    def since(self, seq):
+        """Return the events after `seq`, or None if they are no longer known."""
+        with self.lock:
+            first_seq = self.events[0]["id"] if self.events else self.last_seq + 1
+            if not first_seq - 1 <= seq <= self.last_seq:
+                return None
+            return self.events[seq - first_seq + 1 :]
+
+    def clear(self):
+        """Drop all events. Sequence numbers keep increasing."""
+        with self.lock:
+            self.events = []
+
+
+def parse_event_id(value):
+    """Parse a Last-Event-ID value, returning None if it is missing or invalid."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def format_sse(event):
+    """Format a logged event as a Server-Sent Event."""
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event['data'])}\n\n"
+
+
+def format_snapshot(state):
+    """Format a full debate state as a snapshot Server-Sent Event."""
+    data = {"version": PROTOCOL_VERSION, "state": state}
+    return (
+        f"id: {state['last_event_id']}\nevent: snapshot\ndata: {json.dumps(data)}\n\n"
+    )
+
+
+def catch_up(session, sent_seq):
+    """Yield (event id, SSE message) pairs a client needs after `sent_seq`.
+
+    These are the events it missed if they are still logged, or else a
+    snapshot of the whole debate.
+    """
+    missed = session.debate.events.since(sent_seq) if sent_seq is not None else None
+    if missed is None:
+        state = session.state()
+        yield state["last_event_id"], format_snapshot(state)
+    else:
+        for event in missed:
+            yield event["id"], format_sse(event)
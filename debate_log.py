@@ -0,0 +1,186 @@
+"""Durable, append-only log of a debate, to resume it after a restart.
+
+Each line of a debate's log is one JSON record, flushed and fsync'd before
+the debate moves on (or, for debates on an event loop, by a writer thread
+in the order they were recorded):
+
+* `setup`: the config, model, language, voices and any state so far;
+* `turn_appended`, `next_speaker` and `status_changed`: the debate's
+  events, with their event ids;
+* `summary`: the rolling summary of old turns, once it is folded.
+
+`load_debate` replays a log into a new debate without any model call, so
+resuming costs reading the file, not regenerating the turns.
+"""
+
+import json
+import os
+import queue
+import re
+import threading
+
+from speaker_selection import LocalSpeakerSelector
+
+# Debate events worth persisting; partial messages aren't logged
+LOGGED_EVENTS = ("turn_appended", "next_speaker", "status_changed")
+
+# Debate IDs are generated by the registry; anything else is never a file name
+DEBATE_ID = re.compile(r"[0-9a-f]{32}")
+
+
+def log_path(directory, debate_id):
+    """Return the path of a debate's log, or None if `debate_id` isn't valid."""
+    if not directory or not debate_id or not DEBATE_ID.fullmatch(debate_id):
+        return None
+    return os.path.join(directory, f"{debate_id}.jsonl")
+
+
+class DebateLog:
+    """Appends records to a debate's log file, durably.
+
+    Each record is on disk when `write` returns. With `background`, records
+    are queued to a writer thread instead, so that callers on an event loop
+    never wait for the disk; `close` waits until they are all written.
+    """
+
+    def __init__(self, path, background=False):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.lock = threading.Lock()
+        self.file = open(path, "a", encoding="utf-8")
+        self.queue = None
+        if background:
+            self.queue = queue.Queue()
+            self.writer = threading.Thread(target=self._write_queued, daemon=True)
+            self.writer.start()
+
+    def write(self, record_type, data, event_id=None):
+        """Append a record and wait until it is on disk, unless in the background."""
+        line = json.dumps(
+            {"type": record_type, "id": event_id, "data": data}, ensure_ascii=False
+        )
+        if self.queue:
+            self.queue.put(line)
+        else:
+            self._append(line)
+
+    def _append(self, line):
+        with self.lock:
+            if self.file.closed:
+                return
+            self.file.write(line + "\n")
+            self.file.flush()
+            os.fsync(self.file.fileno())
+
+    def _write_queued(self):
+        while True:
+            line = self.queue.get()
+            if line is None:
+                return
+            self._append(line)
+
+    def record_event(self, event):
+        """Event log listener persisting the events in LOGGED_EVENTS."""
+        if event["type"] in LOGGED_EVENTS:
+            self.write(event["type"], event["data"], event["id"])
+
+    def close(self):
+        """Close the file, once every queued record is written."""
+        if self.queue:
+            self.queue.put(None)
+            self.writer.join()
+        with self.lock:
+            self.file.close()
+
+
+def setup_record(debate):
+    """Return the decisions made when setting up `debate`, and its state so far."""
+    return {
+        "config": debate.config,
+        "model_name": debate.model_name,
+        "language": debate.language,
+        "voices": {
+            agent.name: agent.voice
+            for agent in debate.agents
+            if getattr(agent, "voice", None)
+        },
+        "transcript": debate.transcript,
+        "current_turn": debate.current_turn,
+        "next_speaker": debate.next_speaker.name if debate.next_speaker else None,
+        "summary": debate.prompt_builder.summary,
+        "summarized": debate.prompt_builder.summarized,
+    }
+
+
+def attach_log(debate, path):
+    """Log `debate` to `path` from now on, starting with its setup."""
+    log = DebateLog(path, background=debate.log_in_background)
+    log.write("setup", setup_record(debate), debate.events.last_seq)
+    debate.events.add_listener(log.record_event)
+    debate.log = log
+    return log
+
+
+def read_records(path):
+    """Return the records of a log, ignoring a last line cut short by a crash."""
+    records = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                print(f"Warning: Ignoring a truncated record at the end of {path}.")
+                break
+    return records
+
+
+def load_debate(path, debate_class=None, resume_logging=True, **kwargs):
+    """Rebuild a debate from its log, in one pass and without model calls.
+
+    A debate that was running when its log ended is restored paused. Extra
+    keyword arguments are passed to the debate's constructor (e.g. clients).
+    With `resume_logging`, new records are appended to the same log.
+    """
+    if debate_class is None:
+        from debate import Debate as debate_class
+
+    records = read_records(path)
+    if not records or records[0]["type"] != "setup":
+        raise ValueError(f"{path} is not a debate log.")
+    setup = records[0]["data"]
+    debate = debate_class(
+        config=setup["config"], model_name=setup["model_name"], setup=setup, **kwargs
+    )
+    summary = (setup["summary"], setup["summarized"])
+    last_seq = records[0]["id"] or 0
+
+    for record in records[1:]:
+        data = record["data"]
+        if record["type"] == "turn_appended":
+            debate.transcript.append(data["entry"])
+            debate.current_turn = data["turn"]
+            debate.next_speaker = None
+        elif record["type"] == "next_speaker":
+            debate.set_next_speaker(data["name"])
+        elif record["type"] == "status_changed":
+            debate.current_turn = data["current_turn"]
+            debate.debate_finished = data["is_finished"]
+        elif record["type"] == "summary":
+            summary = (data["summary"], data["summarized"])
+        last_seq = record["id"] or last_seq
+
+    debate.prompt_builder.sync(debate.transcript)
+    debate.prompt_builder.load_summary(*summary)
+    if debate.next_speaker is None and not debate.debate_finished:
+        # The process stopped before the next speaker was logged
+        debate.set_next_speaker(LocalSpeakerSelector().choose(debate))
+
+    # Event ids carry on from the log, so reconnecting clients get a snapshot
+    debate.events.last_seq = last_seq
+    if resume_logging:
+        log = DebateLog(path, background=debate.log_in_background)
+        debate.events.add_listener(log.record_event)
+        debate.log = log
+    return debate
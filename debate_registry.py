@@ -0,0 +1,218 @@
+import asyncio
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from debate_broadcast import AsyncDebateBroadcaster, DebateBroadcaster
+from debate_log import attach_log, load_debate, log_path
+
+
+class DebateSession:
+    """A debate hosted by the registry, with its own lock."""
+
+    def __init__(self, debate_id, debate):
+        self.id = debate_id
+        self.debate = debate
+        self.lock = threading.RLock()
+        self.last_used = time.monotonic()
+        self.broadcaster = DebateBroadcaster(self)
+
+    def state(self):
+        """Return the debate state along with its ID and pacing."""
+        return {
+            "debate_id": self.id,
+            **self.debate.get_state(),
+            "pacing": self.broadcaster.pacing.get_stats(),
+        }
+
+    def close(self):
+        """Stop the debate and release its resources."""
+        # Don't wait for the session lock: a turn may be generating. The
+        # producer exits after it.
+        self.broadcaster.close()
+        self.debate.stop()
+        self.debate.close()
+
+    def memory_estimate(self):
+        """Rough size of the debate's transcript, in bytes."""
+        return sum(
+            len(entry["speaker"]) + len(entry["message"])
+            for entry in self.debate.transcript
+        )
+
+
+class AsyncDebateSession(DebateSession):
+    """A session hosting an `AsyncDebate`, for use on an asyncio event loop."""
+
+    def __init__(self, debate_id, debate):
+        self.id = debate_id
+        self.debate = debate
+        self.lock = asyncio.Lock()
+        self.last_used = time.monotonic()
+        self.broadcaster = AsyncDebateBroadcaster(self)
+
+    def close(self):
+        """Stop the debate and schedule the release of its resources."""
+        self.broadcaster.close()
+        self.debate.stop()
+        asyncio.ensure_future(self.debate.close())
+
+
+class DebateRegistry:
+    """Keeps many debates in one process, addressed by a debate ID.
+
+    Sessions idle for longer than `idle_timeout` seconds are evicted, then
+    least recently used ones while there are more than `max_sessions` or
+    their transcripts exceed `max_memory_bytes`. Eviction runs when a
+    debate is added, and on lookups at most every `evict_interval` seconds,
+    so idle debates are released even if no new one is created. At most
+    `max_running` debates can be running at once: reserve a slot with
+    `reserve_run` before building or starting a debate.
+
+    With `log_dir`, every debate is durably logged there (see debate_log.py)
+    and `get_or_restore` rebuilds debates that are no longer hosted, after
+    an eviction or a restart, as `debate_class` instances.
+    """
+
+    def __init__(
+        self,
+        max_sessions=500,
+        max_memory_bytes=256 * 1024 * 1024,
+        idle_timeout=3600,
+        max_running=100,
+        session_class=DebateSession,
+        log_dir=None,
+        debate_class=None,
+        evict_interval=60,
+    ):
+        self.session_class = session_class
+        self.log_dir = log_dir
+        self.debate_class = debate_class
+        self.max_sessions = max_sessions
+        self.max_memory_bytes = max_memory_bytes
+        self.idle_timeout = idle_timeout
+        self.max_running = max_running
+        self.evict_interval = evict_interval
+        self.last_evicted = time.monotonic()
+        # Running slots reserved by debates being built or started
+        self.reserved_runs = 0
+        self.lock = threading.Lock()
+        self.sessions = OrderedDict()
+        self.restore_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, session_class=DebateSession, debate_class=None):
+        """Create a registry with limits read from DEBATE_* environment variables."""
+        return cls(
+            max_sessions=int(os.getenv("DEBATE_MAX_SESSIONS", 500)),
+            max_memory_bytes=int(os.getenv("DEBATE_MAX_MEMORY_MB", 256)) * 1024 * 1024,
+            idle_timeout=int(os.getenv("DEBATE_IDLE_TIMEOUT", 3600)),
+            max_running=int(os.getenv("DEBATE_MAX_RUNNING", 100)),
+            session_class=session_class,
+            log_dir=os.getenv("DEBATE_LOG_DIR") or None,
+            debate_class=debate_class,
+        )
+
+    def create(self, debate):
+        """Register a new debate and return its session."""
+        debate_id = uuid.uuid4().hex
+        if self.log_dir:
+            attach_log(debate, log_path(self.log_dir, debate_id))
+        return self._add(self.session_class(debate_id, debate))
+
+    def _add(self, session):
+        with self.lock:
+            self.sessions[session.id] = session
+        self.evict()
+        return session
+
+    def get(self, debate_id):
+        """Return the session for `debate_id`, or None, and mark it as used."""
+        with self.lock:
+            session = self.sessions.get(debate_id)
+            if session:
+                session.last_used = time.monotonic()
+                self.sessions.move_to_end(debate_id)
+            due = time.monotonic() - self.last_evicted > self.evict_interval
+        if due:
+            self.evict()
+        return session
+
+    def get_or_restore(self, debate_id):
+        """Like `get`, but rebuild the debate from its log if it isn't hosted."""
+        session = self.get(debate_id)
+        if session:
+            return session
+        path = log_path(self.log_dir, debate_id)
+        if not path or not os.path.exists(path):
+            return None
+        with self.restore_lock:
+            # Another request may have restored it meanwhile
+            session = self.get(debate_id)
+            if not session:
+                print(f"Restoring debate {debate_id} from its log.")
+                debate = load_debate(path, debate_class=self.debate_class)
+                session = self._add(self.session_class(debate_id, debate))
+        return session
+
+    def list_sessions(self):
+        """Return every hosted session, without marking them as used."""
+        with self.lock:
+            return list(self.sessions.values())
+
+    def remove(self, debate_id):
+        """Remove a session, release its debate's resources and delete its log."""
+        with self.lock:
+            session = self.sessions.pop(debate_id, None)
+        if session:
+            session.close()
+        path = log_path(self.log_dir, debate_id)
+        if path and os.path.exists(path):
+            os.remove(path)
+        return session
+
+    def reserve_run(self, debate_id=None):
+        """Reserve a slot for one more debate (other than `debate_id`) to run.
+
+        Returns False if every slot is taken. Otherwise the caller must call
+        `release_run` once the debate is started, or failed to.
+        """
+        with self.lock:
+            running = sum(
+                1
+                for session in self.sessions.values()
+                if session.debate.debate_running and session.id != debate_id
+            )
+            if running + self.reserved_runs >= self.max_running:
+                return False
+            self.reserved_runs += 1
+            return True
+
+    def release_run(self):
+        """Release a slot reserved by `reserve_run`."""
+        with self.lock:
+            self.reserved_runs -= 1
+
+    def evict(self):
+        """Evict idle sessions, then least recently used ones over the caps."""
+        evicted = []
+        now = time.monotonic()
+        with self.lock:
+            self.last_evicted = now
+            for session in list(self.sessions.values()):
+                if now - session.last_used > self.idle_timeout:
+                    evicted.append(self.sessions.pop(session.id))
+
+            memory = sum(s.memory_estimate() for s in self.sessions.values())
+            while self.sessions and (
+                len(self.sessions) > self.max_sessions or memory > self.max_memory_bytes
+            ):
+                _, session = self.sessions.popitem(last=False)
+                memory -= session.memory_estimate()
+                evicted.append(session)
+
+        for session in evicted:
+            print(f"Evicting debate {session.id}.")
+            session.close()
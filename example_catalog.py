@@ -0,0 +1,179 @@
+"""Catalog of the debate examples, shared by the web apps.
+
+The examples directory is indexed once per process. Afterwards, files are
+only parsed again when their modification time or size changes, and the
+directory itself is checked at most every `check_interval` seconds, so
+listing the examples costs the same whether there are ten or thousands.
+"""
+
+import copy
+import json
+import os
+import threading
+import time
+
+from markupsafe import Markup, escape
+
+from pacing import PACING_POLICIES
+
+# Seconds between checks of the examples directory for changes
+CHECK_INTERVAL = 2.0
+
+SPEAKER_SELECTIONS = ("llm", "local")
+
+
+def validate_config(config):
+    """Return the problems that would keep `config` from running, if any."""
+    if not isinstance(config, dict):
+        return ["the config is not a JSON object"]
+
+    errors = []
+    for key in ("title", "description"):
+        if not isinstance(config.get(key), str) or not config[key].strip():
+            errors.append(f'"{key}" must be a non-empty string')
+
+    agents = config.get("agents")
+    if not isinstance(agents, list) or not agents:
+        errors.append('"agents" must be a non-empty list')
+    else:
+        names = set()
+        for i, agent in enumerate(agents):
+            if not isinstance(agent, dict):
+                errors.append(f"agent {i + 1} is not a JSON object")
+                continue
+            if not isinstance(agent.get("role"), str) or not agent["role"].strip():
+                errors.append(f'agent {i + 1} must have a "role"')
+                continue
+            if not isinstance(agent.get("name"), str):
+                errors.append(f'agent {i + 1} must have a "name"')
+                continue
+            # An empty name falls back to the role
+            name = agent["name"] or agent["role"]
+            if name in names:
+                errors.append(f"more than one agent is named {name}")
+            names.add(name)
+
+    max_turns = config.get("max_turns", 10)
+    if not isinstance(max_turns, int) or isinstance(max_turns, bool) or max_turns < 1:
+        errors.append('"max_turns" must be a positive integer')
+
+    if config.get("speaker_selection", "llm") not in SPEAKER_SELECTIONS:
+        errors.append(
+            f'"speaker_selection" must be one of {", ".join(SPEAKER_SELECTIONS)}'
+        )
+    if config.get("pacing", "fixed") not in PACING_POLICIES:
+        errors.append(f'"pacing" must be one of {", ".join(PACING_POLICIES)}')
+    return errors
+
+
+class ExampleCatalog:
+    """Indexes the debate examples of a directory, parsing each file once.
+
+    Invalid examples are left out, with a warning printed when they are
+    read. Listings are sorted by title and built once per change.
+    """
+
+    def __init__(self, directory="debate_examples", check_interval=CHECK_INTERVAL):
+        self.directory = directory
+        self.check_interval = check_interval
+        self.lock = threading.Lock()
+        self.files = {}  # Filename -> ((mtime, size), config or None if invalid)
+        self.checked = None
+        self._titles = []
+        self._options_html = Markup("")
+
+    def refresh(self, force=False):
+        """Re-read the examples that changed, unless checked recently."""
+        with self.lock:
+            now = time.monotonic()
+            if (
+                not force
+                and self.checked is not None
+                and now - self.checked < self.check_interval
+            ):
+                return
+            self.checked = now
+
+            files = {}
+            try:
+                with os.scandir(self.directory) as entries:
+                    for entry in entries:
+                        if not entry.name.endswith(".json") or not entry.is_file():
+                            continue
+                        stat = entry.stat()
+                        signature = (stat.st_mtime_ns, stat.st_size)
+                        known = self.files.get(entry.name)
+                        if known and known[0] == signature:
+                            files[entry.name] = known
+                        else:
+                            files[entry.name] = (signature, self._load(entry.path))
+            except FileNotFoundError:
+                print(f"Warning: Debate examples directory {self.directory} not found.")
+
+            if files != self.files:
+                self.files = files
+                self._index()
+
+    def _load(self, path):
+        """Parse and validate one example, returning None if it can't be used."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                config = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Skipping debate example {path} ({e}).")
+            return None
+        errors = validate_config(config)
+        if errors:
+            print(
+                f"Warning: Skipping invalid debate example {path}: {'; '.join(errors)}."
+            )
+            return None
+        return config
+
+    def _index(self):
+        """Build the sorted listings served until the next change."""
+        examples = sorted(
+            (config["title"].lower(), filename, config["title"])
+            for filename, (_, config) in self.files.items()
+            if config
+        )
+        self._titles = [
+            {"filename": filename, "title": title} for _, filename, title in examples
+        ]
+        self._options_html = Markup(
+            "".join(
+                f'<option value="{escape(filename)}">{escape(title)}</option>\n'
+                for _, filename, title in examples
+            )
+        )
+
+    def titles(self):
+        """Return the filename and title of each valid example, sorted by title.
+
+        The list is shared: don't modify it.
+        """
+        self.refresh()
+        return self._titles
+
+    def options_html(self):
+        """Return the examples as HTML `<option>` elements, rendered once per change."""
+        self.refresh()
+        return self._options_html
+
+    def get(self, filename):
+        """Return a copy of an example's config, or None if it isn't valid."""
+        self.refresh()
+        known = self.files.get(filename)
+        return copy.deepcopy(known[1]) if known and known[1] else None
+
+
+_catalogs = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_catalog(directory="debate_examples"):
+    """Return the process-wide catalog of `directory`."""
+    with _catalogs_lock:
+        if directory not in _catalogs:
+            _catalogs[directory] = ExampleCatalog(directory)
+        return _catalogs[directory]
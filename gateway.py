@@ -0,0 +1,480 @@
+"""Gateway through which the process makes its Gemini and TTS calls.
+
+It spaces calls out with a token bucket per model, caps the number of calls
+in flight, retries throttled and transient failures with exponential
+backoff and jitter, and gives up on a call once its deadline has passed.
+`clients.py` wraps the shared clients with it, so every debate in the
+process shares the same limits.
+"""
+
+import asyncio
+import os
+import random
+import threading
+import time
+
+from rate_limit import ConcurrencyLimit, RateLimiter
+
+# HTTP statuses worth retrying: timeouts, throttling and server errors
+RETRYABLE_CODES = {408, 429, 500, 502, 503, 504}
+
+# First retry delay and maximum delay between retries, in seconds
+BACKOFF = 1.0
+MAX_BACKOFF = 30.0
+
+# Key of the TTS calls, whose quota doesn't depend on the voice
+TTS_MODEL = "tts"
+
+# Key of the context cache management calls
+CACHE_MODEL = "caches"
+
+COUNTERS = (
+    "calls",
+    "retries",
+    "failures",
+    "deadline_exceeded",
+    "throttled",
+    "throttled_seconds",
+    "queued",
+    "queued_seconds",
+)
+
+
+def is_retryable(error):
+    """Whether a failed call may succeed if made again."""
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    # httpx's network errors, matched by name so that importing the gateway
+    # doesn't import httpx
+    if any(
+        cls.__module__.startswith("httpx") and cls.__name__ == "TransportError"
+        for cls in type(error).__mro__
+    ):
+        return True
+    # Gemini's APIError and Google API core exceptions carry the HTTP status
+    return getattr(error, "code", None) in RETRYABLE_CODES
+
+
+def parse_model_rates(value):
+    """Parse `model=calls per minute` pairs, separated by commas."""
+    rates = {}
+    for pair in (value or "").split(","):
+        if pair.strip():
+            model, rate = pair.split("=")
+            rates[model.strip()] = float(rate)
+    return rates
+
+
+class Gateway:
+    """Makes model calls within rate, concurrency and time limits.
+
+    Each model gets a token bucket of `calls_per_minute`, or its rate in
+    `model_calls_per_minute` (0: unlimited), allowing `burst` calls back to
+    back. At most `max_concurrency` calls are in flight (0: unlimited).
+    Failures that `is_retryable` are retried up to `max_retries` times, and
+    no call is retried or waited for past `deadline` seconds.
+    """
+
+    def __init__(
+        self,
+        calls_per_minute=0,
+        model_calls_per_minute=None,
+        burst=1,
+        max_concurrency=64,
+        max_retries=5,
+        deadline=120.0,
+    ):
+        self.calls_per_minute = calls_per_minute
+        self.model_calls_per_minute = model_calls_per_minute or {}
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.deadline = deadline
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.configure()
+
+    @classmethod
+    def from_env(cls):
+        """Create a gateway with limits read from DEBATE_* environment variables."""
+        return cls(
+            calls_per_minute=float(os.getenv("DEBATE_CALLS_PER_MINUTE", 0)),
+            model_calls_per_minute=parse_model_rates(
+                os.getenv("DEBATE_MODEL_CALLS_PER_MINUTE")
+            ),
+            burst=int(os.getenv("DEBATE_CALL_BURST", 1)),
+            max_concurrency=int(os.getenv("DEBATE_MAX_CONCURRENT_CALLS", 64)),
+            max_retries=int(os.getenv("DEBATE_CALL_RETRIES", 5)),
+            deadline=float(os.getenv("DEBATE_CALL_DEADLINE", 120)),
+        )
+
+    def configure(self, **limits):
+        """Change some of the limits. Rate limiters start over with full buckets."""
+        for name, value in limits.items():
+            if not hasattr(self, name):
+                raise TypeError(f"Unknown gateway limit: {name}")
+            setattr(self, name, value)
+        with self.lock:
+            self.limiters = {}
+            self.concurrency = (
+                ConcurrencyLimit(self.max_concurrency) if self.max_concurrency else None
+            )
+
+    def limiter(self, model):
+        """Return the rate limiter of `model`, or None if it is unlimited."""
+        with self.lock:
+            if model not in self.limiters:
+                rate = self.model_calls_per_minute.get(model, self.calls_per_minute)
+                self.limiters[model] = (
+                    RateLimiter(rate / 60, burst=self.burst) if rate else None
+                )
+            return self.limiters[model]
+
+    def _count(self, model, **increments):
+        with self.lock:
+            counters = self.counters.setdefault(model, dict.fromkeys(COUNTERS, 0))
+            for name, value in increments.items():
+                counters[name] += value
+
+    def _remaining(self, model, deadline, what):
+        """Seconds left before `deadline`, raising TimeoutError if there are none."""
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            self._count(model, deadline_exceeded=1)
+            raise TimeoutError(f"Deadline exceeded {what} for a {model} call.")
+        return remaining
+
+    def _throttle_delay(self, model, deadline):
+        """Take a rate limit token, returning how long to wait for it."""
+        limiter = self.limiter(model)
+        delay = limiter.reserve() if limiter else 0.0
+        if delay:
+            self._count(model, throttled=1, throttled_seconds=delay)
+            if delay > self._remaining(model, deadline, "waiting"):
+                self._count(model, deadline_exceeded=1)
+                raise TimeoutError(
+                    f"Deadline exceeded waiting {delay:.1f}s for the {model} rate limit."
+                )
+        return delay
+
+    def _started(self, model):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            counters = self.counters.setdefault(model, dict.fromkeys(COUNTERS, 0))
+            counters["calls"] += 1
+
+    def _finished(self, concurrency):
+        with self.lock:
+            self.in_flight -= 1
+        if concurrency:
+            concurrency.release()
+
+    def _enter(self, model, deadline):
+        """Wait for a rate limit token and a concurrency slot, returning the limit."""
+        time.sleep(self._throttle_delay(model, deadline))
+        concurrency = self.concurrency
+        if concurrency:
+            start = time.monotonic()
+            queued = concurrency.full()
+            remaining = self._remaining(model, deadline, "queueing")
+            if not concurrency.acquire(timeout=remaining):
+                self._count(model, deadline_exceeded=1)
+                raise TimeoutError(f"Deadline exceeded queueing a {model} call.")
+            if queued:
+                self._count(model, queued=1, queued_seconds=time.monotonic() - start)
+        self._started(model)
+        return concurrency
+
+    async def _enter_async(self, model, deadline):
+        """Async version of `_enter`."""
+        await asyncio.sleep(self._throttle_delay(model, deadline))
+        concurrency = self.concurrency
+        if concurrency:
+            start = time.monotonic()
+            queued = concurrency.full()
+            remaining = self._remaining(model, deadline, "queueing")
+            if not await concurrency.acquire_async(timeout=remaining):
+                self._count(model, deadline_exceeded=1)
+                raise TimeoutError(f"Deadline exceeded queueing a {model} call.")
+            if queued:
+                self._count(model, queued=1, queued_seconds=time.monotonic() - start)
+        self._started(model)
+        return concurrency
+
+    def _retry_delay(self, model, error, attempt, deadline):
+        """Return how long to wait before retrying, or raise `error` if giving up."""
+        if not is_retryable(error) or attempt >= self.max_retries:
+            self._count(model, failures=1)
+            raise error
+        # Exponential backoff with "equal jitter": half fixed, half random
+        backoff = min(MAX_BACKOFF, BACKOFF * 2**attempt)
+        delay = backoff / 2 + random.uniform(0, backoff / 2)
+        if time.monotonic() + delay >= deadline:
+            self._count(model, failures=1, deadline_exceeded=1)
+            raise error
+        self._count(model, retries=1)
+        print(
+            f"Warning: {model} call failed ({error}). Retrying in {delay:.1f}s (attempt {attempt + 2})."
+        )
+        return delay
+
+    def call(self, model, function, /, *args, **kwargs):
+        """Return `function(*args, **kwargs)`, made as a `model` call."""
+        deadline = time.monotonic() + self.deadline
+        attempt = 0
+        while True:
+            concurrency = self._enter(model, deadline)
+            try:
+                return function(*args, **kwargs)
+            except Exception as e:
+                error = e
+            finally:
+                self._finished(concurrency)
+            time.sleep(self._retry_delay(model, error, attempt, deadline))
+            attempt += 1
+
+    async def call_async(self, model, function, /, *args, **kwargs):
+        """Return `await function(*args, **kwargs)`, made as a `model` call."""
+        deadline = time.monotonic() + self.deadline
+        attempt = 0
+        while True:
+            concurrency = await self._enter_async(model, deadline)
+            try:
+                return await asyncio.wait_for(
+                    function(*args, **kwargs),
+                    self._remaining(model, deadline, "calling"),
+                )
+            except Exception as e:
+                error = e
+            finally:
+                self._finished(concurrency)
+            await asyncio.sleep(self._retry_delay(model, error, attempt, deadline))
+            attempt += 1
+
+    def stream(self, model, function, /, *args, **kwargs):
+        """Yield the chunks of a streaming `model` call.
+
+        The call is retried until its first chunk arrives; later failures
+        are raised, as part of the message was already consumed. Its
+        concurrency slot is held until the stream ends.
+        """
+        deadline = time.monotonic() + self.deadline
+        attempt = 0
+        while True:
+            concurrency = self._enter(model, deadline)
+            try:
+                chunks = iter(function(*args, **kwargs))
+                first = next(chunks, None)
+                break
+            except BaseException as e:
+                self._finished(concurrency)
+                if not isinstance(e, Exception):
+                    raise
+                error = e
+            time.sleep(self._retry_delay(model, error, attempt, deadline))
+            attempt += 1
+
+        try:
+            if first is not None:
+                yield first
+                yield from chunks
+        finally:
+            self._finished(concurrency)
+
+    async def stream_async(self, model, function, /, *args, **kwargs):
+        """Async version of `stream`, returning an async iterator of chunks."""
+        deadline = time.monotonic() + self.deadline
+        attempt = 0
+        while True:
+            concurrency = await self._enter_async(model, deadline)
+            try:
+                chunks, first = await asyncio.wait_for(
+                    self._open_stream(function, *args, **kwargs),
+                    self._remaining(model, deadline, "calling"),
+                )
+                break
+            except BaseException as e:
+                # Including cancellation, which must give the slot back too
+                self._finished(concurrency)
+                if not isinstance(e, Exception):
+                    raise
+                error = e
+            await asyncio.sleep(self._retry_delay(model, error, attempt, deadline))
+            attempt += 1
+
+        async def stream():
+            try:
+                if first is not None:
+                    yield first
+                    async for chunk in chunks:
+                        yield chunk
+            finally:
+                self._finished(concurrency)
+
+        return stream()
+
+    async def _open_stream(self, function, /, *args, **kwargs):
+        chunks = await function(*args, **kwargs)
+        try:
+            return chunks, await chunks.__anext__()
+        except StopAsyncIteration:
+            return chunks, None
+
+    def get_stats(self):
+        """Return the counters in total and per model, and the calls in flight."""
+        with self.lock:
+            by_model = {model: dict(c) for model, c in self.counters.items()}
+            in_flight, max_in_flight = self.in_flight, self.max_in_flight
+        total = dict.fromkeys(COUNTERS, 0)
+        for counters in by_model.values():
+            for name, value in counters.items():
+                total[name] += value
+        return {
+            "total": total,
+            "by_model": by_model,
+            "in_flight": in_flight,
+            "max_in_flight": max_in_flight,
+        }
+
+
+class _GatewayModels:
+    def __init__(self, models, gateway):
+        self._models = models
+        self._gateway = gateway
+
+    def generate_content(self, **kwargs):
+        return self._gateway.call(
+            kwargs.get("model"), self._models.generate_content, **kwargs
+        )
+
+    def generate_content_stream(self, **kwargs):
+        return self._gateway.stream(
+            kwargs.get("model"), self._models.generate_content_stream, **kwargs
+        )
+
+
+class _AsyncGatewayModels:
+    def __init__(self, models, gateway):
+        self._models = models
+        self._gateway = gateway
+
+    async def generate_content(self, **kwargs):
+        return await self._gateway.call_async(
+            kwargs.get("model"), self._models.generate_content, **kwargs
+        )
+
+    async def generate_content_stream(self, **kwargs):
+        return await self._gateway.stream_async(
+            kwargs.get("model"), self._models.generate_content_stream, **kwargs
+        )
+
+
+class _GatewayCaches:
+    def __init__(self, caches, gateway):
+        self._caches = caches
+        self._gateway = gateway
+
+    def create(self, **kwargs):
+        return self._gateway.call(CACHE_MODEL, self._caches.create, **kwargs)
+
+    def delete(self, **kwargs):
+        return self._gateway.call(CACHE_MODEL, self._caches.delete, **kwargs)
+
+
+class _AsyncGatewayCaches:
+    def __init__(self, caches, gateway):
+        self._caches = caches
+        self._gateway = gateway
+
+    async def create(self, **kwargs):
+        return await self._gateway.call_async(
+            CACHE_MODEL, self._caches.create, **kwargs
+        )
+
+    async def delete(self, **kwargs):
+        return await self._gateway.call_async(
+            CACHE_MODEL, self._caches.delete, **kwargs
+        )
+
+
+class _AsyncGatewayClient:
+    def __init__(self, aio, gateway):
+        self.models = _AsyncGatewayModels(aio.models, gateway)
+        self.caches = _AsyncGatewayCaches(aio.caches, gateway)
+
+
+class GatewayClient:
+    """Wraps a Gemini client so that every model call goes through `gateway`.
+
+    Context cache management is counted as the model `CACHE_MODEL`.
+    """
+
+    def __init__(self, client, gateway):
+        self.models = _GatewayModels(client.models, gateway)
+        self.caches = _GatewayCaches(client.caches, gateway)
+        self._client = client
+        self._gateway = gateway
+        self._aio = None
+
+    @property
+    def aio(self):
+        # Built on first use, so clients without an async API can be wrapped
+        if self._aio is None:
+            self._aio = _AsyncGatewayClient(self._client.aio, self._gateway)
+        return self._aio
+
+
+class GatewayTTSClient:
+    """Wraps a Google Cloud TTS client so that synthesis goes through `gateway`."""
+
+    def __init__(self, client, gateway):
+        self._client = client
+        self._gateway = gateway
+
+    def synthesize_speech(self, **kwargs):
+        # Bound each attempt, as the gateway can't interrupt a blocking call
+        return self._gateway.call(
+            TTS_MODEL,
+            self._client.synthesize_speech,
+            timeout=self._gateway.deadline,
+            **kwargs,
+        )
+
+    def streaming_synthesize(self, requests, **kwargs):
+        # A list, so that a retried stream sends the requests again
+        return self._gateway.stream(
+            TTS_MODEL,
+            self._client.streaming_synthesize,
+            requests=list(requests),
+            timeout=self._gateway.deadline,
+            **kwargs,
+        )
+
+
+class AsyncGatewayTTSClient:
+    """Wraps a Google Cloud TTS async client so that synthesis goes through `gateway`."""
+
+    def __init__(self, client, gateway):
+        self._client = client
+        self._gateway = gateway
+
+    async def synthesize_speech(self, **kwargs):
+        return await self._gateway.call_async(
+            TTS_MODEL, self._client.synthesize_speech, **kwargs
+        )
+
+
+_gateway = None
+_gateway_lock = threading.Lock()
+
+
+def get_gateway():
+    """Return the process-wide gateway."""
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = Gateway.from_env()
+        return _gateway
@@ -0,0 +1,81 @@
+import re
+from collections import Counter
+
+# Frequent function words per language. Languages other than English and
+# French are only profiled so that their texts are classified as "Other".
+STOPWORDS = {
+    "English": """
+        a about after all also an and are as at be because been but by can could
+        do does for from has have he her his how i if in into is it its more my
+        no not of on or our should so than that the their them then there these
+        they this to up was we were what when where whether which who why will
+        with would you your
+    """,
+    "French": """
+        à au aux avec ce ces cette comme d dans de des du elle en est et être il
+        ils je l la le les leur mais ne nous on ou où par pas peut plus pour qu
+        que qui sa se ses si son sont sur un une vers vous y
+    """,
+    "Spanish": """
+        al como con de del el en es esta este está la las los más no para pero
+        por que se su sus un una y
+    """,
+    "German": """
+        auf aus das dass dem den der des die ein eine einen es für ist mit nicht
+        oder sich sie und von wie wird zu zum zur
+    """,
+    "Italian": """
+        al alla che con da del della di e gli il in la le nel non per più si
+        sono un una
+    """,
+}
+STOPWORDS = {language: set(words.split()) for language, words in STOPWORDS.items()}
+
+# Characters that are much more frequent in one profiled language
+CHARACTERS = {
+    "French": set("éèêàçœù"),
+    "Spanish": set("ñ¿¡"),
+    "German": set("äöüß"),
+}
+
+WORD_PATTERN = re.compile(r"[^\W\d_]+")
+
+# Below this many matched stopwords, there is too little evidence to decide
+MIN_EVIDENCE = 5
+
+# Below this confidence, callers should ask the model instead
+MIN_CONFIDENCE = 0.5
+
+
+def detect_language(text):
+    """Detect the language of `text` without any model call.
+
+    Returns the language ("English", "French" or "Other") and a confidence
+    between 0 and 1, from how clearly the best matching profile wins.
+    """
+    words = Counter(WORD_PATTERN.findall(text.lower()))
+    characters = Counter(text.lower())
+
+    scores = {}
+    for language, stopwords in STOPWORDS.items():
+        score = sum(count for word, count in words.items() if word in stopwords)
+        score += sum(characters[c] for c in CHARACTERS.get(language, ()))
+        scores[language] = score
+
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    (best, best_score), (_, second_score) = ranked[0], ranked[1]
+    if best_score < MIN_EVIDENCE:
+        return "English", 0.0
+
+    confidence = (best_score - second_score) / best_score
+    if best not in ("English", "French"):
+        best = "Other"
+    return best, confidence
+
+
+def debate_texts(config):
+    """Combine the title, description and personas of a debate config."""
+    texts = f"{config['title']}\n{config['description']}"
+    for agent in config["agents"]:
+        texts += f"\n{agent.get('persona', '')}"
+    return texts
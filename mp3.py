@@ -0,0 +1,141 @@
+"""Minimal MP3 frame parsing, to join clips without decoding them.
+
+MP3 audio is a sequence of self-contained frames, so clips encoded with the
+same parameters (as every Chirp3 clip of a debate is) can be concatenated by
+copying their frames, skipping tags and the Xing/Info metadata frame that
+would otherwise describe only the first clip.
+"""
+
+# Layer III bitrates in kbps, by bitrate index
+MPEG1_BITRATES = [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320]
+MPEG2_BITRATES = [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160]
+
+# Sample rates by version bits (3: MPEG 1, 2: MPEG 2, 0: MPEG 2.5)
+SAMPLE_RATES = {
+    3: [44100, 48000, 32000],
+    2: [22050, 24000, 16000],
+    0: [11025, 12000, 8000],
+}
+
+
+class FrameHeader:
+    """The fields of an MP3 frame header needed to walk and join frames."""
+
+    def __init__(self, version, sample_rate, channels, length, samples, side_info):
+        self.version = version
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.length = length
+        self.samples = samples
+        self.side_info = side_info
+
+    @property
+    def format(self):
+        return self.version, self.sample_rate, self.channels
+
+
+def parse_header(data, offset):
+    """Parse the Layer III frame header at `offset`, or return None."""
+    if offset + 4 > len(data):
+        return None
+    b1, b2, b3 = data[offset + 1], data[offset + 2], data[offset + 3]
+    if data[offset] != 0xFF or b1 & 0xE0 != 0xE0:
+        return None
+    version = (b1 >> 3) & 3
+    layer = (b1 >> 1) & 3
+    bitrate_index = b2 >> 4
+    sample_rate_index = (b2 >> 2) & 3
+    if version == 1 or layer != 1 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+
+    mpeg1 = version == 3
+    bitrate = (MPEG1_BITRATES if mpeg1 else MPEG2_BITRATES)[bitrate_index] * 1000
+    sample_rate = SAMPLE_RATES[version][sample_rate_index]
+    padding = (b2 >> 1) & 1
+    channels = 1 if b3 >> 6 == 3 else 2
+
+    length = (144 if mpeg1 else 72) * bitrate // sample_rate + padding
+    samples = 1152 if mpeg1 else 576
+    side_info = (32 if channels == 2 else 17) if mpeg1 else (17 if channels == 2 else 9)
+    if not b1 & 1:
+        side_info += 2  # CRC
+    return FrameHeader(version, sample_rate, channels, length, samples, side_info)
+
+
+def _skip_id3(data):
+    """Return the offset of the first byte after a leading ID3v2 tag."""
+    if data[:3] != b"ID3" or len(data) < 10:
+        return 0
+    size = 0
+    for byte in data[6:10]:
+        size = (size << 7) | (byte & 0x7F)
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def _is_info_frame(data, offset, header):
+    """Whether the frame is a Xing/Info/VBRI metadata frame rather than audio."""
+    start = offset + 4 + header.side_info
+    return (
+        data[start : start + 4] in (b"Xing", b"Info")
+        or data[offset + 36 : offset + 40] == b"VBRI"
+    )
+
+
+def iter_frames(data):
+    """Yield (offset, header) for every audio frame of an MP3 clip."""
+    offset = _skip_id3(data)
+    first = True
+    while offset < len(data):
+        header = parse_header(data, offset)
+        if header is None or offset + header.length > len(data):
+            # Resynchronize on the next frame, past any junk or trailing tag
+            offset = data.find(b"\xff", offset + 1)
+            if offset == -1:
+                return
+            continue
+        if not (first and _is_info_frame(data, offset, header)):
+            yield offset, header
+        first = False
+        offset += header.length
+
+
+def duration(data):
+    """Return the duration of an MP3 clip in seconds, from its frame headers."""
+    return sum(header.samples / header.sample_rate for _, header in iter_frames(data))
+
+
+def join(clips):
+    """Yield the frames of `clips` as one MP3 stream, chunk by chunk.
+
+    Memory use is bounded by the largest clip, whatever the number of clips.
+    Raises ValueError if the clips don't share the same MPEG version, sample
+    rate and channel count, as their frames could not be played back to back.
+    """
+    stream_format = None
+    for clip in clips:
+        if not clip:
+            continue
+        view = memoryview(clip)
+        start = end = None
+        for offset, header in iter_frames(clip):
+            if stream_format is None:
+                stream_format = header.format
+            elif header.format != stream_format:
+                raise ValueError(
+                    f"Cannot join MP3 clips of different formats: {header.format} and {stream_format}"
+                )
+            # Copy runs of contiguous frames at once
+            if offset != end:
+                if start is not None:
+                    yield view[start:end]
+                start = offset
+            end = offset + header.length
+        if start is not None:
+            yield view[start:end]
+
+
+def write(clips, file):
+    """Write the frames of `clips` to the binary `file` as one MP3 stream."""
+    for chunk in join(clips):
+        file.write(chunk)
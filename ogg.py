@@ -0,0 +1,44 @@
+"""Minimal Ogg Opus parsing, to measure streamed speech without decoding it.
+
+An Ogg stream is a sequence of pages, each carrying the granule position
+reached at its end. For Opus, that is a count of 48 kHz samples, from which
+the pre-skip declared in the `OpusHead` header is subtracted.
+"""
+
+OPUS_SAMPLE_RATE = 48000
+PAGE_HEADER_LENGTH = 27
+
+
+def pages(data):
+    """Yield the granule position and payload of each complete Ogg page."""
+    offset = 0
+    while offset + PAGE_HEADER_LENGTH <= len(data):
+        if data[offset : offset + 4] != b"OggS":
+            # Resynchronize on the next page, as a demuxer would
+            offset = data.find(b"OggS", offset + 1)
+            if offset < 0:
+                return
+            continue
+        segments = data[offset + 26]
+        table_end = offset + PAGE_HEADER_LENGTH + segments
+        if table_end > len(data):
+            return
+        length = sum(data[offset + PAGE_HEADER_LENGTH : table_end])
+        if table_end + length > len(data):
+            return
+        granule = int.from_bytes(data[offset + 6 : offset + 14], "little", signed=True)
+        yield granule, data[table_end : table_end + length]
+        offset = table_end + length
+
+
+def duration(data):
+    """Return the duration of Ogg Opus audio in seconds, 0.0 if it has none."""
+    pre_skip = 0
+    last_granule = 0
+    for granule, payload in pages(data):
+        if payload.startswith(b"OpusHead") and len(payload) >= 12:
+            pre_skip = int.from_bytes(payload[10:12], "little")
+        elif granule > 0:
+            # -1 marks pages where no packet ends
+            last_granule = granule
+    return max(0, last_granule - pre_skip) / OPUS_SAMPLE_RATE
@@ -0,0 +1,151 @@
+"""Pacing of debate turns: when a generated turn is released to viewers.
+
+The next turn is generated as soon as the previous one is released, then
+held until viewers should be done with the previous one. How long that is
+depends on the debate's `pacing` policy:
+
+* `fixed`: `pacing_delay` seconds (default 3);
+* `reading`: the time to read the previous message at
+  `pacing_words_per_minute` (default 200);
+* `audio`: the duration of the previous message's speech, estimated from
+  its length until it is synthesized;
+* `ack`: until a viewer acknowledges the previous turn, or at most
+  `pacing_ack_timeout` seconds (default 120).
+
+Whatever the policy, a viewer acknowledging a turn releases the next one
+early. The default is `audio` for debates with voice, else `fixed`.
+"""
+
+import threading
+import time
+
+PACING_POLICIES = ("fixed", "reading", "audio", "ack")
+
+# Speech rate of the synthesized voices, at the speaking rate debates use
+SPEECH_CHARACTERS_PER_SECOND = 15
+
+
+class FixedDelay:
+    """Holds every turn for the same number of seconds."""
+
+    def __init__(self, seconds=3):
+        self.seconds = seconds
+
+    def delay(self, entry, audio_seconds=None):
+        return self.seconds
+
+
+class ReadingSpeed:
+    """Holds the next turn for as long as reading the last message takes."""
+
+    def __init__(self, words_per_minute=200, minimum=1.0):
+        self.words_per_minute = words_per_minute
+        self.minimum = minimum
+
+    def delay(self, entry, audio_seconds=None):
+        words = len(entry["message"].split())
+        return max(self.minimum, words / self.words_per_minute * 60)
+
+
+class AudioDuration:
+    """Holds the next turn until the last message's speech has played."""
+
+    def __init__(self, gap=0.5):
+        self.gap = gap
+
+    def delay(self, entry, audio_seconds=None):
+        if audio_seconds is None:
+            audio_seconds = len(entry["message"]) / SPEECH_CHARACTERS_PER_SECOND
+        return audio_seconds + self.gap
+
+
+class ClientAck:
+    """Holds the next turn until a viewer acknowledges the last one."""
+
+    def __init__(self, timeout=120):
+        self.timeout = timeout
+
+    def delay(self, entry, audio_seconds=None):
+        return self.timeout
+
+
+def create_pacing_policy(config):
+    """Create the pacing policy of a debate config."""
+    default = "audio" if config.get("enable_voice", False) else "fixed"
+    policy = config.get("pacing", default)
+    if policy == "fixed":
+        return FixedDelay(config.get("pacing_delay", 3))
+    if policy == "reading":
+        return ReadingSpeed(config.get("pacing_words_per_minute", 200))
+    if policy == "audio":
+        return AudioDuration()
+    if policy == "ack":
+        return ClientAck(config.get("pacing_ack_timeout", 120))
+    raise ValueError(f"Unknown pacing policy: {policy}")
+
+
+class PacingScheduler:
+    """Tracks when the next turn of a debate may be released.
+
+    Call `released` whenever a turn reaches viewers, `measured` once its
+    speech is synthesized, and `ack` when a viewer is done with it.
+    Callbacks added with `add_listener` are called when either of the last
+    two changes when the next turn is due, so that waiting producers can
+    wake up.
+    """
+
+    def __init__(self, policy):
+        self.policy = policy
+        self.lock = threading.Lock()
+        self.release_at = 0.0
+        self.released_at = 0.0
+        self.last_turn = None
+        self.last_entry = None
+        self.acknowledged = False
+        self.listeners = []
+
+    def add_listener(self, callback):
+        self.listeners.append(callback)
+
+    def remaining(self):
+        """Seconds until the next turn is due, 0 if it already is."""
+        with self.lock:
+            return max(0.0, self.release_at - time.monotonic())
+
+    def released(self, turn, entry, audio_seconds=None):
+        """Record that `turn` reached viewers, holding the next one accordingly."""
+        delay = self.policy.delay(entry, audio_seconds)
+        with self.lock:
+            self.last_turn = turn
+            self.last_entry = entry
+            self.acknowledged = False
+            self.released_at = time.monotonic()
+            self.release_at = self.released_at + delay
+
+    def measured(self, turn, audio_seconds):
+        """Re-time the next turn now that the speech of `turn` is known to last `audio_seconds`."""
+        with self.lock:
+            if turn != self.last_turn or self.acknowledged:
+                return
+            delay = self.policy.delay(self.last_entry, audio_seconds)
+            self.release_at = self.released_at + delay
+        for callback in self.listeners:
+            callback()
+
+    def ack(self, turn):
+        """Record that a viewer is done with `turn`. Returns whether it was the last one."""
+        with self.lock:
+            if self.last_turn is None or turn < self.last_turn:
+                return False
+            self.acknowledged = True
+            self.release_at = min(self.release_at, time.monotonic())
+        for callback in self.listeners:
+            callback()
+        return True
+
+    def get_stats(self):
+        return {
+            "policy": type(self.policy).__name__,
+            "last_released_turn": self.last_turn,
+            "next_release_in": self.remaining(),
+        }
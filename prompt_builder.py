@@ -0,0 +1,195 @@
+import threading
+
+# Rough characters-per-token ratio, used to estimate prompt sizes
+CHARS_PER_TOKEN = 4
+
+
+class PromptBuilder:
+    """Incrementally builds turn prompts for a debate.
+
+    The preamble (topic, participants and their personas, language and the
+    rules every contribution follows) is rendered once, and
+    transcript entries are rendered once as they are appended, so building a
+    prompt only joins already-rendered pieces instead of re-formatting the
+    whole transcript every turn.
+
+    With `recent_turns`, only that many latest turns must be kept verbatim:
+    older ones can be folded into a rolling summary (see `pending_summary`
+    and `fold`). With `token_budget`, the oldest verbatim turns are left out
+    of the transcript whenever it would exceed that many tokens.
+    """
+
+    def __init__(
+        self, title, description, agents, language, recent_turns=0, token_budget=None
+    ):
+        self.language = language
+        self.recent_turns = recent_turns
+        self.token_budget = token_budget
+        self.lock = threading.Lock()
+        self._generation = 0
+        personas = "\n".join(
+            (
+                f"- {a.name} ({a.role}): {a.persona}"
+                if a.persona
+                else f"- {a.name} ({a.role})"
+            )
+            for a in agents
+        )
+        # Everything that is the same for every turn and speaker, so that
+        # it can be sent once as a cached context
+        self.preamble = f"""
+Debate topic: {title}
+Debate description: {description}
+Participants: {", ".join([f"{a.name} ({a.role})" for a in agents])}
+Debate language: {language}
+
+Participant personas:
+{personas}
+
+Rules for every contribution to the debate:
+- Base it on the debate so far, and reflect the speaker's role and persona.
+- Be concise and to the point. You can respond with just a few words, a sentence or sometimes a few sentences.
+- Respond in {language} language.
+"""
+        self.reset()
+
+    def reset(self):
+        """Forget all rendered transcript entries and the summary."""
+        with self.lock:
+            self._entries = []
+            self._transcript_text = ""
+            self._dirty = False
+            self.summary = ""
+            self.summarized = 0  # Number of leading entries folded into the summary
+            self._generation += 1
+
+    def __len__(self):
+        return len(self._entries)
+
+    def append(self, entry):
+        """Render a single transcript entry and append it."""
+        with self.lock:
+            self._entries.append(f"{entry['speaker']}: {entry['message']}\n")
+            self._dirty = True
+
+    def sync(self, transcript):
+        """Bring the rendered entries in line with `transcript`.
+
+        Only the entries added since the last call are rendered. If the
+        transcript shrank (e.g. after a reset), everything is re-rendered.
+        """
+        if len(transcript) < len(self._entries):
+            self.reset()
+        for entry in transcript[len(self._entries) :]:
+            self.append(entry)
+
+    def transcript_text(self):
+        """Return the rendered transcript, joining it at most once per change."""
+        with self.lock:
+            if self._dirty:
+                self._transcript_text = self._render()
+                self._dirty = False
+            return self._transcript_text
+
+    def _render(self):
+        header = ""
+        if self.summarized:
+            header = f"(Summary of the first {self.summarized} turns: {self.summary})\n"
+        entries = self._entries[self.summarized :]
+
+        if self.token_budget:
+            # Keep the latest entries that fit, and at least the last one
+            budget = self.token_budget * CHARS_PER_TOKEN - len(header)
+            kept = size = 0
+            for entry in reversed(entries):
+                if kept and size + len(entry) > budget:
+                    break
+                size += len(entry)
+                kept += 1
+            omitted = len(entries) - kept
+            if omitted:
+                header += f"({omitted} earlier turns omitted)\n"
+                entries = entries[omitted:]
+
+        return header + "".join(entries)
+
+    def pending_summary(self):
+        """Return the turns to fold into the summary, or None if there are none.
+
+        The returned job holds the current `summary` and the rendered `text`
+        of every turn older than the `recent_turns` latest ones that isn't
+        summarized yet. Pass it back to `fold` with the updated summary.
+        """
+        with self.lock:
+            end = len(self._entries) - self.recent_turns
+            if not self.recent_turns or end <= self.summarized:
+                return None
+            return {
+                "summary": self.summary,
+                "text": "".join(self._entries[self.summarized : end]),
+                "end": end,
+                "generation": self._generation,
+            }
+
+    def fold(self, job, summary):
+        """Replace the turns of `job` with `summary`, which also covers older turns.
+
+        Returns whether it was applied.
+        """
+        with self.lock:
+            # The transcript was reset or summarized further meanwhile
+            if job["generation"] != self._generation or job["end"] <= self.summarized:
+                return False
+            self.summary = summary
+            self.summarized = job["end"]
+            self._dirty = True
+            return True
+
+    def load_summary(self, summary, summarized):
+        """Restore a summary of the first `summarized` entries, e.g. from a log."""
+        with self.lock:
+            self.summary = summary
+            self.summarized = min(summarized, len(self._entries))
+            self._dirty = True
+
+    def get_stats(self):
+        return {
+            "recent_turns": self.recent_turns,
+            "token_budget": self.token_budget,
+            "summarized_turns": self.summarized,
+            "transcript_tokens": len(self.transcript_text()) // CHARS_PER_TOKEN,
+        }
+
+    def agent_header(self, agent):
+        """Render the per-agent persona block."""
+        return f"""
+You are {agent.name}, playing the role of {agent.role}, with the persona described above.
+
+Current debate transcript:
+"""
+
+    def agent_instructions(self, agent):
+        """Render the per-agent instruction tail."""
+        instructions = f"""
+Provide your next contribution as {agent.name}, following the rules above.
+"""
+        if agent.is_moderator:
+            instructions += "You will be the moderator of this debate. After introducing the debate and its participants, you will guide the discussion. If the debate has come to an end, clearly state 'The debate is now closed' at the end of your message."
+
+        instructions += f"You MUST respond in {self.language} language."
+        return instructions
+
+    def build(self, agent, first_turn=False, include_preamble=True):
+        """Build the prompt for `agent`, optionally without the static preamble."""
+        if first_turn:
+            body = "(The debate is just starting. As the moderator, introduce the topic and participants.)"
+        else:
+            body = self.transcript_text()
+        return "".join(
+            [
+                self.preamble if include_preamble else "",
+                self.agent_header(agent),
+                body,
+                self.agent_instructions(agent),
+            ]
+        )
@@ -0,0 +1,131 @@
+"""Limiters shared by the threads and event loops of a process."""
+
+import asyncio
+import threading
+import time
+from collections import deque
+
+
+class RateLimiter:
+    """Token bucket allowing `rate` calls per second, in bursts of up to `burst`.
+
+    It is shared by threads and event loops alike: `acquire` blocks the
+    calling thread, `acquire_async` only suspends the calling task.
+    """
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token, returning how many seconds to wait before using it."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.burst, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            # Going negative queues callers in arrival order
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def acquire(self):
+        time.sleep(self.reserve())
+
+    async def acquire_async(self):
+        await asyncio.sleep(self.reserve())
+
+
+class _Waiter:
+    """A thread or task waiting for a `ConcurrencyLimit` slot."""
+
+    def __init__(self, loop=None):
+        self.loop = loop
+        self.granted = False
+        self.event = None if loop else threading.Event()
+        self.future = loop.create_future() if loop else None
+
+    def wake(self):
+        if self.loop:
+            self.loop.call_soon_threadsafe(_resolve, self.future)
+        else:
+            self.event.set()
+
+
+def _resolve(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class ConcurrencyLimit:
+    """Semaphore allowing `limit` holders at once, across threads and event loops.
+
+    Slots are handed to waiters in arrival order. `acquire` blocks the
+    calling thread, `acquire_async` only suspends the calling task. Both
+    return False if no slot was free within `timeout` seconds.
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.active = 0
+        self.lock = threading.Lock()
+        self.waiters = deque()
+
+    def _enqueue(self, loop=None):
+        """Take a free slot and return None, or queue up and return the waiter."""
+        with self.lock:
+            if self.active < self.limit and not self.waiters:
+                self.active += 1
+                return None
+            waiter = _Waiter(loop)
+            self.waiters.append(waiter)
+            return waiter
+
+    def _settle(self, waiter):
+        """Whether the waiter got its slot; if not, it leaves the queue."""
+        with self.lock:
+            if not waiter.granted:
+                self.waiters.remove(waiter)
+            return waiter.granted
+
+    def acquire(self, timeout=None):
+        waiter = self._enqueue()
+        if waiter is None:
+            return True
+        waiter.event.wait(timeout)
+        return self._settle(waiter)
+
+    async def acquire_async(self, timeout=None):
+        waiter = self._enqueue(asyncio.get_running_loop())
+        if waiter is None:
+            return True
+        try:
+            await asyncio.wait_for(waiter.future, timeout)
+        except asyncio.TimeoutError:
+            pass
+        except asyncio.CancelledError:
+            if self._settle(waiter):
+                self.release()
+            raise
+        return self._settle(waiter)
+
+    def release(self):
+        with self.lock:
+            while self.waiters:
+                # The slot passes straight to the next waiter
+                waiter = self.waiters.popleft()
+                waiter.granted = True
+                try:
+                    waiter.wake()
+                    return
+                except RuntimeError:  # Its event loop is closed
+                    waiter.granted = False
+            self.active -= 1
+
+    def full(self):
+        """Whether a new holder would have to wait."""
+        with self.lock:
+            return self.active >= self.limit or bool(self.waiters)
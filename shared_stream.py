@@ -0,0 +1,59 @@
+"""One iteration of a stream of chunks, shared by any number of readers.
+
+A background thread consumes the source once. Each reader gets every chunk
+from the start, whenever it joins, and waits for chunks not produced yet.
+Readers leaving early don't stop the source, so its result is complete for
+the others (and for any cache it fills).
+"""
+
+import threading
+
+
+class SharedStream:
+    """Consumes `chunks` once on a thread, for every reader of `reader()`.
+
+    `on_done` is called on that thread once the source is exhausted or
+    failed; readers then get the remaining chunks, or the error.
+    """
+
+    def __init__(self, chunks, on_done=None):
+        self.chunks = []
+        self.done = False
+        self.error = None
+        self.condition = threading.Condition()
+        self.on_done = on_done
+        self.thread = threading.Thread(
+            target=self._consume, args=(chunks,), daemon=True
+        )
+        self.thread.start()
+
+    def _consume(self, chunks):
+        try:
+            for chunk in chunks:
+                with self.condition:
+                    self.chunks.append(chunk)
+                    self.condition.notify_all()
+        except Exception as e:
+            self.error = e
+        finally:
+            with self.condition:
+                self.done = True
+                self.condition.notify_all()
+            if self.on_done:
+                self.on_done()
+
+    def reader(self):
+        """Yield every chunk of the stream, from the first one."""
+        position = 0
+        while True:
+            with self.condition:
+                while position == len(self.chunks) and not self.done:
+                    self.condition.wait()
+                chunks = self.chunks[position:]
+                done = self.done
+            yield from chunks
+            position += len(chunks)
+            if done and position == len(self.chunks):
+                if self.error:
+                    raise self.error
+                return
@@ -0,0 +1,146 @@
+import re
+
+
+class LLMSpeakerSelector:
+    """Asks Gemini which participant should speak next."""
+
+    def choose(self, debate):
+        """Return the name of the next speaker, as answered by the model."""
+        response = debate.context_cache.generate(
+            self.prompt(debate), call_type="speaker_selection"
+        )
+        return response.text.strip()
+
+    async def choose_async(self, debate):
+        """Async version of `choose`."""
+        response = await debate.context_cache.generate_async(
+            self.prompt(debate), call_type="speaker_selection"
+        )
+        return response.text.strip()
+
+    def prompt(self, debate):
+        """Build the speaker selection prompt."""
+        # The debate topic and participants come from the shared preamble, and
+        # the transcript is bounded like the turn prompts
+        debate.prompt_builder.sync(debate.transcript)
+        prompt = f"""
+Based on the following debate transcript, determine which participant should speak next.
+Choose the participant who would most naturally continue the conversation based on:
+1. Who hasn't spoken recently
+2. Who has been directly addressed or challenged
+3. Who might have the most relevant perspective to add now
+
+Transcript:
+{debate.prompt_builder.transcript_text()}
+
+Which participant should speak next to continue the debate?
+
+Answer with ONLY the EXACT full name of the participant from this list: {", ".join([agent.name for agent in debate.agents])}
+Do not include any other text, reasoning, or formatting. Just the name.
+"""
+        return prompt
+
+
+class LocalSpeakerSelector:
+    """Chooses the next speaker locally, without any model call.
+
+    Candidates are scored on how long ago they last spoke, whether the last
+    message mentions them, and whether it asks them a direct question. The
+    moderator is brought back in every `moderator_every` turns. The last
+    speaker never speaks twice in a row, and ties go to the earlier agent.
+    """
+
+    MENTION_SCORE = 10
+    QUESTION_SCORE = 100
+
+    def __init__(self, moderator_every=5):
+        self.moderator_every = moderator_every
+        self.agents = None
+        self.reset()
+
+    def reset(self):
+        """Forget the transcript index."""
+        self.indexed_turns = 0
+        self.last_spoken = {}
+
+    def _index_agents(self, agents):
+        """Compile a name pattern per agent."""
+        self.agents = agents
+        self.reset()
+
+        # Full names, plus name parts that are unique to one agent
+        name_parts = {}
+        for agent in agents:
+            for part in re.findall(r"\w{3,}", agent.name):
+                name_parts.setdefault(part.lower(), set()).add(agent.name)
+        self.patterns = {}
+        for agent in agents:
+            aliases = [agent.name] + [
+                part
+                for part in re.findall(r"\w{3,}", agent.name)
+                if name_parts[part.lower()] == {agent.name}
+            ]
+            self.patterns[agent.name] = re.compile(
+                r"\b(?:" + "|".join(re.escape(alias) for alias in aliases) + r")\b",
+                re.IGNORECASE,
+            )
+
+    def sync(self, transcript):
+        """Index the transcript entries added since the last call."""
+        if len(transcript) < self.indexed_turns:
+            self.reset()
+        for turn in range(self.indexed_turns, len(transcript)):
+            self.last_spoken[transcript[turn]["speaker"]] = turn
+        self.indexed_turns = len(transcript)
+
+    def choose(self, debate):
+        """Return the name of the next speaker."""
+        if self.agents is not debate.agents:
+            self._index_agents(debate.agents)
+        self.sync(debate.transcript)
+
+        if not debate.transcript:
+            return debate.agents[0].name
+        last_entry = debate.transcript[-1]
+        last_speaker = last_entry["speaker"]
+        current_turn = len(debate.transcript)
+        candidates = [a for a in debate.agents if a.name != last_speaker]
+        if not candidates:
+            return last_speaker
+
+        # Moderator re-entry cadence
+        for agent in candidates:
+            if agent.is_moderator:
+                since = current_turn - 1 - self.last_spoken.get(agent.name, -1)
+                if since >= self.moderator_every:
+                    return agent.name
+
+        # Mentions and direct questions in the last message
+        sentences = re.split(r"(?<=[.!?])\s+", last_entry["message"])
+        scores = {}
+        for agent in candidates:
+            # Turns since this agent last spoke (never spoken counts as longest)
+            score = current_turn - self.last_spoken.get(agent.name, -current_turn)
+            pattern = self.patterns[agent.name]
+            for sentence in sentences:
+                if pattern.search(sentence):
+                    if sentence.rstrip().endswith("?"):
+                        score += self.QUESTION_SCORE
+                    else:
+                        score += self.MENTION_SCORE
+            scores[agent.name] = score
+
+        return max(candidates, key=lambda a: scores[a.name]).name
+
+    async def choose_async(self, debate):
+        """Same as `choose`, which never waits on I/O."""
+        return self.choose(debate)
+
+
+def create_speaker_selector(strategy, moderator_every=5):
+    """Create a speaker selector from its config name ("llm" or "local")."""
+    if strategy == "llm":
+        return LLMSpeakerSelector()
+    if strategy == "local":
+        return LocalSpeakerSelector(moderator_every=moderator_every)
+    raise ValueError(f"Unknown speaker selection strategy: {strategy}")
@@ -1,11 +1,18 @@
 import streamlit as st
 import os
 import json
-import time
-from io import BytesIO
-from pydub import AudioSegment
+import tempfile
+import uuid
 
+import mp3
 from debate import Debate
+from debate_log import attach_log, load_debate, log_path
+from example_catalog import get_catalog
+from pacing import PacingScheduler
+from turn_pipeline import TurnPipeline
+
+# Debates are logged here, if set, and restored from the URL when the session is lost
+LOG_DIR = os.getenv("DEBATE_LOG_DIR")
 
 
 # # # # # # # # # # # # #
@@ -13,16 +20,6 @@ from debate import Debate
 # # # # # # # # # # # # #
 
 
-def load_debate_examples():
-    debate_examples = []
-    for filename in os.listdir("debate_examples"):
-        with open(os.path.join("debate_examples", filename), "r") as f:
-            config = json.load(f)
-            debate_examples.append(config)
-    debate_examples.sort(key=lambda x: x["title"])
-    return debate_examples
-
-
 def init_session_state():
     """Initialize all session state variables in one place for better organization."""
 
@@ -43,9 +40,6 @@ def init_session_state():
     if "error_message" not in st.session_state:
         st.session_state.error_message = None
 
-    if "debate_examples" not in st.session_state:
-        st.session_state.debate_examples = load_debate_examples()
-
     if "create_expander" not in st.session_state:
         st.session_state.create_expander = True
 
@@ -70,8 +64,11 @@ def init_session_state():
     if "audio_segments" not in st.session_state:
         st.session_state.audio_segments = []
 
-    if "next_turn_time" not in st.session_state:
-        st.session_state.next_turn_time = 0
+    if "pacing" not in st.session_state:
+        st.session_state.pacing = None
+
+    if "turn_pipeline" not in st.session_state:
+        st.session_state.turn_pipeline = None
 
 
 def load_config_into_form(config):
@@ -88,8 +85,33 @@ def load_config_into_form(config):
     st.session_state.config_to_load = config
 
 
+def snapshot(state):
+    """Copy a debate state, so its transcript doesn't grow with turns generated ahead."""
+    return {**state, "transcript": list(state["transcript"])}
+
+
+def restore_debate():
+    """Rebuild the debate named in the URL from its log, without model calls."""
+    path = log_path(LOG_DIR, st.query_params.get("debate"))
+    if st.session_state.debate or not path or not os.path.exists(path):
+        return
+    debate = load_debate(path)
+    st.session_state.debate = debate
+    st.session_state.debate_config = debate.config
+    st.session_state.debate_state = snapshot(debate.get_state())
+    st.session_state.turn_pipeline = TurnPipeline(
+        debate, synthesize=debate.config.get("enable_voice", False)
+    )
+    st.session_state.pacing = PacingScheduler(debate.pacing_policy)
+    # Turns heard before the session was lost aren't played again
+    st.session_state.audio_segments = [None] * len(debate.transcript)
+    st.session_state.create_expander = False
+    st.session_state.examples_expander = False
+
+
 # Initialize session variables
 init_session_state()
+restore_debate()
 
 # Title and subtitle
 st.set_page_config(page_title="Debate AI", layout="wide")
@@ -245,9 +267,10 @@ with col2:
         "Select a debate example", expanded=st.session_state.examples_expander
     ):
         st.markdown("### Select from examples:")
-        examples = st.session_state.debate_examples
+        # Shared by all sessions, and only re-read when example files change
+        examples = get_catalog().titles()
         options_list = ["Select a debate to load..."] + [
-            config["title"] for config in examples
+            example["title"] for example in examples
         ]
 
         selected_example = st.selectbox(
@@ -258,8 +281,9 @@ with col2:
         )
 
         if selected_example != "Select a debate to load...":
-            selected_config = examples[options_list[1:].index(selected_example)]
-            if (
+            example = examples[options_list[1:].index(selected_example)]
+            selected_config = get_catalog().get(example["filename"])
+            if selected_config and (
                 not st.session_state.config_to_load
                 or selected_config["title"] != st.session_state.config_to_load["title"]
             ):
@@ -292,6 +316,29 @@ st.markdown('<div id="debate-section"></div>', unsafe_allow_html=True)
 st.markdown("--- ")  # Add a separator before the active debate
 
 
+def export_podcast(audio_segments):
+    """Joins the turns' MP3 clips into a podcast file and returns its path."""
+    with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as f:
+        try:
+            clips = (turn_audio["audio"] for turn_audio in audio_segments if turn_audio)
+            mp3.write(clips, f)
+        except ValueError:
+            f.close()
+            os.remove(f.name)
+            raise
+    return f.name
+
+
+@st.fragment(run_every=0.5)
+def wait_for_next_turn():
+    """Rerun the app once the next turn is generated and due, without blocking the script."""
+    if (
+        not st.session_state.pacing.remaining()
+        and st.session_state.turn_pipeline.has_turn()
+    ):
+        st.rerun()
+
+
 def auto_scroll_to_debate():
     st.components.v1.html(
         """
@@ -315,9 +362,17 @@ if config:
     # Create debate object
     if not st.session_state.debate:
         debate = Debate(config)
+        if LOG_DIR:
+            debate_id = uuid.uuid4().hex
+            attach_log(debate, log_path(LOG_DIR, debate_id))
+            st.query_params["debate"] = debate_id
         st.session_state.debate = debate
+        st.session_state.turn_pipeline = TurnPipeline(
+            debate, synthesize=config.get("enable_voice", False)
+        )
+        st.session_state.pacing = PacingScheduler(debate.pacing_policy)
         debate.start()
-        state = debate.get_state()
+        state = snapshot(debate.get_state())
         st.session_state.debate_state = state
     else:
         # Use existing debate object
@@ -336,17 +391,32 @@ if config:
         if state.get("is_running"):
             if st.button("⏹️ Stop Debate", use_container_width=True):
                 debate.stop()
-                st.session_state.debate_state = debate.get_state()
+                # Turns generated ahead are kept and released on resume
+                st.session_state.debate_state = snapshot({**state, "is_running": False})
                 st.rerun()
         elif not state.get("is_finished"):
             if st.button("▶️ Resume Debate", type="primary", use_container_width=True):
                 debate.start()  # Resumes the debate
-                st.session_state.debate_state = debate.get_state()
+                st.session_state.debate_state = snapshot({**state, "is_running": True})
+                st.rerun()
+
+    # Skip the rest of the current turn
+    with col2:
+        if state.get("is_running") and state.get("current_turn"):
+            if st.button("⏭️ Next Turn", use_container_width=True):
+                st.session_state.pacing.ack(state["current_turn"])
                 st.rerun()
 
     # Reset & choose new debate button
     with col3:
         if st.button("🔄 Reset & Choose New", use_container_width=True):
+            st.session_state.turn_pipeline.cancel()
+            st.session_state.turn_pipeline = None
+            st.session_state.pacing = None
+            debate.close()
+            if debate.log:
+                os.remove(debate.log.path)
+                st.query_params.pop("debate", None)
             st.session_state.debate = None
             st.session_state.debate_state = {}
             st.session_state.debate_config = None
@@ -392,19 +462,19 @@ if config:
     # Transcript
     st.subheader("Transcript")
     transcript_container = st.container(height=500)
-    if state.get("transcript"):
+    # Only turns released by the pacing, each with its audio segment
+    released = state.get("transcript", [])[: len(st.session_state.audio_segments)]
+    if released:
         with transcript_container:
-            for i, entry in enumerate(state["transcript"]):
+            for i, entry in enumerate(released):
                 if st.session_state.debate_config.get("enable_voice", False):
                     with st.chat_message(name=entry["speaker"]):
                         st.markdown(entry["message"])
-                        audio_bytes = st.session_state.audio_segments[i]
-                        st.audio(audio_bytes, format="audio/mp3", autoplay=True)
-                        audio_segment = AudioSegment.from_file(
-                            BytesIO(audio_bytes), format="mp3"
-                        )
-                        audio_duration = len(audio_segment) / 1000.0
-                        st.session_state.next_turn_time = time.time() + audio_duration
+                        turn_audio = st.session_state.audio_segments[i]
+                        if turn_audio:
+                            st.audio(
+                                turn_audio["audio"], format="audio/mp3", autoplay=True
+                            )
                 else:
                     with st.chat_message(name=entry["speaker"]):
                         st.markdown(entry["message"])
@@ -415,34 +485,39 @@ if config:
 
     # Flow
     if debate and state.get("is_running") and not state.get("is_finished"):
-        new_entry = debate.run_next_turn()
-
-        # Synthesize audio if enabled and a new entry was generated
-        if st.session_state.debate_config.get("enable_voice", False) and new_entry:
+        # Turns (and their audio) are generated ahead by the pipeline, and
+        # released once the pacing policy says the last one was heard or read
+        pipeline = st.session_state.turn_pipeline
+        pacing = st.session_state.pacing
+        pipeline.start()
+        if pacing.remaining() or not pipeline.has_turn():
+            wait_for_next_turn()
+        else:
             try:
-                audio_bytes = debate.synthesize_speech(
-                    agent_name=new_entry["speaker"],
-                    language=debate.language,
-                    text=new_entry["message"],
-                )
-                st.session_state.audio_segments.append(audio_bytes)
-
+                turn = pipeline.next_turn()
             except Exception as e:
-                st.error(f"Failed to synthesize speech: {e}")
-                st.session_state.audio_segments.append(None)
-
-        elif new_entry:  # if voice is disabled
-            st.session_state.audio_segments.append(None)
-
-        if not debate.debate_finished:
-            debate.update_next_speaker()
-        st.session_state.debate_state = debate.get_state()
-
-        # Wait for the next turn to play
-        current_time = time.time()
-        if st.session_state.next_turn_time > current_time:
-            time.sleep(st.session_state.next_turn_time - current_time)
-        st.rerun()
+                st.error(f"Failed to generate the next turn: {e}")
+                debate.stop()
+                turn = None
+
+            if turn:
+                turn_audio = None
+                if turn["audio"]:
+                    try:
+                        turn_audio = turn["audio"].result()
+                    except Exception as e:
+                        st.error(f"Failed to synthesize speech: {e}")
+                st.session_state.audio_segments.append(turn_audio)
+                st.session_state.debate_state = turn["state"]
+                pacing.released(
+                    turn["state"]["current_turn"],
+                    turn["entry"],
+                    turn_audio["duration"] if turn_audio else None,
+                )
+            else:
+                # Nothing left to release: the debate stopped or ended
+                st.session_state.debate_state = snapshot(debate.get_state())
+            st.rerun()
 
     # Export options
     st.markdown("---")
@@ -475,25 +550,28 @@ if config:
             use_container_width=True,
         )
 
-    # Export podcast
+    # Export podcast, only on request: the clips' MP3 frames are joined without decoding
     with export_cols[2]:
         if st.session_state.debate_config.get("enable_voice", False):
-            combined = AudioSegment.empty()
-            for audio_bytes in st.session_state.audio_segments:
-                if audio_bytes:
-                    segment = AudioSegment.from_file(BytesIO(audio_bytes), format="mp3")
-                    combined += segment
-
-            # Convert to bytes for download
-            buffer = BytesIO()
-            combined.export(buffer, format="mp3")
-            buffer.seek(0)
-
-            st.download_button(
-                label="Export Podcast 🎧",
-                data=buffer,
-                file_name="podcast.mp3",
-                mime="audio/mp3",
-                key="download_podcast",
-                use_container_width=True,
-            )
+            # The download button replaces the export button until the next rerun
+            podcast_slot = st.empty()
+            if podcast_slot.button("Export Podcast 🎧", use_container_width=True):
+                try:
+                    path = export_podcast(st.session_state.audio_segments)
+                except ValueError as e:
+                    st.error(f"Failed to export the podcast: {e}")
+                else:
+                    # Streamlit serves its own copy, so the file isn't needed afterwards
+                    try:
+                        with open(path, "rb") as f:
+                            podcast_slot.download_button(
+                                label="Download Podcast 🎧",
+                                data=f,
+                                file_name="podcast.mp3",
+                                mime="audio/mp3",
+                                key="download_podcast",
+                                on_click="ignore",
+                                use_container_width=True,
+                            )
+                    finally:
+                        os.remove(path)
@@ -0,0 +1,54 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+# Tests never touch the on-disk audio cache
+os.environ["DEBATE_AUDIO_CACHE_MB"] = "0"
+
+import debate  # noqa: E402
+from fakes import FakeGenaiClient, FakeTTSClient  # noqa: E402
+
+CONFIG = {
+    "title": "Should cities ban cars from their centres?",
+    "description": "Urban planners, residents and shop owners debate car-free city centres.",
+    "agents": [
+        {
+            "name": "Moderator",
+            "role": "Debate Moderator",
+            "persona": "Keeps the debate focused and fair.",
+            "is_moderator": True,
+        },
+        {
+            "name": "Alice Martin",
+            "role": "Urban Planner",
+            "persona": "Argues for pedestrian zones and public transport.",
+        },
+        {
+            "name": "Bob Stone",
+            "role": "Shop Owner",
+            "persona": "Worries that customers won't come without parking.",
+        },
+    ],
+    "max_turns": 3,
+    "speaker_selection": "local",
+}
+
+
+@pytest.fixture
+def fake_clients(monkeypatch):
+    """Make debates created without clients use fake Gemini and TTS clients."""
+    client = FakeGenaiClient()
+    tts_client = FakeTTSClient()
+    monkeypatch.setattr(debate, "get_genai_client", lambda: client)
+    monkeypatch.setattr(debate, "get_tts_client", lambda: tts_client)
+    return client, tts_client
+
+
+@pytest.fixture
+def config():
+    return {**CONFIG, "agents": [dict(agent) for agent in CONFIG["agents"]]}
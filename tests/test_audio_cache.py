@@ -0,0 +1,26 @@
+import os
+
+import mp3
+import ogg
+from audio_cache import AudioCache
+from debate import Debate
+from fakes import FakeGenaiClient, FakeTTSClient
+
+
+def test_mp3_and_ogg_renders_cached_apart(config, tmp_path):
+    config["enable_voice"] = True
+    debate = Debate(config=config, client=FakeGenaiClient(), tts_client=FakeTTSClient())
+    debate.audio_cache = AudioCache(str(tmp_path), 1024 * 1024)
+    text = "Hello " * 40
+
+    for _ in range(2):
+        clip = debate.synthesize_speech("Alice Martin", "English", text)
+        stream = b"".join(debate.stream_speech("Alice Martin", "English", text))
+        assert mp3.duration(clip) > 0
+        assert ogg.duration(stream) > 0
+
+    files = sorted(
+        os.path.splitext(name)[1] for _, _, names in os.walk(tmp_path) for name in names
+    )
+    assert files == [".mp3", ".ogg"]
+    assert debate.audio_cache.get_stats()["hits"] == 2
@@ -0,0 +1,32 @@
+import asyncio
+import io
+from types import SimpleNamespace
+
+import batch
+from fakes import Distribution, FakeGenaiClient
+
+
+class TimingOutClient(FakeGenaiClient):
+    """Fails every call like a model call past its deadline."""
+
+    def respond(self, contents, config):
+        raise TimeoutError("Deadline exceeded calling the model.")
+
+
+def run(client, timeout, config):
+    args = SimpleNamespace(model=None, audio_dir=None, timeout=timeout)
+    job = {"id": "0", "path": "test.json", "config": config}
+    return asyncio.run(
+        batch.run_debate(job, args, client, asyncio.Semaphore(1), io.StringIO())
+    )
+
+
+def test_call_timeout_is_an_error(config):
+    result = run(TimingOutClient(), 10, config)
+    assert result["status"] == "error"
+    assert "Deadline exceeded" in result["error"]
+
+
+def test_debate_timeout(config):
+    result = run(FakeGenaiClient(latency=Distribution(1.0)), 0.2, config)
+    assert result["status"] == "timeout"
@@ -0,0 +1,100 @@
+import asyncio
+import time
+
+from async_debate import AsyncDebate
+from debate import Debate
+from debate_registry import AsyncDebateSession, DebateSession
+from fakes import Distribution, FakeGenaiClient, FakeTTSClient
+
+
+def model_calls(client):
+    return sum(len(sizes) for sizes in client.prompt_chars.values())
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def create_session(config, viewer_grace):
+    config.update(
+        pacing="fixed", pacing_delay=0, max_turns=1000, context_recent_turns=0
+    )
+    client = FakeGenaiClient(latency=Distribution(0.01))
+    debate = Debate(config=config, client=client, tts_client=FakeTTSClient())
+    session = DebateSession("debate", debate)
+    session.broadcaster.viewer_grace = viewer_grace
+    return session, client
+
+
+def test_no_turns_without_subscribers(config):
+    session, client = create_session(config, viewer_grace=0)
+    calls = model_calls(client)
+    session.debate.start()
+    session.broadcaster.start()
+    time.sleep(0.3)
+    assert session.debate.current_turn == 0
+    assert model_calls(client) == calls
+    session.close()
+
+
+def wait_until_paused(session, client, timeout=5):
+    """Wait until no turn or model call happens for a while; a call already
+    in flight may still complete."""
+    deadline = time.monotonic() + timeout
+    while True:
+        turn = session.debate.current_turn
+        calls = model_calls(client)
+        time.sleep(0.3)
+        if session.debate.current_turn == turn and model_calls(client) == calls:
+            break
+        assert time.monotonic() < deadline, "The debate kept going without viewers"
+    assert session.debate.debate_running
+
+
+def test_pauses_after_grace_and_resumes_on_subscribe(config):
+    session, client = create_session(config, viewer_grace=0.2)
+    session.debate.start()
+    session.broadcaster.start()
+    time.sleep(0.4)
+    wait_until_paused(session, client)
+
+    subscriber = session.broadcaster.subscribe()
+    turn = session.debate.current_turn
+    wait_until(lambda: session.debate.current_turn >= turn + 2)
+    session.broadcaster.unsubscribe(subscriber)
+    time.sleep(0.4)
+    wait_until_paused(session, client)
+    session.close()
+
+
+def test_async_no_turns_without_subscribers(config):
+    config.update(pacing="fixed", pacing_delay=0)
+    client = FakeGenaiClient()
+
+    async def run():
+        debate = await AsyncDebate.create(
+            config=config, client=client, tts_client=FakeTTSClient()
+        )
+        session = AsyncDebateSession("debate", debate)
+        session.broadcaster.viewer_grace = 0
+        calls = model_calls(client)
+        debate.start()
+        session.broadcaster.start()
+        await asyncio.sleep(0.3)
+        assert debate.current_turn == 0
+        assert model_calls(client) == calls
+
+        subscriber = session.broadcaster.subscribe()
+        for _ in range(100):
+            if debate.current_turn:
+                break
+            await asyncio.sleep(0.01)
+        assert debate.current_turn
+        session.broadcaster.unsubscribe(subscriber)
+        session.close()
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
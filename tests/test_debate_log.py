@@ -0,0 +1,61 @@
+import asyncio
+import os
+import threading
+
+import debate_log
+from async_debate import AsyncDebate
+from debate import Debate
+from debate_log import attach_log, load_debate, read_records
+from fakes import FakeGenaiClient, FakeTTSClient
+
+
+def record_fsyncs(monkeypatch):
+    """Record the thread of every fsync made by debate logs."""
+    threads = []
+    fsync = os.fsync
+
+    def recording_fsync(fd):
+        threads.append(threading.get_ident())
+        fsync(fd)
+
+    monkeypatch.setattr(debate_log.os, "fsync", recording_fsync)
+    return threads
+
+
+def test_log_is_written_by_the_caller(monkeypatch, tmp_path, config):
+    threads = record_fsyncs(monkeypatch)
+    debate = Debate(config=config, client=FakeGenaiClient())
+    path = str(tmp_path / "debate.jsonl")
+    attach_log(debate, path)
+    debate.start()
+    debate.run_next_turn()
+    # On disk as soon as the turn is recorded
+    assert [r["type"] for r in read_records(path)][-1] == "turn_appended"
+    assert set(threads) == {threading.get_ident()}
+    debate.close()
+
+
+def test_async_log_is_written_off_the_event_loop(monkeypatch, tmp_path, config):
+    threads = record_fsyncs(monkeypatch)
+    path = str(tmp_path / "debate.jsonl")
+
+    async def run():
+        debate = await AsyncDebate.create(
+            config=config, client=FakeGenaiClient(), tts_client=FakeTTSClient()
+        )
+        attach_log(debate, path)
+        debate.start()
+        await debate.run_next_turn()
+        await debate.update_next_speaker()
+        await debate.close()
+        return debate
+
+    debate = asyncio.run(run())
+    assert threads
+    assert threading.get_ident() not in threads
+
+    restored = load_debate(
+        path, debate_class=Debate, resume_logging=False, client=FakeGenaiClient()
+    )
+    assert restored.transcript == debate.transcript
+    assert restored.next_speaker.name == debate.next_speaker.name
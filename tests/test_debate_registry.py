@@ -0,0 +1,48 @@
+import threading
+import time
+
+import app
+from debate import Debate
+from debate_registry import DebateRegistry
+from fakes import FakeGenaiClient
+
+
+def test_idle_debates_evicted_on_lookup(config):
+    registry = DebateRegistry(idle_timeout=0.1, evict_interval=0)
+    idle = registry.create(Debate(config=config, client=FakeGenaiClient()))
+    time.sleep(0.2)
+    # Looking up another debate evicts the idle one
+    assert registry.get("unknown") is None
+    assert idle.id not in registry.sessions
+
+
+def test_reserved_runs_count_against_the_limit(config):
+    registry = DebateRegistry(max_running=1)
+    assert registry.reserve_run()
+    assert not registry.reserve_run()
+    registry.release_run()
+    assert registry.reserve_run()
+
+
+def test_concurrent_starts_respect_the_limit(config, fake_clients, monkeypatch):
+    class SlowDebate(Debate):
+        def __init__(self, **kwargs):
+            time.sleep(0.2)
+            super().__init__(**kwargs)
+
+    monkeypatch.setattr(app, "Debate", SlowDebate)
+    monkeypatch.setattr(app, "registry", DebateRegistry(max_running=1))
+    statuses = []
+
+    def start():
+        response = app.app.test_client().post("/start", json={"config": config})
+        statuses.append(response.status_code)
+
+    threads = [threading.Thread(target=start) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(statuses) == [200, 429]
+    for session in app.registry.list_sessions():
+        app.registry.remove(session.id)
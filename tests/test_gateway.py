@@ -0,0 +1,118 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+import gateway as gateway_module
+from context_cache import ContextCache
+from fakes import FakeGenaiClient
+from gateway import CACHE_MODEL, Gateway, GatewayClient, is_retryable
+
+
+class APIError(Exception):
+    def __init__(self, code):
+        super().__init__(f"HTTP {code}")
+        self.code = code
+
+
+def failing(errors, result="ok"):
+    """Return a function raising `errors` in turn, then returning `result`."""
+    errors = list(errors)
+
+    def function():
+        if errors:
+            raise errors.pop(0)
+        return result
+
+    return function
+
+
+def test_retryable_errors():
+    assert is_retryable(ConnectionError())
+    assert is_retryable(TimeoutError())
+    assert is_retryable(httpx.ConnectError("refused"))
+    assert is_retryable(APIError(429))
+    assert is_retryable(APIError(503))
+    assert not is_retryable(APIError(400))
+    assert not is_retryable(ValueError())
+
+
+def test_retries_transient_failures(monkeypatch):
+    monkeypatch.setattr(gateway_module, "BACKOFF", 0.01)
+    gateway = Gateway(max_retries=3)
+    function = failing([ConnectionError(), APIError(503)])
+    assert gateway.call("model", function) == "ok"
+    counters = gateway.get_stats()["by_model"]["model"]
+    assert counters["calls"] == 3
+    assert counters["retries"] == 2
+    assert counters["failures"] == 0
+
+
+def test_gives_up_after_max_retries(monkeypatch):
+    monkeypatch.setattr(gateway_module, "BACKOFF", 0.01)
+    gateway = Gateway(max_retries=1)
+    with pytest.raises(ConnectionError):
+        gateway.call("model", failing([ConnectionError()] * 3))
+    assert gateway.get_stats()["by_model"]["model"]["calls"] == 2
+
+
+def test_does_not_retry_other_errors():
+    gateway = Gateway()
+    with pytest.raises(APIError):
+        gateway.call("model", failing([APIError(400)]))
+    counters = gateway.get_stats()["by_model"]["model"]
+    assert counters["calls"] == 1
+    assert counters["failures"] == 1
+
+
+def test_no_retry_past_deadline():
+    # The first retry would wait at least BACKOFF / 2 seconds
+    gateway = Gateway(deadline=gateway_module.BACKOFF / 4)
+    start = time.monotonic()
+    with pytest.raises(ConnectionError):
+        gateway.call("model", failing([ConnectionError()]))
+    assert time.monotonic() - start < gateway_module.BACKOFF / 4
+    assert gateway.get_stats()["by_model"]["model"]["deadline_exceeded"] == 1
+
+
+def test_async_call_deadline():
+    gateway = Gateway(deadline=0.1, max_retries=0)
+
+    async def slow():
+        await asyncio.sleep(5)
+
+    start = time.monotonic()
+    with pytest.raises(TimeoutError):
+        asyncio.run(gateway.call_async("model", slow))
+    assert time.monotonic() - start < 1
+
+
+def test_rate_limit_spaces_calls():
+    gateway = Gateway(calls_per_minute=600, model_calls_per_minute={"tts": 0})
+    start = time.monotonic()
+    for _ in range(3):
+        gateway.call("model", lambda: None)
+    assert time.monotonic() - start == pytest.approx(0.2, abs=0.05)
+    assert gateway.get_stats()["by_model"]["model"]["throttled"] == 2
+
+    # Models with a rate of 0 are unlimited
+    start = time.monotonic()
+    for _ in range(3):
+        gateway.call("tts", lambda: None)
+    assert time.monotonic() - start < 0.05
+
+
+def test_cache_management_goes_through_gateway():
+    gateway = Gateway()
+    client = GatewayClient(FakeGenaiClient(), gateway)
+    cache = ContextCache(client, "model", "preamble " * 100)
+    assert cache.create(min_tokens=0)
+    cache.delete()
+
+    async def create_and_delete():
+        assert await cache.create_async(min_tokens=0)
+        await cache.delete_async()
+
+    asyncio.run(create_and_delete())
+    assert gateway.get_stats()["by_model"][CACHE_MODEL]["calls"] == 4
@@ -0,0 +1,45 @@
+import glob
+import json
+
+from check_language_detection import SAMPLES
+from language_detection import MIN_CONFIDENCE, debate_texts, detect_language
+
+
+def test_english():
+    language, confidence = detect_language(
+        "Should the city close its center to cars? We think that it would be good "
+        "for the people who live there, and for the air they breathe."
+    )
+    assert language == "English"
+    assert confidence >= MIN_CONFIDENCE
+
+
+def test_french():
+    language, confidence = detect_language(
+        "Faut-il fermer le centre-ville aux voitures ? Nous pensons que ce serait "
+        "une bonne chose pour les habitants et pour la qualité de l'air."
+    )
+    assert language == "French"
+    assert confidence >= MIN_CONFIDENCE
+
+
+def test_other_language():
+    language, _ = detect_language(
+        "Sollte die Stadt das Zentrum für Autos sperren? Wir denken, dass es für die "
+        "Menschen, die dort wohnen, und für die Luft gut wäre."
+    )
+    assert language == "Other"
+
+
+def test_too_little_evidence():
+    assert detect_language("Carbon tax") == ("English", 0.0)
+
+
+def test_bundled_examples_and_translations():
+    for expected, pattern in SAMPLES:
+        for path in glob.glob(pattern):
+            with open(path, encoding="utf-8") as f:
+                config = json.load(f)
+            language, confidence = detect_language(debate_texts(config))
+            assert language == expected, path
+            assert confidence >= MIN_CONFIDENCE, path
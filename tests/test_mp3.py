@@ -0,0 +1,37 @@
+import io
+
+import pytest
+
+import mp3
+from fakes import MP3_FRAME, MP3_FRAME_SECONDS
+
+ID3_TAG = b"ID3" + bytes([4, 0, 0, 0, 0, 0, 10]) + bytes(10)
+
+# The first frame of a clip, holding metadata about the clip instead of audio
+INFO_FRAME = MP3_FRAME[:13] + b"Info" + MP3_FRAME[17:]
+
+# An MPEG 1 frame: 44.1 kHz, mono, 128 kbps
+MPEG1_FRAME = bytes([0xFF, 0xFB, 0x90, 0xC0]) + bytes(413)
+
+
+def test_duration():
+    assert mp3.duration(MP3_FRAME * 10) == pytest.approx(10 * MP3_FRAME_SECONDS)
+    assert mp3.duration(b"") == 0
+
+
+def test_duration_skips_tag_info_frame_and_junk():
+    clip = ID3_TAG + INFO_FRAME + MP3_FRAME * 3 + b"junk" + MP3_FRAME
+    assert mp3.duration(clip) == pytest.approx(4 * MP3_FRAME_SECONDS)
+
+
+def test_write_joins_audio_frames_only():
+    file = io.BytesIO()
+    mp3.write(
+        [ID3_TAG + INFO_FRAME + MP3_FRAME * 2, None, INFO_FRAME + MP3_FRAME], file
+    )
+    assert file.getvalue() == MP3_FRAME * 3
+
+
+def test_write_rejects_different_formats():
+    with pytest.raises(ValueError):
+        mp3.write([MP3_FRAME, MPEG1_FRAME], io.BytesIO())
@@ -0,0 +1,27 @@
+import ogg
+from fakes import OPUS_HEAD, ogg_page
+
+# The fake OpusHead declares a pre-skip of 312 samples
+PRE_SKIP = 312
+
+
+def test_duration_subtracts_pre_skip():
+    data = OPUS_HEAD + ogg_page(48000 + PRE_SKIP, b"audio", 1)
+    assert ogg.duration(data) == 1.0
+
+
+def test_duration_of_last_complete_page():
+    data = (
+        OPUS_HEAD
+        + ogg_page(24000 + PRE_SKIP, bytes(300), 1)
+        + ogg_page(48000 + PRE_SKIP, bytes(300), 2)
+    )
+    # The second page is cut short
+    assert ogg.duration(data[:-10]) == 0.5
+    assert ogg.duration(OPUS_HEAD[:10]) == 0.0
+
+
+def test_pages_resynchronize_after_junk():
+    data = OPUS_HEAD + b"junk" + ogg_page(96000 + PRE_SKIP, b"audio", 1)
+    assert [payload for _, payload in ogg.pages(data)][1] == b"audio"
+    assert ogg.duration(data) == 2.0
@@ -0,0 +1,56 @@
+from types import SimpleNamespace
+
+from prompt_builder import PromptBuilder
+
+AGENTS = [
+    SimpleNamespace(name="Moderator", role="Host", persona="", is_moderator=True),
+    SimpleNamespace(
+        name="Alice", role="Economist", persona="Costs first.", is_moderator=False
+    ),
+]
+
+
+def create_builder(turns, **kwargs):
+    builder = PromptBuilder("Topic", "Description", AGENTS, "English", **kwargs)
+    builder.sync([{"speaker": "Alice", "message": f"Turn {i}"} for i in range(turns)])
+    return builder
+
+
+def test_preamble_lists_personas():
+    builder = create_builder(0)
+    assert "- Alice (Economist): Costs first." in builder.preamble
+    assert "- Moderator (Host)\n" in builder.preamble
+
+
+def test_fold_replaces_old_turns_with_summary():
+    builder = create_builder(5, recent_turns=2)
+    job = builder.pending_summary()
+    assert job["text"] == "Alice: Turn 0\nAlice: Turn 1\nAlice: Turn 2\n"
+    assert builder.fold(job, "Alice talked.")
+    assert builder.transcript_text() == (
+        "(Summary of the first 3 turns: Alice talked.)\n"
+        "Alice: Turn 3\nAlice: Turn 4\n"
+    )
+    assert builder.pending_summary() is None
+
+
+def test_fold_ignored_after_reset():
+    builder = create_builder(5, recent_turns=2)
+    job = builder.pending_summary()
+    builder.sync([])
+    assert not builder.fold(job, "Alice talked.")
+    assert builder.summarized == 0
+
+
+def test_token_budget_keeps_latest_turns():
+    # Each entry is 14 characters, and 10 tokens are 40 characters
+    builder = create_builder(5, token_budget=10)
+    assert builder.transcript_text() == (
+        "(3 earlier turns omitted)\nAlice: Turn 3\nAlice: Turn 4\n"
+    )
+
+
+def test_token_budget_keeps_last_turn_whatever_its_size():
+    builder = create_builder(0, token_budget=1)
+    builder.append({"speaker": "Alice", "message": "Long " * 100})
+    assert builder.transcript_text().startswith("Alice: Long")
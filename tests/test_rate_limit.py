@@ -0,0 +1,40 @@
+import threading
+import time
+
+import pytest
+
+from rate_limit import ConcurrencyLimit, RateLimiter
+
+
+def test_burst_then_spaced_in_arrival_order():
+    limiter = RateLimiter(rate=10, burst=2)
+    delays = [limiter.reserve() for _ in range(4)]
+    assert delays[:2] == [0.0, 0.0]
+    assert delays[2] == pytest.approx(0.1, abs=0.01)
+    assert delays[3] == pytest.approx(0.2, abs=0.01)
+
+
+def test_tokens_refill_up_to_burst():
+    limiter = RateLimiter(rate=20, burst=1)
+    assert limiter.reserve() == 0.0
+    time.sleep(0.1)
+    # A token came back, but only one is kept
+    assert limiter.reserve() == 0.0
+    assert limiter.reserve() == pytest.approx(0.05, abs=0.01)
+
+
+def test_concurrency_limit_hands_slot_to_waiter():
+    limit = ConcurrencyLimit(1)
+    assert limit.acquire()
+    assert limit.full()
+    assert not limit.acquire(timeout=0.05)
+
+    acquired = []
+    waiter = threading.Thread(target=lambda: acquired.append(limit.acquire(timeout=5)))
+    waiter.start()
+    time.sleep(0.05)
+    limit.release()
+    waiter.join()
+    assert acquired == [True]
+    limit.release()
+    assert not limit.full()
@@ -0,0 +1,66 @@
+from types import SimpleNamespace
+
+from speaker_selection import LocalSpeakerSelector
+
+AGENTS = [
+    SimpleNamespace(name="Moderator", is_moderator=True),
+    SimpleNamespace(name="Alice Martin", is_moderator=False),
+    SimpleNamespace(name="Bob Stone", is_moderator=False),
+    SimpleNamespace(name="Carol Wu", is_moderator=False),
+]
+
+
+def choose(*turns, moderator_every=5):
+    transcript = [
+        {"speaker": speaker, "message": message} for speaker, message in turns
+    ]
+    debate = SimpleNamespace(agents=AGENTS, transcript=transcript)
+    return LocalSpeakerSelector(moderator_every=moderator_every).choose(debate)
+
+
+def test_first_speaker_is_first_agent():
+    assert choose() == "Moderator"
+
+
+def test_longest_silent_speaks():
+    assert (
+        choose(
+            ("Moderator", "Welcome."),
+            ("Alice Martin", "Taxes."),
+            ("Bob Stone", "Roads."),
+        )
+        == "Carol Wu"
+    )
+
+
+def test_mention_by_unique_name_part():
+    assert choose(("Moderator", "Welcome."), ("Carol Wu", "I agree with Bob.")) == (
+        "Bob Stone"
+    )
+
+
+def test_direct_question_beats_mention():
+    assert (
+        choose(
+            ("Moderator", "Welcome."),
+            ("Carol Wu", "Alice made a point. But what do you think, Bob?"),
+        )
+        == "Bob Stone"
+    )
+
+
+def test_last_speaker_never_speaks_twice():
+    assert choose(("Moderator", "Welcome."), ("Bob Stone", "Am I right, Bob?")) != (
+        "Bob Stone"
+    )
+
+
+def test_moderator_comes_back():
+    turns = [
+        ("Moderator", "Welcome."),
+        ("Alice Martin", "Taxes."),
+        ("Bob Stone", "Roads, Alice?"),
+        ("Alice Martin", "Yes, Bob?"),
+    ]
+    assert choose(*turns, moderator_every=5) == "Bob Stone"
+    assert choose(*turns, moderator_every=3) == "Moderator"
@@ -0,0 +1,74 @@
+import threading
+
+from starlette.testclient import TestClient
+
+import app
+import asgi_app
+import ogg
+from async_debate import AsyncDebate
+from debate import Debate
+from fakes import Distribution, FakeGenaiClient, FakeTTSClient
+
+
+class CountingTTSClient(FakeTTSClient):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.streams = 0
+
+    def streaming_synthesize(self, requests, **kwargs):
+        self.streams += 1
+        return super().streaming_synthesize(requests, **kwargs)
+
+
+def create_session(config, tts_client):
+    debate = Debate(config=config, client=FakeGenaiClient(), tts_client=tts_client)
+    debate.transcript.append({"speaker": "Alice Martin", "message": "Hello " * 40})
+    return app.registry.create(debate)
+
+
+def test_speech_404_without_voice(config):
+    session = create_session(config, FakeTTSClient())
+    client = app.app.test_client()
+    response = client.get(f"/speech?debate_id={session.id}&turn=1")
+    assert response.status_code == 404
+    app.registry.remove(session.id)
+
+
+def test_asgi_speech_404_without_voice(config):
+    with TestClient(asgi_app.app) as client:
+
+        async def create():
+            debate = await AsyncDebate.create(
+                config=config, client=FakeGenaiClient(), tts_client=FakeTTSClient()
+            )
+            debate.transcript.append({"speaker": "Alice Martin", "message": "Hi."})
+            return asgi_app.registry.create(debate)
+
+        session = client.portal.call(create)
+        response = client.get(f"/speech?debate_id={session.id}&turn=1")
+        assert response.status_code == 404
+        client.portal.call(asgi_app.registry.remove, session.id)
+
+
+def test_viewers_share_one_synthesis(config):
+    config["enable_voice"] = True
+    tts_client = CountingTTSClient(latency=Distribution(0.2), real_time_factor=0.05)
+    session = create_session(config, tts_client)
+    bodies = []
+
+    def listen():
+        response = app.app.test_client().get(f"/speech?debate_id={session.id}&turn=1")
+        assert response.status_code == 200
+        bodies.append(response.data)
+
+    listeners = [threading.Thread(target=listen) for _ in range(5)]
+    for listener in listeners:
+        listener.start()
+    for listener in listeners:
+        listener.join()
+
+    assert tts_client.streams == 1
+    assert len(bodies) == 5
+    assert len(set(bodies)) == 1
+    assert ogg.duration(bodies[0]) > 0
+    app.registry.remove(session.id)
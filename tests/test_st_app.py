@@ -0,0 +1,63 @@
+import os
+import time
+
+from streamlit.testing.v1 import AppTest
+
+APP = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "st_app.py"
+)
+
+
+def run_debate(config, timeout=30):
+    """Run the Streamlit app until its debate stops, returning the app."""
+    app = AppTest.from_file(APP, default_timeout=timeout)
+    app.session_state.debate_config = config
+    app.run()
+    deadline = time.monotonic() + timeout
+    while app.session_state.debate_state.get("is_running"):
+        assert not app.exception, app.exception
+        assert time.monotonic() < deadline, "The debate didn't stop"
+        time.sleep(0.05)
+        app.run()
+    assert not app.exception, app.exception
+    return app
+
+
+def test_voice_debate_releases_every_turn(fake_clients, config):
+    config.update(enable_voice=True, pacing="fixed", pacing_delay=0)
+    app = run_debate(config)
+    state = app.session_state.debate_state
+    assert state["current_turn"] == 3
+    assert len(state["transcript"]) == 3
+    assert len(app.session_state.audio_segments) == 3
+    assert len(app.chat_message) == 3
+
+
+def test_turns_generated_ahead_are_not_shown(fake_clients, config):
+    config.update(pacing="fixed", pacing_delay=60)
+    app = AppTest.from_file(APP, default_timeout=30)
+    app.session_state.debate_config = config
+    app.run()
+    # Released the first turn, which holds the next ones for a minute
+    pipeline = app.session_state.turn_pipeline
+    for _ in range(50):
+        app.run()
+        if pipeline.has_turn() and pipeline.ready.qsize():
+            break
+        time.sleep(0.05)
+    assert not app.exception, app.exception
+    assert len(app.session_state.debate_state["transcript"]) == 1
+    assert len(app.chat_message) == 1
+    pipeline.cancel()
+
+
+def test_podcast_export_leaves_no_file(fake_clients, config, tmp_path, monkeypatch):
+    monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+    config.update(enable_voice=True, pacing="fixed", pacing_delay=0)
+    app = run_debate(config)
+    downloads = len(app.get("download_button"))
+    export = next(b for b in app.button if b.label == "Export Podcast 🎧")
+    export.click().run()
+    assert not app.exception, app.exception
+    assert len(app.get("download_button")) == downloads + 1
+    assert os.listdir(tmp_path) == []
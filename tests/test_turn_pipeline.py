@@ -0,0 +1,36 @@
+import threading
+import time
+
+from debate import Debate
+from fakes import Distribution, FakeGenaiClient, FakeTTSClient
+from turn_pipeline import TurnPipeline
+
+
+def test_cancel_while_generating(config, monkeypatch):
+    errors = []
+    monkeypatch.setattr(threading, "excepthook", errors.append)
+    config["enable_voice"] = True
+    client = FakeGenaiClient(latency=Distribution(0.3))
+    debate = Debate(config=config, client=client, tts_client=FakeTTSClient())
+    speaker_updates = []
+    update_next_speaker = debate.update_next_speaker
+    monkeypatch.setattr(
+        debate,
+        "update_next_speaker",
+        lambda: speaker_updates.append(1) or update_next_speaker(),
+    )
+    pipeline = TurnPipeline(debate, synthesize=True)
+    debate.start()
+    pipeline.start()
+    # Cancel while the first turn's message is being generated
+    time.sleep(0.1)
+    pipeline.cancel()
+    debate.stop()
+    pipeline.producer.join(timeout=5)
+
+    assert not pipeline.producer.is_alive()
+    assert errors == []
+    assert pipeline.error is None
+    assert speaker_updates == []
+    assert pipeline.ready.empty()
+    assert pipeline.next_turn() is None
@@ -0,0 +1,116 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class TurnPipeline:
+    """Generates debate turns ahead of playback and synthesizes them in parallel.
+
+    A producer thread runs `run_next_turn` and `update_next_speaker` up to
+    `lookahead` turns ahead of what has been released to the UI, while each
+    turn's speech is synthesized on a worker pool. Turn N's audio is thus
+    rendered while turn N+1's text and speaker are being generated.
+    """
+
+    def __init__(self, debate, synthesize=False, lookahead=2, max_workers=2):
+        self.debate = debate
+        self.synthesize = synthesize
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.ready = queue.Queue()
+        self.slots = threading.Semaphore(lookahead)
+        self.cancelled = threading.Event()
+        # Held while queueing a turn, so none is queued once `cancel` drained them
+        self.lock = threading.Lock()
+        self.producer = None
+        self.error = None
+
+    def start(self):
+        """Start (or resume) producing turns in the background."""
+        if self.cancelled.is_set():
+            return
+        if self.producer and self.producer.is_alive():
+            return
+        self.producer = threading.Thread(target=self._produce, daemon=True)
+        self.producer.start()
+
+    def _produce(self):
+        debate = self.debate
+        while not self.cancelled.is_set():
+            # Wait until the UI has released enough turns
+            if not self.slots.acquire(timeout=0.1):
+                continue
+            if (
+                self.cancelled.is_set()
+                or not debate.debate_running
+                or debate.debate_finished
+            ):
+                self.slots.release()
+                return
+
+            try:
+                entry = debate.run_next_turn()
+                # The debate may have been reset while the turn was generated
+                if entry is None or self.cancelled.is_set():
+                    self.slots.release()
+                    return
+                if not debate.debate_finished:
+                    debate.update_next_speaker()
+
+                with self.lock:
+                    if self.cancelled.is_set():
+                        self.slots.release()
+                        return
+                    audio = None
+                    if self.synthesize:
+                        audio = self.executor.submit(debate.synthesize_turn, entry)
+                    # Snapshot the transcript, which keeps growing with later turns
+                    state = debate.get_state()
+                    state["transcript"] = list(state["transcript"])
+                    self.ready.put({"entry": entry, "audio": audio, "state": state})
+            except Exception as e:
+                self.error = e
+                self.slots.release()
+                return
+
+    def has_turn(self):
+        """Whether `next_turn` would return without waiting for generation."""
+        return not self.ready.empty() or not (
+            self.producer and self.producer.is_alive()
+        )
+
+    def next_turn(self):
+        """Wait for the next produced turn.
+
+        Returns a dict with the transcript `entry`, a future of its audio
+        record from `Debate.synthesize_turn` (None when voice is disabled)
+        and the debate `state` right after the turn, or None once the
+        producer has stopped and every turn was released.
+        """
+        while not self.cancelled.is_set():
+            try:
+                turn = self.ready.get(timeout=0.1)
+            except queue.Empty:
+                if self.producer and self.producer.is_alive():
+                    continue
+                if not self.ready.empty():
+                    continue
+                if self.error:
+                    error, self.error = self.error, None
+                    raise error
+                return None
+            self.slots.release()
+            return turn
+        return None
+
+    def cancel(self):
+        """Stop producing and drop every pending turn and synthesis."""
+        with self.lock:
+            self.cancelled.set()
+            while True:
+                try:
+                    turn = self.ready.get_nowait()
+                except queue.Empty:
+                    break
+                if turn["audio"]:
+                    turn["audio"].cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
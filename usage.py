@@ -0,0 +1,81 @@
+"""Accounting of model and TTS usage: tokens, characters, latency and calls."""
+
+import threading
+
+COUNTERS = [
+    "calls",
+    "input_tokens",
+    "output_tokens",
+    "cached_tokens",
+    "characters",
+    "latency_seconds",
+]
+
+
+def _empty():
+    return dict.fromkeys(COUNTERS, 0)
+
+
+class UsageTracker:
+    """Aggregates usage records in total, per call type, per agent and per model.
+
+    Records are also forwarded to `parent` (without their agent), so a
+    process-wide tracker can outlive the debates that fed it.
+    """
+
+    def __init__(self, parent=None):
+        self.parent = parent
+        self.lock = threading.Lock()
+        self.total = _empty()
+        self.by_call_type = {}
+        self.by_agent = {}
+        self.by_model = {}
+
+    def record(
+        self, call_type, model, latency, agent=None, response=None, characters=0
+    ):
+        """Record one call.
+
+        Token counts are read from the `usage_metadata` of a Gemini `response`;
+        TTS calls are measured in input `characters` instead.
+        """
+        usage = getattr(response, "usage_metadata", None)
+        record = {
+            "calls": 1,
+            "input_tokens": (usage.prompt_token_count if usage else None) or 0,
+            "output_tokens": (usage.candidates_token_count if usage else None) or 0,
+            "cached_tokens": (usage.cached_content_token_count if usage else None) or 0,
+            "characters": characters,
+            "latency_seconds": latency,
+        }
+
+        with self.lock:
+            groups = [
+                self.total,
+                self.by_call_type.setdefault(call_type, _empty()),
+                self.by_model.setdefault(model, _empty()),
+            ]
+            if agent:
+                groups.append(self.by_agent.setdefault(agent, _empty()))
+            for group in groups:
+                for counter, value in record.items():
+                    group[counter] += value
+
+        # Agent names are only meaningful within one debate
+        if self.parent:
+            self.parent.record(
+                call_type, model, latency, response=response, characters=characters
+            )
+
+    def get_stats(self):
+        with self.lock:
+            return {
+                "total": dict(self.total),
+                "by_call_type": {k: dict(v) for k, v in self.by_call_type.items()},
+                "by_agent": {k: dict(v) for k, v in self.by_agent.items()},
+                "by_model": {k: dict(v) for k, v in self.by_model.items()},
+            }
+
+
+# Usage of every debate hosted by this process, including removed ones
+process_usage = UsageTracker()